@@ -0,0 +1,131 @@
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from sqlite_db import SqliteDatabase
+
+class AnalysisCache:
+    """Content-addressed cache for analyze_text results.
+
+    Entries are keyed by a hash of the normalized text and the processor
+    version, kept in an in-process LRU with a size bound and TTL, and
+    optionally mirrored to sqlite so hits survive restarts.
+    """
+
+    def __init__(self, maxsize=256, ttl=3600, db_path=None):
+        """Create the cache; ``db_path`` enables the on-disk tier."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, analysis)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Connected lazily in each process that uses the disk tier
+        self._database = SqliteDatabase(db_path, setup=self._setup) if db_path else None
+
+    @staticmethod
+    def _setup(db):
+        """Create the table and purge expired rows when a process connects."""
+        db.execute('CREATE TABLE IF NOT EXISTS analyses (key TEXT PRIMARY KEY, expires_at REAL, analysis TEXT)')
+        db.execute('CREATE INDEX IF NOT EXISTS analyses_expires_at ON analyses (expires_at)')
+        db.execute('DELETE FROM analyses WHERE expires_at <= ?', (time.time(),))
+
+    @property
+    def _db(self):
+        return self._database.connection()
+
+    @staticmethod
+    def normalize_text(text):
+        """Normalize line endings and surrounding whitespace."""
+        return '\n'.join(line.rstrip() for line in text.strip().splitlines())
+
+    def make_key(self, text, version):
+        """Return the cache key for ``text`` analyzed by processor ``version``."""
+        payload = f"{version}\0{self.normalize_text(text)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached analysis for ``key`` or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, analysis = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return analysis
+                del self._entries[key]
+
+            if self._database is not None:
+                row = self._db.execute(
+                    'SELECT expires_at, analysis FROM analyses WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None and row[0] > now:
+                    analysis = json.loads(row[1])
+                    self._store_memory(key, row[0], analysis)
+                    self.disk_hits += 1
+                    return analysis
+
+            self.misses += 1
+            return None
+
+    def put(self, key, analysis):
+        """Store an analysis in memory and, if enabled, on disk, purging expired disk entries."""
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._store_memory(key, expires_at, analysis)
+            if self._database is not None:
+                self._db.execute('DELETE FROM analyses WHERE expires_at <= ?', (now,))
+                self._db.execute(
+                    'INSERT OR REPLACE INTO analyses (key, expires_at, analysis) VALUES (?, ?, ?)',
+                    (key, expires_at, json.dumps(analysis))
+                )
+                self._db.commit()
+
+    def get_or_compute(self, text, version, compute):
+        """Return the cached analysis of ``text`` or compute and cache it.
+
+        Cached analyses are shared between callers and must not be mutated.
+        """
+        key = self.make_key(text, version)
+        analysis = self.get(key)
+        if analysis is None:
+            analysis = compute(text)
+            self.put(key, analysis)
+        return analysis
+
+    def _store_memory(self, key, expires_at, analysis):
+        """Insert into the LRU, evicting the least recently used entry."""
+        self._entries[key] = (expires_at, analysis)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            if self._database is not None:
+                self._db.execute('DELETE FROM analyses')
+                self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'disk_tier': self._database is not None
+            }
@@ -0,0 +1,337 @@
+import json
+import time
+import hashlib
+import threading
+from sqlite_db import SqliteDatabase
+
+class AnalysisStore:
+    """Persistent store of resume analyses keyed by PDF content hash.
+
+    Each row holds the ``analyze_text`` output for one PDF (identified by the
+    SHA-256 of its bytes) under one analysis version, so a repeat upload of the
+    same file skips extraction and NLP. Rows stay until deleted and can be
+    listed for re-scoring against new job descriptions.
+
+    Finished results (``ScoringEngine.build_results`` output) are kept in a
+    second table under the hash of their content, so reports can be built
+    from a result id later. Async job records live in a third, so any app
+    process can answer a poll for a job another one queued. Catalog jobs
+    and requisitions are JSON records with a change sequence number (see
+    put_record), so every process can replay the changes it has not seen.
+    """
+
+    def __init__(self, db_path='analysis_store.sqlite3'):
+        """Use (and if needed create) the sqlite database at ``db_path``; it is opened on first use."""
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Several processes (app workers, async job workers) share the file, each with its own connection
+        self._database = SqliteDatabase(db_path, setup=self._setup, timeout=30, wal=True)
+
+    @staticmethod
+    def _setup(db):
+        """Create the tables when a process connects."""
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS analyses ('
+            'pdf_hash TEXT NOT NULL, version TEXT NOT NULL, analysis TEXT NOT NULL, filename TEXT, '
+            'created_at REAL NOT NULL, last_used_at REAL NOT NULL, uses INTEGER NOT NULL DEFAULT 1, '
+            'PRIMARY KEY (pdf_hash, version))'
+        )
+        db.execute('CREATE INDEX IF NOT EXISTS analyses_version ON analyses (version, created_at)')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'result_id TEXT PRIMARY KEY, result TEXT NOT NULL, filename TEXT, created_at REAL NOT NULL)'
+        )
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'job_id TEXT PRIMARY KEY, status TEXT NOT NULL, owner_pid INTEGER NOT NULL, submitted_at REAL NOT NULL, '
+            'finished_at REAL, result TEXT, error TEXT, error_details TEXT)'
+        )
+        db.execute('CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at)')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS records ('
+            'kind TEXT NOT NULL, key TEXT NOT NULL, seq INTEGER NOT NULL, value TEXT, PRIMARY KEY (kind, key))'
+        )
+        db.execute('CREATE INDEX IF NOT EXISTS records_seq ON records (kind, seq)')
+
+    @property
+    def _db(self):
+        return self._database.connection()
+
+    @staticmethod
+    def hash_pdf(source, chunk_size=1024 * 1024):
+        """Return the SHA-256 hex digest of PDF bytes or a seekable binary stream.
+
+        Streams are read in chunks and rewound to where they started.
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return hashlib.sha256(source).hexdigest()
+        digest = hashlib.sha256()
+        position = source.tell()
+        for chunk in iter(lambda: source.read(chunk_size), b''):
+            digest.update(chunk)
+        source.seek(position)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_version(processor_version, pdf_limits=None):
+        """Return the store version for a processor version and PDF extraction caps.
+
+        The caps change the extracted text, so they are part of the version.
+        """
+        pdf_limits = pdf_limits or {}
+        return f"{processor_version}/pdf-{pdf_limits.get('max_pages', 0)}p-{pdf_limits.get('max_chars', 0)}c"
+
+    def get(self, pdf_hash, version):
+        """Return the stored analysis or None, recording the lookup."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT analysis FROM analyses WHERE pdf_hash = ? AND version = ?', (pdf_hash, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                'UPDATE analyses SET last_used_at = ?, uses = uses + 1 WHERE pdf_hash = ? AND version = ?',
+                (time.time(), pdf_hash, version)
+            )
+            self._db.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, pdf_hash, version, analysis, filename=None):
+        """Store (or replace) the analysis of one PDF."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO analyses (pdf_hash, version, analysis, filename, created_at, last_used_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (pdf_hash, version, json.dumps(analysis), filename, now, now)
+            )
+            self._db.commit()
+
+    def get_or_compute(self, source, version, compute, filename=None):
+        """Return the stored analysis of a PDF or compute and store it.
+
+        ``compute(source)`` returns the analysis, or None when the PDF could
+        not be analyzed; None is returned and nothing is stored in that case.
+        """
+        pdf_hash = self.hash_pdf(source)
+        analysis = self.get(pdf_hash, version)
+        if analysis is None:
+            analysis = compute(source)
+            if analysis is not None:
+                self.put(pdf_hash, version, analysis, filename=filename)
+        return analysis
+
+    def delete(self, pdf_hash, version=None):
+        """Delete one PDF's analyses (all versions unless ``version`` is given); returns the row count."""
+        with self._lock:
+            if version is None:
+                cursor = self._db.execute('DELETE FROM analyses WHERE pdf_hash = ?', (pdf_hash,))
+            else:
+                cursor = self._db.execute(
+                    'DELETE FROM analyses WHERE pdf_hash = ? AND version = ?', (pdf_hash, version)
+                )
+            self._db.commit()
+            return cursor.rowcount
+
+    def query(self, version=None, since=None, limit=None, include_analysis=True):
+        """Return stored records, newest first.
+
+        Filters by analysis ``version`` and ``created_at >= since``. Each
+        record has pdf_hash, version, filename, created_at, last_used_at,
+        uses and (unless ``include_analysis`` is False) the analysis.
+        """
+        columns = ['pdf_hash', 'version', 'filename', 'created_at', 'last_used_at', 'uses']
+        if include_analysis:
+            columns.append('analysis')
+        sql = f"SELECT {', '.join(columns)} FROM analyses"
+        conditions, params = [], []
+        if version is not None:
+            conditions.append('version = ?')
+            params.append(version)
+        if since is not None:
+            conditions.append('created_at >= ?')
+            params.append(since)
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY created_at DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        records = []
+        for row in rows:
+            record = dict(zip(columns, row))
+            if include_analysis:
+                record['analysis'] = json.loads(record['analysis'])
+            records.append(record)
+        return records
+
+    def iter_records(self, version=None, since=None, batch_size=1000):
+        """Yield ``(created_at, pdf_hash, filename, analysis)`` of stored analyses, oldest first.
+
+        Rows are read in pages of ``batch_size`` without holding the lock
+        between pages, so the whole store never has to fit in memory.
+        """
+        conditions, params = [], []
+        if version is not None:
+            conditions.append('version = ?')
+            params.append(version)
+        last = (since, -1) if since is not None else None
+        while True:
+            where, page_params = list(conditions), list(params)
+            if last is not None:
+                where.append('(created_at > ? OR (created_at = ? AND rowid > ?))')
+                page_params += [last[0], last[0], last[1]]
+            sql = 'SELECT rowid, created_at, pdf_hash, filename, analysis FROM analyses'
+            if where:
+                sql += ' WHERE ' + ' AND '.join(where)
+            sql += ' ORDER BY created_at, rowid LIMIT ?'
+            with self._lock:
+                rows = self._db.execute(sql, page_params + [batch_size]).fetchall()
+            for rowid, created_at, pdf_hash, filename, analysis in rows:
+                yield created_at, pdf_hash, filename, json.loads(analysis)
+            if len(rows) < batch_size:
+                return
+            last = (rows[-1][1], rows[-1][0])
+
+    @staticmethod
+    def hash_result(result):
+        """Return the SHA-256 hex digest of a result's canonical JSON."""
+        return hashlib.sha256(json.dumps(result, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+    def put_result(self, result, filename=None):
+        """Store a result and return its id (the hash of its content)."""
+        result_id = self.hash_result(result)
+        with self._lock:
+            self._db.execute(
+                'INSERT OR IGNORE INTO results (result_id, result, filename, created_at) VALUES (?, ?, ?, ?)',
+                (result_id, json.dumps(result), filename, time.time())
+            )
+            self._db.commit()
+        return result_id
+
+    def get_result(self, result_id):
+        """Return ``{'result_id', 'result', 'filename', 'created_at'}`` or None."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT result, filename, created_at FROM results WHERE result_id = ?', (result_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'result_id': result_id, 'result': json.loads(row[0]), 'filename': row[1], 'created_at': row[2]}
+
+    JOB_FIELDS = ('status', 'owner_pid', 'submitted_at', 'finished_at', 'result', 'error', 'error_details')
+
+    def put_job(self, job_id, owner_pid, submitted_at):
+        """Record a newly queued job run by process ``owner_pid``."""
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO jobs (job_id, status, owner_pid, submitted_at) VALUES (?, ?, ?, ?)',
+                (job_id, 'queued', owner_pid, submitted_at)
+            )
+            self._db.commit()
+
+    def update_job(self, job_id, **fields):
+        """Set fields of a job record (see JOB_FIELDS); ``result`` and ``error_details`` are stored as JSON."""
+        for key in ('result', 'error_details'):
+            if fields.get(key) is not None:
+                fields[key] = json.dumps(fields[key])
+        assignments = ', '.join(f"{key} = ?" for key in fields if key in self.JOB_FIELDS)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                [value for key, value in fields.items() if key in self.JOB_FIELDS] + [job_id]
+            )
+            self._db.commit()
+
+    def get_job(self, job_id):
+        """Return a job record with ``job_id`` and every JOB_FIELDS entry, or None."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(self.JOB_FIELDS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self.JOB_FIELDS, row), job_id=job_id)
+        for key in ('result', 'error_details'):
+            if job[key] is not None:
+                job[key] = json.loads(job[key])
+        return job
+
+    def prune_jobs(self, finished_before):
+        """Delete job records that finished before ``finished_before``; returns the row count."""
+        with self._lock:
+            cursor = self._db.execute('DELETE FROM jobs WHERE finished_at < ?', (finished_before,))
+            self._db.commit()
+            return cursor.rowcount
+
+    def job_count(self):
+        """Return the number of job records, finished or not."""
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def _write_record(self, kind, key, value):
+        """Write a record (None marks it deleted) under the next sequence number; returns that number."""
+        with self._lock:
+            # Take the write lock first, so sequence numbers follow commit order
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                seq = self._db.execute('SELECT COALESCE(MAX(seq), 0) + 1 FROM records').fetchone()[0]
+                self._db.execute(
+                    'INSERT OR REPLACE INTO records (kind, key, seq, value) VALUES (?, ?, ?, ?)',
+                    (kind, key, seq, None if value is None else json.dumps(value))
+                )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return seq
+
+    def put_record(self, kind, key, value):
+        """Store (or replace) the JSON record ``key`` of ``kind``; returns its sequence number."""
+        return self._write_record(kind, key, value)
+
+    def delete_record(self, kind, key):
+        """Delete a record, leaving a marker for record_changes; returns False if it did not exist."""
+        if self.get_record(kind, key) is None:
+            return False
+        self._write_record(kind, key, None)
+        return True
+
+    def get_record(self, kind, key):
+        """Return the record ``key`` of ``kind``, or None."""
+        with self._lock:
+            row = self._db.execute('SELECT value FROM records WHERE kind = ? AND key = ?', (kind, key)).fetchone()
+        return None if row is None or row[0] is None else json.loads(row[0])
+
+    def record_changes(self, kind, since=0):
+        """Return ``(seq, key, record or None if deleted)`` of every change to ``kind`` after ``since``, in order."""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT seq, key, value FROM records WHERE kind = ? AND seq > ? ORDER BY seq', (kind, since)
+            ).fetchall()
+        return [(seq, key, None if value is None else json.loads(value)) for seq, key, value in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM analyses').fetchone()[0]
+
+    def stats(self):
+        """Return lookup counters and the number of stored analyses."""
+        size = len(self)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': size,
+                'db_path': self.db_path
+            }
@@ -1,11 +1,37 @@
+import gc
 import os
+import time
 import logging
-from flask import Flask, render_template, request, flash, redirect, url_for, jsonify
-from werkzeug.utils import secure_filename
-from werkzeug.middleware.proxy_fix import ProxyFix
-import fitz  # PyMuPDF
-from nlp_processor import NLPProcessor
+import uuid
+import json
+import shutil
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import cProfile
+from startup import startup_timer
+with startup_timer.measure('import flask'):
+    from flask import Flask, Response, render_template, request, flash, redirect, url_for, jsonify, g, stream_with_context, send_file
+    from werkzeug.utils import secure_filename
+    from werkzeug.datastructures import FileStorage
+    from werkzeug.middleware.proxy_fix import ProxyFix
+with startup_timer.measure('import pdf_extractor'):
+    from pdf_extractor import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, extract_text_from_pdf
 from scoring_engine import ScoringEngine
+from analysis_cache import AnalysisCache
+from analysis_store import AnalysisStore
+from job_queue import JobQueue, QueueFullError, share_with_workers
+from job_catalog import JobCatalog
+from semantic_index import SemanticIndex
+from requisitions import RequisitionRanker
+from candidate_index import CandidateIndex, QueryError
+from budgets import AnalysisAborted, AnalysisBudget, record_breach, record_truncation
+from sandbox import AnalysisSandbox
+with startup_timer.measure('import report_generator'):
+    from report_generator import ReportCache, BulkExporter
+from metrics import metrics, peak_rss_bytes, current_rss_bytes
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -17,35 +43,342 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
-MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB max request size
+MAX_PDF_SIZE = 16 * 1024 * 1024  # 16MB max size of a single resume inside a batch
+BATCH_N_PROCESS = int(os.environ.get('BATCH_N_PROCESS', 1))  # also the most a request may ask for (0: CPU count)
+BATCH_SIZE = int(os.environ.get('BATCH_SIZE', 32))
+JD_CACHE_SIZE = int(os.environ.get('JD_CACHE_SIZE', 256))
+JD_CACHE_TTL = int(os.environ.get('JD_CACHE_TTL', 24 * 60 * 60))  # seconds
+JD_CACHE_DB = os.environ.get('JD_CACHE_DB')  # e.g. 'jd_cache.sqlite3' to persist across restarts
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', 64))  # queued + running jobs per app worker before HTTP 429
+JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 60 * 60))  # seconds finished jobs stay pollable
+REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR', 'reports')  # rendered PDF reports, named by result hash
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', 2))  # processes rendering bulk report exports
+MAX_BULK_REPORTS = int(os.environ.get('MAX_BULK_REPORTS', 500))
+MAX_SEARCH_RESULTS = int(os.environ.get('MAX_SEARCH_RESULTS', 1000))  # per /candidates/search page
+MAX_LIST_ANALYSES = int(os.environ.get('MAX_LIST_ANALYSES', 1000))  # per /analyses page
+# Load the NLP model at import time so a pre-forking server (gunicorn --preload) shares it copy-on-write
+PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', '').lower() in ('1', 'true', 'yes')
+# Set PROFILE_REQUESTS=1 to allow profiling single requests with ?profile=1
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS', '').lower() in ('1', 'true', 'yes')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+# Uploads are parsed in memory; above this size (bytes) they are spooled to UPLOAD_FOLDER first. 0 disables spooling.
+PDF_SPOOL_THRESHOLD = int(os.environ.get('PDF_SPOOL_THRESHOLD', 0))
+# Caps on what is extracted from one PDF, so pathological files can't pin a worker (0 = no limit)
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', DEFAULT_MAX_PAGES))
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', DEFAULT_MAX_CHARS))
+# PDFs with more pages than this are extracted in parallel page ranges (0 disables)
+PDF_PARALLEL_PAGES = int(os.environ.get('PDF_PARALLEL_PAGES', 16))
+PDF_PAGE_WORKERS = int(os.environ.get('PDF_PAGE_WORKERS', min(4, os.cpu_count() or 1)))
+# Budgets for analyzing one uploaded resume (0 = no limit). Resumes uploaded to /analyze,
+# /match-jobs and the batch endpoints are analyzed in ANALYSIS_WORKERS killable processes that
+# enforce the deadlines (seconds per stage and in total); 0 analyzes in the request thread with
+# the token budget only.
+ANALYSIS_MAX_TOKENS = int(os.environ.get('ANALYSIS_MAX_TOKENS', 300000))
+EXTRACT_TIMEOUT = float(os.environ.get('EXTRACT_TIMEOUT', 20))
+NLP_TIMEOUT = float(os.environ.get('NLP_TIMEOUT', 60))
+ANALYSIS_TIMEOUT = float(os.environ.get('ANALYSIS_TIMEOUT', 90))
+ANALYSIS_MAX_MEMORY_MB = int(os.environ.get('ANALYSIS_MAX_MEMORY_MB', 0))  # per worker, on top of the model
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', 2))
+# Resume analyses keyed by PDF hash, so repeat uploads skip extraction and NLP. Empty disables the store.
+ANALYSIS_STORE_DB = os.environ.get('ANALYSIS_STORE_DB', 'analysis_store.sqlite3')
+# Seconds an analysis may take to commit after it is stamped; incremental syncs re-read this far back
+STORE_SYNC_MARGIN = float(os.environ.get('STORE_SYNC_MARGIN', 60))
+# Directory of the memory-mapped semantic vectors of the job catalog (default: system temp dir)
+SEMANTIC_INDEX_DIR = os.environ.get('SEMANTIC_INDEX_DIR') or None
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+app.config['PDF_SPOOL_THRESHOLD'] = PDF_SPOOL_THRESHOLD
+app.config['PDF_LIMITS'] = {'max_pages': PDF_MAX_PAGES, 'max_chars': PDF_MAX_CHARS}
+app.config['PDF_PARALLEL'] = {'parallel_threshold': PDF_PARALLEL_PAGES, 'workers': PDF_PAGE_WORKERS}
+analysis_budget = AnalysisBudget(
+    max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, max_tokens=ANALYSIS_MAX_TOKENS,
+    deadlines={'extract': EXTRACT_TIMEOUT, 'nlp': NLP_TIMEOUT, 'total': ANALYSIS_TIMEOUT},
+    max_memory_bytes=ANALYSIS_MAX_MEMORY_MB * 1024 * 1024
+)
 
-# Create uploads directory if it doesn't exist
+# Create uploads directory (used for spooling large PDFs) if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize NLP processor and scoring engine
-nlp_processor = NLPProcessor()
-scoring_engine = ScoringEngine()
+# The NLP processor (spaCy, scikit-learn) is loaded on first use; see get_nlp_processor
+_nlp_processor = None
+_nlp_processor_lock = threading.Lock()
+# Default weights profile; requisitions can override it (see /requisitions)
+scoring_engine = ScoringEngine(weights={
+    'skills': float(os.environ.get('SKILLS_WEIGHT', ScoringEngine.DEFAULT_WEIGHTS['skills'])),
+    'role': float(os.environ.get('ROLE_WEIGHT', ScoringEngine.DEFAULT_WEIGHTS['role'])),
+    'experience': float(os.environ.get('EXPERIENCE_WEIGHT', ScoringEngine.DEFAULT_WEIGHTS['experience'])),
+    'keywords': float(os.environ.get('KEYWORDS_WEIGHT', ScoringEngine.DEFAULT_WEIGHTS['keywords'])),
+    'semantic': float(os.environ.get('SEMANTIC_WEIGHT', ScoringEngine.DEFAULT_WEIGHTS['semantic']))
+})
+jd_cache = AnalysisCache(maxsize=JD_CACHE_SIZE, ttl=JD_CACHE_TTL, db_path=JD_CACHE_DB)
+analysis_store = AnalysisStore(ANALYSIS_STORE_DB) if ANALYSIS_STORE_DB else None
+job_catalog = JobCatalog(scoring_engine, semantic_index=SemanticIndex(SEMANTIC_INDEX_DIR))
+requisitions = RequisitionRanker(scoring_engine)
+candidate_index = CandidateIndex()
+_candidate_sync_lock = threading.Lock()
+_catalog_sync_lock = threading.Lock()
+_requisition_sync_lock = threading.Lock()
+report_cache = ReportCache(REPORT_CACHE_DIR)
+analysis_sandbox = AnalysisSandbox(analysis_budget, workers=ANALYSIS_WORKERS) if ANALYSIS_WORKERS else None
+bulk_exporter = BulkExporter(report_cache, workers=REPORT_WORKERS, result_ttl=JOB_RESULT_TTL)
+job_queue = JobQueue(analysis_budget, workers=JOB_WORKERS, max_pending=JOB_QUEUE_SIZE, result_ttl=JOB_RESULT_TTL,
+                     store_db=ANALYSIS_STORE_DB)
+
+metrics.gauge('jd_cache_lookups', lambda: {
+    (('result', result),): jd_cache.stats()[key]
+    for result, key in (('hit', 'hits'), ('disk_hit', 'disk_hits'), ('miss', 'misses'))
+}, help='Job description cache lookups by result')
+if analysis_store is not None:
+    metrics.gauge('analysis_store_lookups', lambda: {
+        (('result', result),): analysis_store.stats()[key] for result, key in (('hit', 'hits'), ('miss', 'misses'))
+    }, help='Resume analysis store lookups by result')
+metrics.gauge('job_queue_pending', lambda: job_queue.stats()['pending'], help='Queued and running async analysis jobs')
+metrics.gauge('report_cache_lookups', lambda: {
+    (('result', result),): report_cache.stats()[key] for result, key in (('hit', 'hits'), ('miss', 'misses'))
+}, help='PDF report cache lookups by result')
+metrics.gauge('job_catalog_size', lambda: len(job_catalog), help='Job descriptions in the matching catalog')
+metrics.gauge('candidate_index_size', lambda: len(candidate_index), help='Stored resume analyses in the search index')
+if analysis_sandbox is not None:
+    metrics.gauge('analysis_sandbox_workers', lambda: {
+        (('event', event),): analysis_sandbox.stats()[event] for event in ('started', 'killed')
+    }, help='Analysis sandbox worker processes started and killed for missing a deadline')
+metrics.gauge('process_peak_rss_bytes', peak_rss_bytes, help='Peak resident memory of this app worker')
+metrics.gauge('process_rss_bytes', current_rss_bytes, help='Current resident memory of this app worker')
+metrics.gauge('job_worker_peak_rss_bytes', lambda: {
+    (('pid', pid),): rss for pid, rss in job_queue.stats()['worker_peak_rss_bytes'].items()
+}, help='Peak resident memory of each async analysis worker, as of its last job')
+
+@app.before_request
+def start_request_timer():
+    """Start timing the request and, if requested, profiling it."""
+    g.request_start = time.perf_counter()
+    g.profiler = None
+    if PROFILE_REQUESTS and request.args.get('profile') == '1':
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request, record its latency and save any profile."""
+    endpoint = request.endpoint or 'unknown'
+    metrics.observe('request_duration_seconds', time.perf_counter() - g.request_start,
+                    help='HTTP request latency', endpoint=endpoint)
+    metrics.inc('requests_total', help='HTTP requests', endpoint=endpoint,
+                method=request.method, status=response.status_code)
+    if response.status_code >= 500:
+        metrics.inc('errors_total', help='Failed requests', endpoint=endpoint)
+    
+    if g.get('profiler') is not None:
+        g.profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profile_path = os.path.join(PROFILE_DIR, f"{endpoint}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.prof")
+        g.profiler.dump_stats(profile_path)
+        response.headers['X-Profile-File'] = profile_path
+        logging.info(f"Request profile written to {profile_path} (inspect with: python -m pstats {profile_path})")
+    return response
+
+def get_nlp_processor():
+    """Return the shared NLP processor, loading it on first use."""
+    global _nlp_processor
+    if _nlp_processor is None:
+        with _nlp_processor_lock:
+            if _nlp_processor is None:
+                with startup_timer.measure('import nlp_processor'):
+                    from nlp_processor import NLPProcessor
+                with startup_timer.measure('load NLPProcessor'):
+                    processor = NLPProcessor()
+                for step, seconds in processor.load_timings.items():
+                    startup_timer.record(f'load NLPProcessor: {step}', seconds)
+                # Sandbox workers forked from now on inherit the loaded model
+                AnalysisSandbox.share(processor)
+                _nlp_processor = processor
+    return _nlp_processor
 
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension."""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF using PyMuPDF."""
-    try:
-        doc = fitz.open(file_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text.strip()
-    except Exception as e:
-        logging.error(f"Error extracting text from PDF: {str(e)}")
+def analyze_job_description(job_description):
+    """Analyze a job description, reusing cached analyses of identical text.
+
+    The text comes from the client, so it gets the same token budget as a
+    resume; longer texts raise BudgetExceeded.
+    """
+    nlp_processor = get_nlp_processor()
+    return jd_cache.get_or_compute(
+        job_description, nlp_processor.version,
+        lambda text: nlp_processor.analyze_text(text, text_type='job_description', max_tokens=ANALYSIS_MAX_TOKENS)
+    )
+
+def resume_analysis_version():
+    """Return the version resume analyses are stored under in the analysis store."""
+    return AnalysisStore.make_version(get_nlp_processor().version, app.config['PDF_LIMITS'])
+
+def analyze_resume_pdf(source, filename=None, **extract_options):
+    """Extract and analyze a resume PDF, reusing the stored analysis of identical files.
+
+    Runs within ``analysis_budget``; with the sandbox enabled the work
+    (including any parallel page extraction) is done in a killable worker
+    process. ``extract_options`` go to extract_text_from_pdf, e.g. the
+    spooling options. Returns None when no text could be extracted and
+    raises an AnalysisAborted subclass when a budget is exceeded.
+    """
+    def compute(source):
+        if analysis_sandbox is not None:
+            get_nlp_processor()  # loaded before any worker is forked
+            with metrics.timer('sandboxed_analysis'):
+                analysis, extract_stats = analysis_sandbox.analyze_pdf(
+                    source, **app.config['PDF_PARALLEL'], **extract_options
+                )
+            record_truncation(extract_stats)
+            return analysis
+        
+        extract_stats = {}
+        with metrics.timer('pdf_extract'):
+            resume_text = extract_text_from_pdf(
+                source, **app.config['PDF_LIMITS'], **app.config['PDF_PARALLEL'], **extract_options,
+                stats=extract_stats
+            )
+        record_truncation(extract_stats)
+        if not resume_text:
+            return None
+        with metrics.timer('nlp_resume'):
+            return get_nlp_processor().analyze_text(resume_text, text_type='resume', max_tokens=ANALYSIS_MAX_TOKENS)
+    
+    if analysis_store is None:
+        return compute(source)
+    return analysis_store.get_or_compute(source, resume_analysis_version(), compute, filename=filename)
+
+def store_result(results_data, filename=None):
+    """Store a finished result for later report export; returns its id, or None without a store."""
+    if analysis_store is None:
         return None
+    return analysis_store.put_result(results_data, filename=filename)
+
+def requested_n_process():
+    """Return the request's ``n_process``, capped at BATCH_N_PROCESS (or the CPU count when that is 0)."""
+    n_process = request.form.get('n_process', BATCH_N_PROCESS, type=int) or 1
+    return max(1, min(n_process, BATCH_N_PROCESS or os.cpu_count() or 1))
+
+def iter_uploaded_pdfs(files):
+    """Yield (filename, pdf_bytes) for uploaded PDFs and PDFs inside uploaded zips."""
+    for file in files:
+        filename = secure_filename(file.filename or '')
+        if filename.lower().endswith('.zip'):
+            with zipfile.ZipFile(file.stream) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not allowed_file(info.filename):
+                        continue
+                    if info.file_size > MAX_PDF_SIZE:
+                        logging.warning(f"Skipping {info.filename}: larger than {MAX_PDF_SIZE} bytes")
+                        continue
+                    yield info.filename, archive.read(info)
+        elif allowed_file(filename):
+            yield filename, file.read()
+
+def analyze_uploaded_pdfs(pdfs, n_process=1, batch_size=BATCH_SIZE):
+    """Analyze ``(filename, pdf_bytes)`` pairs for the batch endpoints, lazily.
+
+    Yields ``(filename, analysis or None, from_store, error or None)`` per
+    PDF, in input order, and puts new analyses in the analysis store. With
+    the sandbox enabled every PDF is analyzed in a sandbox worker under the
+    full analysis budget, up to ANALYSIS_WORKERS at a time. Otherwise texts
+    are parsed together with nlp.pipe (``n_process``, ``batch_size``) in
+    this thread, under the extraction caps and token budget only. A PDF
+    that breaks its budget fails on its own, with the breach as ``error``.
+    """
+    version = resume_analysis_version()
+    
+    def lookup(pdf_bytes):
+        pdf_hash = analysis_store.hash_pdf(pdf_bytes) if analysis_store is not None else None
+        return pdf_hash, analysis_store.get(pdf_hash, version) if pdf_hash else None
+    
+    def piped():
+        """Yield (filename, pdf_hash, stored, analysis or None or AnalysisAborted)."""
+        pending = deque()  # (filename, pdf_hash, stored, extracted) per text handed to the pipeline
+        
+        def texts():
+            for filename, pdf_bytes in pdfs:
+                pdf_hash, stored = lookup(pdf_bytes)
+                resume_text = None
+                if stored is None:
+                    extract_stats = {}
+                    resume_text = extract_text_from_pdf(
+                        pdf_bytes, **app.config['PDF_LIMITS'], **app.config['PDF_PARALLEL'], stats=extract_stats
+                    )
+                    record_truncation(extract_stats)
+                pending.append((filename, pdf_hash, stored, bool(resume_text)))
+                # Stored and failed resumes pass through as empty texts to keep the input order
+                yield resume_text or ''
+        
+        analyses = get_nlp_processor().analyze_texts(
+            texts(), text_type='resume', n_process=n_process, batch_size=batch_size, max_tokens=ANALYSIS_MAX_TOKENS
+        )
+        try:
+            for analysis in analyses:
+                filename, pdf_hash, stored, extracted = pending.popleft()
+                yield filename, pdf_hash, stored, analysis if extracted else None
+        finally:
+            analyses.close()
+    
+    def sandboxed():
+        """Yield (filename, pdf_hash, stored, analysis or None or AnalysisAborted)."""
+        def analyze(pdf_bytes):
+            try:
+                analysis, extract_stats = analysis_sandbox.analyze_pdf(pdf_bytes, **app.config['PDF_PARALLEL'])
+            except AnalysisAborted as e:
+                return e
+            record_truncation(extract_stats)
+            return analysis
+        
+        # Enough PDFs in flight to keep every sandbox worker busy, few enough to keep memory flat
+        window = 2 * analysis_sandbox.workers
+        executor = ThreadPoolExecutor(max_workers=analysis_sandbox.workers)
+        pending = deque()  # (filename, pdf_hash, stored, future or None)
+        try:
+            for filename, pdf_bytes in pdfs:
+                pdf_hash, stored = lookup(pdf_bytes)
+                pending.append((filename, pdf_hash, stored, executor.submit(analyze, pdf_bytes) if stored is None else None))
+                while pending and (len(pending) > window or pending[0][3] is None or pending[0][3].done()):
+                    filename, pdf_hash, stored, future = pending.popleft()
+                    yield filename, pdf_hash, stored, future and future.result()
+            while pending:
+                filename, pdf_hash, stored, future = pending.popleft()
+                yield filename, pdf_hash, stored, future and future.result()
+        finally:
+            for *_, future in pending:
+                if future is not None:
+                    future.cancel()
+            executor.shutdown(wait=False)
+    
+    results = sandboxed() if analysis_sandbox is not None else piped()
+    try:
+        for filename, pdf_hash, stored, analysis in results:
+            if stored is not None:
+                yield filename, stored, True, None
+            elif isinstance(analysis, AnalysisAborted):
+                record_breach(analysis)
+                logging.warning(f"Batch resume {filename} aborted: {str(analysis)}")
+                yield filename, None, False, str(analysis)
+            elif analysis is None:
+                yield filename, None, False, 'Could not extract text from the PDF'
+            else:
+                if analysis_store is not None:
+                    analysis_store.put(pdf_hash, version, analysis, filename=filename)
+                yield filename, analysis, False, None
+    finally:
+        results.close()
+
+@app.errorhandler(AnalysisAborted)
+def analysis_aborted(e):
+    """Answer a budget breach or crashed analysis worker with a structured JSON error."""
+    record_breach(e)
+    logging.warning(f"Analysis aborted: {str(e)}")
+    return jsonify(e.to_dict()), 422
 
 @app.route('/')
 def index():
@@ -54,7 +387,13 @@ def index():
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
-    """Process the resume and job description, then show results."""
+    """Process the resume and job description, then show results.
+
+    With ``mode=async`` the analysis is queued instead and a job id is returned.
+    """
+    if request.values.get('mode') == 'async':
+        return submit_analysis_job()
+    
     try:
         # Check if file is uploaded
         if 'resume' not in request.files:
@@ -77,52 +416,655 @@ def analyze():
             flash('Only PDF files are allowed', 'error')
             return redirect(url_for('index'))
         
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
-        
-        # Extract text from resume
-        resume_text = extract_text_from_pdf(file_path)
-        if not resume_text:
+        # Extract and analyze the resume straight from the upload stream (or reuse a stored analysis)
+        logging.debug("Processing resume and job description with NLP...")
+        resume_analysis = analyze_resume_pdf(
+            file.stream,
+            filename=secure_filename(file.filename),
+            spool_threshold=app.config['PDF_SPOOL_THRESHOLD'],
+            spool_dir=app.config['UPLOAD_FOLDER']
+        )
+        if resume_analysis is None:
             flash('Could not extract text from the PDF. Please ensure it\'s not a scanned document.', 'error')
-            os.remove(file_path)  # Clean up
             return redirect(url_for('index'))
         
-        # Clean up uploaded file
-        os.remove(file_path)
+        with metrics.timer('nlp_job_description'):
+            jd_analysis = analyze_job_description(job_description)
         
-        # Process with NLP
-        logging.debug("Processing resume and job description with NLP...")
-        resume_analysis = nlp_processor.analyze_text(resume_text, text_type='resume')
-        jd_analysis = nlp_processor.analyze_text(job_description, text_type='job_description')
+        # Score, generate suggestions and prepare results data
+        with metrics.timer('scoring'):
+            results_data = scoring_engine.build_results(resume_analysis, jd_analysis)
+        result_id = store_result(results_data, filename=secure_filename(file.filename))
         
-        # Calculate scores and comparisons
-        logging.debug("Calculating job fit score...")
-        score_data = scoring_engine.calculate_job_fit_score(resume_analysis, jd_analysis)
+        with metrics.timer('render'):
+            return render_template('results.html', results=results_data, result_id=result_id)
         
-        # Generate improvement suggestions
-        suggestions = scoring_engine.generate_suggestions(resume_analysis, jd_analysis, score_data)
+    except AnalysisAborted as e:
+        record_breach(e)
+        logging.warning(f"Analysis aborted: {str(e)}")
+        flash(f'The resume could not be analyzed: {str(e)}', 'error')
+        return redirect(url_for('index'))
+    except Exception as e:
+        metrics.inc('errors_total', help='Failed requests', endpoint='analyze')
+        logging.error(f"Error during analysis: {str(e)}")
+        flash('An error occurred during analysis. Please try again.', 'error')
+        return redirect(url_for('index'))
+
+def submit_analysis_job():
+    """Queue an analysis on the worker pool and return its job id."""
+    file = request.files.get('resume')
+    job_description = request.form.get('job_description', '').strip()
+    
+    if file is None or file.filename == '':
+        return jsonify({'error': 'No resume file uploaded'}), 400
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Only PDF files are allowed'}), 400
+    
+    # Loaded before any job worker is forked, so the workers share the models
+    share_with_workers(get_nlp_processor(), scoring_engine)
+    try:
+        job_id = job_queue.submit(file.read(), job_description)
+    except QueueFullError:
+        response = jsonify({'error': 'Analysis queue is full, please retry later'})
+        response.headers['Retry-After'] = '5'
+        return response, 429
+    
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': url_for('job_status', job_id=job_id)
+    }), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Return the status, and once finished the results, of a queued analysis."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job id'}), 404
+    return jsonify(job)
+
+@app.route('/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """Rank many resumes (PDFs and/or zips of PDFs) against one job description."""
+    job_description = request.form.get('job_description', '').strip()
+    files = request.files.getlist('resumes')
+    
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    if not files:
+        return jsonify({'error': 'No resume files uploaded'}), 400
+    
+    n_process = requested_n_process()
+    batch_size = request.form.get('batch_size', BATCH_SIZE, type=int)
+    
+    try:
+        start = time.perf_counter()
+        
+        # Analyze the job description once for the whole batch
+        with metrics.timer('nlp_job_description'):
+            jd_analysis = analyze_job_description(job_description)
+        
+        from_store = 0
+        failed = []
+        
+        def analyzed():
+            """Yield (filename, analysis) for the PDFs that could be analyzed."""
+            nonlocal from_store
+            for filename, analysis, stored, error in analyze_uploaded_pdfs(
+                    iter_uploaded_pdfs(files), n_process=n_process, batch_size=max(1, batch_size)):
+                if error:
+                    failed.append(filename)
+                    continue
+                from_store += stored
+                yield filename, analysis
+        
+        # analyze_uploaded_pdfs is lazy, so extraction, NLP and scoring interleave in this stage
+        with metrics.timer('batch_nlp_and_scoring'):
+            ranked = scoring_engine.rank_resumes(analyzed(), jd_analysis)
         
-        # Prepare results data
-        results_data = {
+        elapsed = time.perf_counter() - start
+    except zipfile.BadZipFile:
+        return jsonify({'error': 'Uploaded zip archive is corrupt'}), 400
+    except AnalysisAborted as e:
+        return analysis_aborted(e)
+    except Exception as e:
+        logging.error(f"Error during batch analysis: {str(e)}")
+        return jsonify({'error': 'An error occurred during batch analysis'}), 500
+    
+    results = [{
+        'rank': score_data['rank'],
+        'filename': score_data['resume_id'],
+        'overall_score': score_data['overall_score'],
+        'skill_score': score_data['skill_score'],
+        'role_score': score_data['role_score'],
+        'experience_score': score_data['experience_score'],
+        'keyword_score': score_data['keyword_score'],
+        'semantic_score': score_data['semantic_score'],
+        'matched_keywords': score_data['matched_keywords'],
+        'missing_keywords': score_data['missing_keywords']
+    } for score_data in ranked]
+    
+    return jsonify({
+        'results': results,
+        'failed': failed,
+        'count': len(results),
+        'from_store': from_store,
+        'elapsed_seconds': round(elapsed, 3),
+        'resumes_per_second': round(len(results) / elapsed, 2) if elapsed > 0 else None
+    })
+
+@app.route('/analyze-batch/stream', methods=['POST'])
+def analyze_batch_stream():
+    """Score many resumes against one job description, streaming NDJSON.
+    
+    One line is written per resume, in upload order, as soon as it is scored,
+    followed by a summary line. PDFs are extracted and parsed lazily, so
+    memory stays flat however large the batch; if the client disconnects,
+    the remaining resumes are never processed.
+    """
+    job_description = request.form.get('job_description', '').strip()
+    files = request.files.getlist('resumes')
+    
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    if not files:
+        return jsonify({'error': 'No resume files uploaded'}), 400
+    
+    n_process = requested_n_process()
+    batch_size = max(1, request.form.get('batch_size', BATCH_SIZE, type=int))
+    jd_analysis = analyze_job_description(job_description)
+    
+    # Flask closes the uploaded files when this view returns, so the generator
+    # reads private copies (anonymous temp files, removed on close)
+    uploads = []
+    for file in files:
+        spool = tempfile.TemporaryFile(dir=app.config['UPLOAD_FOLDER'])
+        shutil.copyfileobj(file.stream, spool)
+        spool.seek(0)
+        uploads.append(FileStorage(stream=spool, filename=file.filename))
+    
+    def generate():
+        start = time.perf_counter()
+        analyses = analyze_uploaded_pdfs(iter_uploaded_pdfs(uploads), n_process=n_process, batch_size=batch_size)
+        count = 0
+        failed = 0
+        try:
+            for index, (filename, analysis, stored, error) in enumerate(analyses):
+                if error:
+                    failed += 1
+                    yield json.dumps({'index': index, 'filename': filename, 'error': error}) + '\n'
+                    continue
+                
+                with metrics.timer('scoring'):
+                    results_data = scoring_engine.build_results(analysis, jd_analysis)
+                count += 1
+                yield json.dumps(dict(results_data, index=index, filename=filename, from_store=stored)) + '\n'
+            
+            elapsed = time.perf_counter() - start
+            yield json.dumps({
+                'done': True,
+                'count': count,
+                'failed': failed,
+                'elapsed_seconds': round(elapsed, 3),
+                'resumes_per_second': round(count / elapsed, 2) if elapsed > 0 else None
+            }) + '\n'
+        except GeneratorExit:
+            # The client went away; closing the pipeline below stops any further work
+            metrics.inc('stream_cancelled_total', help='Streaming batch analyses cancelled by client disconnect')
+            logging.info(f"Streaming batch cancelled by client after {count} resumes")
+            raise
+        except zipfile.BadZipFile:
+            yield json.dumps({'error': 'Uploaded zip archive is corrupt'}) + '\n'
+        except Exception as e:
+            logging.error(f"Error during streaming batch analysis: {str(e)}")
+            yield json.dumps({'error': 'An error occurred during batch analysis'}) + '\n'
+        finally:
+            analyses.close()
+            for upload in uploads:
+                upload.close()
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/catalog/jobs', methods=['POST'])
+def add_catalog_jobs():
+    """Add (or replace) one job or a JSON list of jobs in the matching catalog.
+
+    Each job is ``{"id": ..., "description": ..., "title": ...}``.
+    """
+    payload = request.get_json(silent=True)
+    jobs = payload if isinstance(payload, list) else [payload]
+    if not all(isinstance(job, dict) and job.get('id') is not None and str(job.get('description', '')).strip()
+               for job in jobs):
+        return jsonify({'error': 'Each job needs an id and a description'}), 400
+    
+    version = get_nlp_processor().version
+    for job in jobs:
+        description = job['description'].strip()
+        jd_analysis = analyze_job_description(description)
+        if analysis_store is None:
+            job_catalog.add(str(job['id']), jd_analysis, metadata={'title': job.get('title', '')})
+        else:
+            analysis_store.put_record('catalog_job', str(job['id']), {
+                'title': job.get('title', ''), 'description': description, 'version': version, 'analysis': jd_analysis
+            })
+    sync_job_catalog()
+    
+    return jsonify({'added': [str(job['id']) for job in jobs], 'catalog_size': len(job_catalog)}), 201
+
+@app.route('/catalog/jobs/<job_id>', methods=['DELETE'])
+def remove_catalog_job(job_id):
+    """Remove a job from the matching catalog."""
+    sync_job_catalog()
+    if analysis_store is None:
+        removed = job_catalog.remove(job_id)
+    else:
+        removed = analysis_store.delete_record('catalog_job', job_id)
+        sync_job_catalog()
+    if not removed:
+        return jsonify({'error': 'Unknown job id'}), 404
+    return jsonify({'removed': job_id, 'catalog_size': len(job_catalog)})
+
+def sync_job_catalog():
+    """Apply catalog changes stored (by any app process) since this process last looked.
+    
+    The first call in a process rebuilds the whole catalog and its inverted
+    index from the store. Jobs analyzed by another processor version are
+    re-analyzed from their description.
+    """
+    if analysis_store is None:
+        return
+    with _catalog_sync_lock:
+        changes = analysis_store.record_changes('catalog_job', since=job_catalog.synced_seq)
+        if not changes:
+            return
+        version = get_nlp_processor().version
+        for seq, job_id, job in changes:
+            if job is None:
+                job_catalog.remove(job_id)
+            else:
+                try:
+                    jd_analysis = (job['analysis'] if job['version'] == version
+                                   else analyze_job_description(job['description']))
+                except AnalysisAborted as e:
+                    # e.g. over a token budget lowered since it was added
+                    logging.warning(f"Catalog job {job_id} skipped: {str(e)}")
+                    job_catalog.remove(job_id)
+                else:
+                    job_catalog.add(job_id, jd_analysis, metadata={'title': job['title']})
+            job_catalog.synced_seq = seq
+
+def sync_requisition(requisition):
+    """Score stored analyses added since the requisition's last sync; returns how many were new."""
+    if analysis_store is None:
+        return 0
+    # created_at is stamped before the row commits, so a row may show up after
+    # later ones were read; re-reading the margin scores it in place instead of missing it
+    synced_at = time.time() - STORE_SYNC_MARGIN
+    records = analysis_store.query(version=resume_analysis_version(), since=requisition.synced_at)
+    added = requisitions.add_candidates(
+        requisition.requisition_id,
+        ((record['pdf_hash'], record['analysis']) for record in records),
+        labels={record['pdf_hash']: record['filename'] for record in records}
+    )
+    requisition.synced_at = synced_at
+    return added
+
+def requisition_response(requisition, **extra):
+    """JSON body describing a requisition and the top of its ranking."""
+    top_k = request.args.get('top_k', 20, type=int)
+    offset = max(0, request.args.get('offset', 0, type=int))
+    body = {
+        'id': requisition.requisition_id,
+        'title': requisition.metadata.get('title', ''),
+        'weights': requisition.weights,
+        'thresholds': requisition.thresholds,
+        'candidates': len(requisition),
+        'ranking': requisitions.ranking(requisition.requisition_id, top_k=max(0, top_k), offset=offset)
+    }
+    body.update(extra)
+    return jsonify(body)
+
+def sync_requisitions():
+    """Apply requisition changes stored (by any app process) since this process last looked.
+    
+    The first call in a process re-creates every stored requisition and
+    scores the stored analyses against it. A change of weights, thresholds
+    or title is applied in place and keeps the cached component scores.
+    Requisitions analyzed by another processor version are re-analyzed
+    from their description.
+    """
+    if analysis_store is None:
+        return
+    with _requisition_sync_lock:
+        changes = analysis_store.record_changes('requisition', since=requisitions.synced_seq)
+        if not changes:
+            return
+        version = get_nlp_processor().version
+        for seq, requisition_id, stored in changes:
+            requisition = requisitions.get(requisition_id)
+            if stored is None:
+                requisitions.remove(requisition_id)
+            elif requisition is not None and requisition.metadata.get('description') == stored['description']:
+                if requisition.weights != stored['weights']:
+                    requisitions.set_weights(requisition_id, stored['weights'])
+                requisitions.set_thresholds(requisition_id, stored['thresholds'])
+                requisition.metadata['title'] = stored['title']
+            else:
+                try:
+                    jd_analysis = (stored['analysis'] if stored['version'] == version
+                                   else analyze_job_description(stored['description']))
+                except AnalysisAborted as e:
+                    logging.warning(f"Requisition {requisition_id} skipped: {str(e)}")
+                    requisitions.remove(requisition_id)
+                else:
+                    requisition = requisitions.create(
+                        requisition_id, jd_analysis, weights=stored['weights'], thresholds=stored['thresholds'],
+                        metadata={'title': stored['title'], 'description': stored['description']}
+                    )
+                    sync_requisition(requisition)
+            requisitions.synced_seq = seq
+
+def update_stored_requisition(requisition_id, **fields):
+    """Store new (validated) fields of a requisition; returns False if it is not stored."""
+    stored = analysis_store.get_record('requisition', requisition_id)
+    if stored is None:
+        return False
+    stored.update(fields)
+    analysis_store.put_record('requisition', requisition_id, stored)
+    sync_requisitions()
+    return True
+
+@app.route('/requisitions', methods=['POST'])
+def create_requisition():
+    """Create (or replace) a requisition with its own weights profile and thresholds.
+
+    Body: ``{"id": ..., "description": ..., "title": ..., "weights": {...}, "thresholds": {...}}``.
+    Every stored resume analysis is scored against it once.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or payload.get('id') is None or not str(payload.get('description', '')).strip():
+        return jsonify({'error': 'A requisition needs an id and a description'}), 400
+    if not isinstance(payload.get('weights') or {}, dict):
+        return jsonify({'error': 'weights must be a JSON object'}), 400
+    if not isinstance(payload.get('thresholds') or {}, dict):
+        return jsonify({'error': 'thresholds must be a JSON object'}), 400
+    try:
+        weights = scoring_engine.normalize_weights(payload.get('weights'))
+    except ValueError as e:
+        return jsonify({'error': f'Invalid weights: {str(e)}'}), 400
+    try:
+        thresholds = scoring_engine.normalize_thresholds(payload.get('thresholds'))
+    except ValueError as e:
+        return jsonify({'error': f'Invalid thresholds: {str(e)}'}), 400
+    
+    start = time.perf_counter()
+    requisition_id = str(payload['id'])
+    description = payload['description'].strip()
+    jd_analysis = analyze_job_description(description)
+    metadata = {'title': payload.get('title', ''), 'description': description}
+    if analysis_store is None:
+        requisition = requisitions.create(
+            requisition_id, jd_analysis, weights=weights, thresholds=thresholds, metadata=metadata
+        )
+    else:
+        analysis_store.put_record('requisition', requisition_id, dict(
+            metadata, weights=weights, thresholds=thresholds,
+            version=get_nlp_processor().version, analysis=jd_analysis
+        ))
+        sync_requisitions()
+        requisition = requisitions.get(requisition_id)
+        if requisition is None:  # removed by another request meanwhile
+            return jsonify({'error': 'Unknown requisition id'}), 404
+    sync_requisition(requisition)
+    return requisition_response(requisition, elapsed_seconds=round(time.perf_counter() - start, 3)), 201
+
+@app.route('/requisitions/<requisition_id>', methods=['GET'])
+def get_requisition(requisition_id):
+    """Return a requisition's ranking (``top_k``/``offset`` paginate it)."""
+    sync_requisitions()
+    requisition = requisitions.get(requisition_id)
+    if requisition is None:
+        return jsonify({'error': 'Unknown requisition id'}), 404
+    return requisition_response(requisition)
+
+@app.route('/requisitions/<requisition_id>/weights', methods=['PUT'])
+def update_requisition_weights(requisition_id):
+    """Change a requisition's weights and re-rank it from cached component scores."""
+    sync_requisitions()
+    requisition = requisitions.get(requisition_id)
+    if requisition is None:
+        return jsonify({'error': 'Unknown requisition id'}), 404
+    weights = request.get_json(silent=True)
+    if not isinstance(weights, dict):
+        return jsonify({'error': 'Body must be a JSON object of weights'}), 400
+    
+    start = time.perf_counter()
+    try:
+        weights = scoring_engine.normalize_weights(weights)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid weights: {str(e)}'}), 400
+    if analysis_store is None:
+        requisitions.set_weights(requisition_id, weights)
+    elif not update_stored_requisition(requisition_id, weights=weights):
+        return jsonify({'error': 'Unknown requisition id'}), 404
+    return requisition_response(requisition, elapsed_seconds=round(time.perf_counter() - start, 4))
+
+@app.route('/requisitions/<requisition_id>/thresholds', methods=['PUT'])
+def update_requisition_thresholds(requisition_id):
+    """Change the thresholds a requisition's ranking entries are checked against."""
+    sync_requisitions()
+    requisition = requisitions.get(requisition_id)
+    if requisition is None:
+        return jsonify({'error': 'Unknown requisition id'}), 404
+    thresholds = request.get_json(silent=True)
+    if not isinstance(thresholds, dict):
+        return jsonify({'error': 'Body must be a JSON object of thresholds'}), 400
+    
+    try:
+        thresholds = scoring_engine.normalize_thresholds(thresholds)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid thresholds: {str(e)}'}), 400
+    if analysis_store is None:
+        requisitions.set_thresholds(requisition_id, thresholds)
+    elif not update_stored_requisition(requisition_id, thresholds=thresholds):
+        return jsonify({'error': 'Unknown requisition id'}), 404
+    return requisition_response(requisition)
+
+@app.route('/requisitions/<requisition_id>/refresh', methods=['POST'])
+def refresh_requisition(requisition_id):
+    """Score analyses stored since the last refresh and update the ranking."""
+    sync_requisitions()
+    requisition = requisitions.get(requisition_id)
+    if requisition is None:
+        return jsonify({'error': 'Unknown requisition id'}), 404
+    added = sync_requisition(requisition)
+    return requisition_response(requisition, added=added)
+
+@app.route('/requisitions/<requisition_id>', methods=['DELETE'])
+def remove_requisition(requisition_id):
+    """Remove a requisition."""
+    if analysis_store is None:
+        removed = requisitions.remove(requisition_id)
+    else:
+        removed = analysis_store.delete_record('requisition', requisition_id)
+        sync_requisitions()
+    if not removed:
+        return jsonify({'error': 'Unknown requisition id'}), 404
+    return jsonify({'removed': requisition_id})
+
+def sync_candidate_index():
+    """Index stored analyses added since the last sync; returns how many were new.
+    
+    The first sync (and the first after the analysis version changes) reads
+    the whole store page by page. Later syncs re-read the last
+    STORE_SYNC_MARGIN seconds (see sync_requisition) and skip the
+    candidates already indexed.
+    """
+    version = resume_analysis_version()
+    with _candidate_sync_lock:
+        if candidate_index.version != version:
+            candidate_index.clear(version)
+        synced_at = time.time() - STORE_SYNC_MARGIN
+        added = 0
+        for _, pdf_hash, filename, analysis in analysis_store.iter_records(
+                version=version, since=candidate_index.synced_at):
+            if pdf_hash in candidate_index:
+                continue
+            candidate_index.add(pdf_hash, analysis, label=filename)
+            added += 1
+        candidate_index.synced_at = synced_at
+    return added
+
+@app.route('/candidates/search')
+def search_candidates():
+    """Find stored resumes matching a boolean skill/role/experience/education query.
+
+    ``q`` is e.g. ``python AND (django OR flask) AND >=3 years``; ``limit``
+    and ``offset`` paginate the matches, most experienced first.
+    """
+    if analysis_store is None:
+        return jsonify({'error': 'The analysis store is disabled'}), 404
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'A query (q) is required'}), 400
+    limit = min(max(0, request.args.get('limit', 50, type=int)), MAX_SEARCH_RESULTS)
+    offset = max(0, request.args.get('offset', 0, type=int))
+    
+    start = time.perf_counter()
+    added = sync_candidate_index()
+    synced = time.perf_counter()
+    aliases = {alias.lower(): skill.lower() for alias, skill in get_nlp_processor().skill_aliases.items()}
+    try:
+        total, results = candidate_index.search(query, limit=limit, offset=offset, aliases=aliases)
+    except QueryError as e:
+        return jsonify({'error': f'Invalid query: {str(e)}'}), 400
+    
+    return jsonify({
+        'query': query,
+        'total': total,
+        'results': [{
+            'pdf_hash': result['candidate_id'],
+            'filename': result['label'],
+            'experience_years': result['experience_years'],
+            'education_level': result['education_level']
+        } for result in results],
+        'indexed': len(candidate_index),
+        'newly_indexed': added,
+        'sync_ms': round((synced - start) * 1000, 2),
+        'search_ms': round((time.perf_counter() - synced) * 1000, 2)
+    })
+
+@app.route('/match-jobs', methods=['POST'])
+def match_jobs():
+    """Return the catalog jobs that best fit an uploaded resume."""
+    file = request.files.get('resume')
+    if file is None or not allowed_file(file.filename or ''):
+        return jsonify({'error': 'A PDF resume is required'}), 400
+    top_k = max(1, request.values.get('top_k', 10, type=int))
+    
+    resume_analysis = analyze_resume_pdf(file.stream, filename=secure_filename(file.filename))
+    if resume_analysis is None:
+        return jsonify({'error': 'Could not extract text from the PDF'}), 400
+    
+    sync_job_catalog()
+    matches = job_catalog.match(resume_analysis, top_k=top_k)
+    
+    return jsonify({
+        'matches': [{
+            'job_id': score_data['job_id'],
+            'title': score_data['metadata'].get('title', ''),
             'overall_score': score_data['overall_score'],
             'skill_score': score_data['skill_score'],
             'role_score': score_data['role_score'],
             'experience_score': score_data['experience_score'],
-            'matched_keywords': score_data['matched_keywords'],
-            'missing_keywords': score_data['missing_keywords'],
-            'suggestions': suggestions,
-            'resume_keywords': resume_analysis['keywords'],
-            'jd_keywords': jd_analysis['keywords']
-        }
-        
-        return render_template('results.html', results=results_data)
-        
-    except Exception as e:
-        logging.error(f"Error during analysis: {str(e)}")
-        flash('An error occurred during analysis. Please try again.', 'error')
-        return redirect(url_for('index'))
+            'matched_skills': score_data['matched_skills'],
+            'missing_skills': score_data['missing_skills']
+        } for score_data in matches],
+        'catalog_size': len(job_catalog)
+    })
+
+@app.route('/analyses')
+def list_analyses():
+    """List stored resume analyses (metadata only) for the current analysis version.
+
+    ``all_versions=1`` includes analyses made by older processor versions.
+    ``limit`` (default 100) is clamped to 1..MAX_LIST_ANALYSES.
+    """
+    if analysis_store is None:
+        return jsonify({'error': 'The analysis store is disabled'}), 404
+    try:
+        # Not type=int: that silently falls back to the default, and SQLite reads a negative LIMIT as none
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    version = None if request.args.get('all_versions') == '1' else resume_analysis_version()
+    records = analysis_store.query(
+        version=version,
+        since=request.args.get('since', type=float),
+        limit=min(max(1, limit), MAX_LIST_ANALYSES),
+        include_analysis=False
+    )
+    return jsonify({'analyses': records, 'count': len(records), 'stats': analysis_store.stats()})
+
+@app.route('/analyses/rescore', methods=['POST'])
+def rescore_analyses():
+    """Rank stored resume analyses against a job description without re-reading any PDF."""
+    if analysis_store is None:
+        return jsonify({'error': 'The analysis store is disabled'}), 404
+    job_description = request.values.get('job_description', '').strip()
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    start = time.perf_counter()
+    jd_analysis = analyze_job_description(job_description)
+    records = analysis_store.query(
+        version=resume_analysis_version(),
+        since=request.values.get('since', type=float),
+        limit=request.values.get('limit', type=int)
+    )
+    filenames = {record['pdf_hash']: record['filename'] for record in records}
+    ranked = scoring_engine.rank_resumes(
+        ((record['pdf_hash'], record['analysis']) for record in records), jd_analysis
+    )
+    top_k = request.values.get('top_k', type=int)
+    
+    return jsonify({
+        'results': [{
+            'rank': score_data['rank'],
+            'pdf_hash': score_data['resume_id'],
+            'filename': filenames.get(score_data['resume_id']),
+            'overall_score': score_data['overall_score'],
+            'skill_score': score_data['skill_score'],
+            'role_score': score_data['role_score'],
+            'experience_score': score_data['experience_score'],
+            'keyword_score': score_data['keyword_score'],
+            'semantic_score': score_data['semantic_score']
+        } for score_data in ranked[:top_k]],
+        'count': len(ranked),
+        'elapsed_seconds': round(time.perf_counter() - start, 3)
+    })
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose counters and latency summaries in Prometheus text format."""
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@app.route('/cache-stats')
+def cache_stats():
+    """Return job description cache hit/miss counters."""
+    return jsonify(jd_cache.stats())
+
+@app.route('/startup')
+def startup_report():
+    """Return import and model load timings and peak memory for this worker."""
+    report = startup_timer.report()
+    report['nlp_loaded'] = _nlp_processor is not None
+    report['peak_rss_bytes'] = peak_rss_bytes()
+    if _nlp_processor is not None:
+        report['nlp_pipeline'] = _nlp_processor.nlp.pipe_names
+    return jsonify(report)
 
 @app.route('/sample-jd')
 def sample_jd():
@@ -153,7 +1095,84 @@ Nice to have:
     return jsonify(sample)
 
 @app.route('/export-pdf')
-def export_pdf():
-    """Export results as PDF (simple print-friendly version)."""
-    # For now, just redirect to print; in production, use a library like ReportLab
-    return render_template('results.html', results=request.args.to_dict(), print_mode=True)
+def export_pdf_legacy():
+    """Redirect ``/export-pdf?result_id=...`` to the report download."""
+    result_id = request.args.get('result_id', '').strip()
+    if not result_id:
+        return jsonify({'error': 'result_id is required'}), 400
+    return redirect(url_for('export_pdf', result_id=result_id))
+
+@app.route('/export-pdf/<result_id>')
+def export_pdf(result_id):
+    """Download the PDF report of a stored result, rendering it on first request."""
+    record = analysis_store.get_result(result_id) if analysis_store is not None else None
+    if record is None:
+        return jsonify({'error': 'Unknown result id'}), 404
+    
+    with metrics.timer('report_pdf'):
+        path = report_cache.get_or_render(result_id, record['result'], filename=record['filename'])
+    name = os.path.splitext(record['filename'] or 'resume')[0]
+    return send_file(os.path.abspath(path), mimetype='application/pdf', as_attachment=True,
+                     download_name=f"{name}-report.pdf")
+
+@app.route('/export-pdf/bulk', methods=['POST'])
+def export_pdf_bulk():
+    """Queue a zip of the PDF reports of many stored results; returns a job id."""
+    payload = request.get_json(silent=True) or {}
+    result_ids = payload.get('result_ids')
+    if not isinstance(result_ids, list) or not result_ids or not all(isinstance(i, str) for i in result_ids):
+        return jsonify({'error': 'result_ids must be a non-empty list of result ids'}), 400
+    if len(result_ids) > MAX_BULK_REPORTS:
+        return jsonify({'error': f'At most {MAX_BULK_REPORTS} reports per export'}), 400
+    if analysis_store is None:
+        return jsonify({'error': 'Result storage is disabled (ANALYSIS_STORE_DB)'}), 404
+    
+    records, unknown = [], []
+    for result_id in dict.fromkeys(result_ids):
+        record = analysis_store.get_result(result_id)
+        if record is None:
+            unknown.append(result_id)
+        else:
+            records.append(record)
+    if unknown:
+        return jsonify({'error': 'Unknown result ids', 'unknown': unknown}), 404
+    
+    job_id = bulk_exporter.submit(records)
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': url_for('export_pdf_bulk_status', job_id=job_id)
+    }), 202
+
+@app.route('/export-pdf/bulk/<job_id>')
+def export_pdf_bulk_status(job_id):
+    """Return the progress of a bulk report export."""
+    job = bulk_exporter.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job id'}), 404
+    archive = job.pop('archive')
+    if archive:
+        job['download_url'] = url_for('export_pdf_bulk_download', job_id=job_id)
+    return jsonify(job)
+
+@app.route('/export-pdf/bulk/<job_id>/download')
+def export_pdf_bulk_download(job_id):
+    """Send the zip of a finished bulk report export."""
+    job = bulk_exporter.get(job_id)
+    if job is None or not job['archive']:
+        return jsonify({'error': 'Unknown or unfinished job id'}), 404
+    # Open it here: an expired archive may be pruned at any moment, but an open file stays readable
+    try:
+        archive = open(job['archive'], 'rb')
+    except FileNotFoundError:
+        return jsonify({'error': 'Unknown or unfinished job id'}), 404
+    return send_file(archive, mimetype='application/zip', as_attachment=True, download_name='reports.zip')
+
+if PRELOAD_MODELS:
+    # Load before the server forks workers, then move the loaded objects out of
+    # the garbage collector's reach so collections don't dirty shared pages.
+    # No sqlite connection is open yet: each forked worker opens its own.
+    share_with_workers(get_nlp_processor(), scoring_engine)
+    gc.freeze()
+
+startup_timer.mark('app ready')
@@ -0,0 +1,482 @@
+"""Offline batch analysis and scoring of a resume archive.
+
+Resumes (.pdf or .txt) come from a directory, walked recursively, or from a
+CSV manifest with a ``resume`` column of paths and an optional
+``job_description`` column naming a job description file for that row.
+Every resume is scored against each ``--jd`` file (or its manifest job
+description). Work is spread over a process pool whose workers load
+NLPProcessor and ScoringEngine once, and one row per resume and job
+description is written to CSV or Parquet as chunks finish.
+
+Progress is checkpointed next to the output, so an interrupted run started
+again with the same arguments skips the resumes already written.
+
+Usage:
+    python batch_analyze.py archive/ --jd jds/python.txt --jd jds/data.txt --output scores.csv
+    python batch_analyze.py manifest.csv --output scores.parquet --workers 8
+"""
+import os
+import re
+import csv
+import sys
+import json
+import time
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+RESUME_EXTENSIONS = ('.pdf', '.txt')
+
+COLUMNS = ['resume', 'job_description', 'overall_score', 'skill_score', 'role_score', 'experience_score',
+           'keyword_score', 'semantic_score', 'experience_years', 'education_level', 'skills', 'error']
+
+SCORE_COLUMNS = ('overall_score', 'skill_score', 'role_score', 'experience_score', 'keyword_score',
+                 'semantic_score')
+
+# Per-process state, populated by _init_worker in each pool worker
+_worker = {}
+
+def _init_worker(job_descriptions, pdf_limits, store_db):
+    """Load the NLP processor and scoring engine once per worker process."""
+    logging.disable(logging.INFO)
+    from nlp_processor import NLPProcessor
+    from scoring_engine import ScoringEngine
+    from analysis_store import AnalysisStore
+
+    _worker['nlp_processor'] = NLPProcessor()
+    _worker['scoring_engine'] = ScoringEngine()
+    _worker['pdf_limits'] = pdf_limits
+    _worker['analysis_store'] = AnalysisStore(store_db) if store_db else None
+    _worker['store_version'] = AnalysisStore.make_version(_worker['nlp_processor'].version, pdf_limits)
+    # Job descriptions are few; every worker analyzes all of them up front
+    _worker['jd_analyses'] = {
+        name: _worker['nlp_processor'].analyze_text(text, text_type='job_description')
+        for name, text in job_descriptions.items()
+    }
+
+def _read_resume(path):
+    """Return (text, pdf_bytes) for one resume file; pdf_bytes is None for .txt."""
+    from pdf_extractor import extract_text_from_pdf
+
+    if path.lower().endswith('.txt'):
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            return f.read(), None
+    with open(path, 'rb') as f:
+        pdf_bytes = f.read()
+    return extract_text_from_pdf(pdf_bytes, **_worker['pdf_limits']), pdf_bytes
+
+def _ping():
+    """No-op task; returns once a worker has initialized."""
+    return os.getpid()
+
+def error_row(item, error):
+    """Return the output row of an item that could not be analyzed."""
+    return {'resume': item[0], 'job_description': '', 'error': error}
+
+def analyze_chunk(items):
+    """Analyze and score a chunk of ``(resume, job_description_names)`` items in a worker.
+
+    Returns the output rows. A resume that cannot be read, has no text or
+    fails analysis gives one row with ``error`` set. When the chunk as a
+    whole fails (in the NLP pipeline or scoring), its items are retried one
+    by one so a single bad document only fails itself.
+    """
+    try:
+        return _analyze_items(items)
+    except Exception as e:
+        if len(items) == 1:
+            return [error_row(items[0], f"analysis failed: {type(e).__name__}: {e}")]
+        logging.warning(f"Chunk of {len(items)} resumes failed ({type(e).__name__}: {e}); retrying one by one")
+        return [row for item in items for row in analyze_chunk([item])]
+
+def _analyze_items(items):
+    """Do the work of analyze_chunk, raising if anything past reading the resumes fails."""
+    from analysis_store import AnalysisStore
+
+    nlp_processor = _worker['nlp_processor']
+    analysis_store = _worker['analysis_store']
+    version = _worker['store_version']
+
+    analyses = [None] * len(items)
+    errors = [''] * len(items)
+    pending = []  # (index, text, pdf hash) still to be analyzed
+    for index, (resume, _) in enumerate(items):
+        try:
+            text, pdf_bytes = _read_resume(resume)
+        except Exception as e:
+            errors[index] = f"read failed: {e}"
+            continue
+        if not text or not text.strip():
+            errors[index] = 'no text extracted'
+            continue
+        pdf_hash = None
+        if analysis_store is not None and pdf_bytes is not None:
+            pdf_hash = AnalysisStore.hash_pdf(pdf_bytes)
+            analyses[index] = analysis_store.get(pdf_hash, version)
+            if analyses[index] is not None:
+                continue
+        pending.append((index, text, pdf_hash))
+
+    # The rest go through nlp.pipe together
+    texts = (text for _, text, _ in pending)
+    for (index, _, pdf_hash), analysis in zip(pending, nlp_processor.analyze_texts(texts, text_type='resume')):
+        analyses[index] = analysis
+        if pdf_hash is not None:
+            analysis_store.put(pdf_hash, version, analysis, filename=os.path.basename(items[index][0]))
+
+    # Score resumes sharing the same job descriptions in one vectorized pass
+    groups = {}
+    for index, (_, jd_names) in enumerate(items):
+        if analyses[index] is not None and jd_names:
+            groups.setdefault(tuple(jd_names), []).append(index)
+    scores = {}  # (item index, jd name) -> score columns
+    for jd_names, indexes in groups.items():
+        matrix = _worker['scoring_engine'].score_matrix(
+            [analyses[index] for index in indexes], [_worker['jd_analyses'][name] for name in jd_names]
+        )
+        for row, index in enumerate(indexes):
+            for column, name in enumerate(jd_names):
+                scores[index, name] = {key: int(matrix[key][row, column]) for key in SCORE_COLUMNS}
+
+    rows = []
+    for index, (resume, jd_names) in enumerate(items):
+        analysis = analyses[index]
+        base = {'resume': resume, 'error': errors[index]}
+        if analysis is not None:
+            base.update({
+                'experience_years': analysis['experience_years'],
+                'education_level': analysis['education_level'],
+                'skills': ';'.join(sorted(analysis['skills']))
+            })
+        if analysis is None or not jd_names:
+            rows.append(dict(base, job_description=''))
+            continue
+        for name in jd_names:
+            rows.append(dict(base, job_description=name, **scores[index, name]))
+    return rows
+
+def discover(source, jd_names):
+    """Return the ``(resume, job_description_names)`` items of a directory or CSV manifest.
+
+    Manifest rows without a job description are scored against ``jd_names``;
+    the job description files a manifest names are returned as the second
+    element so their text can be loaded.
+    """
+    if os.path.isdir(source):
+        items = []
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    items.append((os.path.join(root, name), list(jd_names)))
+        return items, []
+
+    base = os.path.dirname(os.path.abspath(source))
+    items, manifest_jds = [], set()
+    with open(source, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            resume = (row.get('resume') or '').strip()
+            if not resume:
+                continue
+            jd = (row.get('job_description') or '').strip()
+            if jd:
+                jd = os.path.join(base, jd)
+                manifest_jds.add(jd)
+            items.append((os.path.join(base, resume), [jd] if jd else list(jd_names)))
+    return items, sorted(manifest_jds)
+
+def item_key(item):
+    """Return the checkpoint key of an item."""
+    resume, jd_names = item
+    return '\t'.join([resume] + list(jd_names))
+
+class Checkpoint:
+    """Append-only progress log next to the output file.
+
+    Each line records the keys of one finished chunk and the output position
+    after its rows were written (CSV byte offset or Parquet part count). On
+    resume the output is cut back to the last recorded position, so rows of a
+    chunk that was written but not checkpointed are not duplicated.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Return (finished keys, last output position or None)."""
+        done, position = set(), None
+        if not os.path.exists(self.path):
+            return done, position
+        valid = 0  # bytes of complete entries
+        with open(self.path, 'rb+') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line from an interrupted write; drop it before appending
+                    f.truncate(valid)
+                    break
+                done.update(entry['keys'])
+                position = entry['position']
+                valid += len(line)
+        return done, position
+
+    def record(self, keys, position):
+        """Durably append one finished chunk."""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'keys': keys, 'position': position}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+class CsvWriter:
+    """Append rows to a CSV file; the position is the file size."""
+
+    def __init__(self, path, position):
+        exists = os.path.exists(path)
+        self._file = open(path, 'a+', newline='', encoding='utf-8')
+        if exists:
+            self._file.truncate(position or 0)
+            self._file.seek(0, os.SEEK_END)
+        self._writer = csv.DictWriter(self._file, fieldnames=COLUMNS)
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+
+    def write(self, rows):
+        """Write rows and return the new position once they are on disk."""
+        self._writer.writerows(rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+# Part files written by ParquetWriter (and the temporary file of an interrupted write);
+# anything else in the output directory is left alone
+PART_NAME = re.compile(r'part-(\d+)\.parquet(?:\.tmp)?')
+
+class ParquetWriter:
+    """Write each flush as a numbered part file in an output directory; the position is the part count.
+
+    Parquet files cannot be appended to, so a dataset of parts is written;
+    pyarrow and pandas read the directory as one table.
+    """
+
+    def __init__(self, path, position):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self.parts = position or 0
+        os.makedirs(path, exist_ok=True)
+        # Drop parts written after the last checkpoint
+        for name in os.listdir(path):
+            match = PART_NAME.fullmatch(name)
+            if match and int(match.group(1)) >= self.parts:
+                os.remove(os.path.join(path, name))
+
+    def write(self, rows):
+        """Write rows as the next part file and return the new part count."""
+        table = self._pa.Table.from_pylist(rows, schema=self._pa.schema([
+            (column, self._pa.string() if column in ('resume', 'job_description', 'skills', 'error')
+             else self._pa.int64()) for column in COLUMNS
+        ]))
+        part = os.path.join(self.path, f'part-{self.parts:05d}.parquet')
+        self._pq.write_table(table, part + '.tmp')
+        os.replace(part + '.tmp', part)
+        self.parts += 1
+        return self.parts
+
+    def close(self):
+        pass
+
+class Progress:
+    """Live docs/sec line on stderr, redrawn at most once per ``interval`` seconds."""
+
+    def __init__(self, total, skipped, interval=1.0):
+        self.total = total
+        self.skipped = skipped
+        self.done = 0
+        self.interval = interval
+        self.start = time.perf_counter()
+        self._drawn = 0.0
+
+    def update(self, count, force=False):
+        self.done += count
+        now = time.perf_counter()
+        if not force and now - self._drawn < self.interval:
+            return
+        self._drawn = now
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.skipped - self.done
+        eta = f"{remaining / rate / 60:.1f} min" if rate else '?'
+        sys.stderr.write(f"\r{self.skipped + self.done:,}/{self.total:,} docs  {rate:,.1f} docs/s  ETA {eta}   ")
+        sys.stderr.flush()
+
+def chunks(items, size):
+    """Yield consecutive lists of at most ``size`` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _start_pool(workers, initargs):
+    """Start a worker pool and wait until a worker has initialized.
+
+    Raises RuntimeError when workers cannot start (e.g. the model fails to
+    load), rather than failing every resume afterwards.
+    """
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+    try:
+        executor.submit(_ping).result()
+    except BrokenProcessPool:
+        executor.shutdown(wait=False)
+        raise RuntimeError("Batch workers failed to start; see the error logged above")
+    return executor
+
+def run(items, job_descriptions, writer, checkpoint, done, workers=None, chunk_size=32, store_db=None,
+        pdf_limits=None):
+    """Process every item not in ``done``, writing rows and checkpoints as chunks finish.
+
+    At most two chunks per worker are in flight, so memory stays flat for
+    any archive size. When a worker dies (a crash in the PDF library, the
+    OOM killer), the pool is restarted and the resumes of the chunks that
+    were in flight are run again one at a time, alone in the pool; the one
+    that kills its worker again is written as an ``error`` row. Either way
+    every resume ends up in the output and the checkpoint, so a resumed run
+    does not stop at the same document. Returns the number of resumes
+    processed.
+    """
+    todo = [item for item in items if item_key(item) not in done]
+    progress = Progress(len(items), len(items) - len(todo))
+    workers = workers or os.cpu_count() or 1
+    initargs = (job_descriptions, pdf_limits or {}, store_db)
+    pending = set()
+    queued = chunks(todo, chunk_size)
+    retry = deque()  # chunks to submit again before new ones
+    suspects = deque()  # items in flight when a worker died
+
+    executor = _start_pool(workers, initargs)
+    futures = {}  # future -> (chunk, pool it was submitted to, whether it ran alone)
+
+    def submit(chunk, alone=False):
+        nonlocal executor
+        try:
+            future = executor.submit(analyze_chunk, chunk)
+        except BrokenProcessPool:
+            # Broke while idle; futures still pending on the old pool fail on their own
+            executor.shutdown(wait=False)
+            executor = _start_pool(workers, initargs)
+            future = executor.submit(analyze_chunk, chunk)
+        futures[future] = (chunk, executor, alone)
+        pending.add(future)
+
+    try:
+        while True:
+            if suspects:
+                # Alone in the pool, so a crash can be pinned on this one resume
+                if not pending:
+                    submit([suspects.popleft()], alone=True)
+            else:
+                while len(pending) < workers * 2:
+                    chunk = retry.popleft() if retry else next(queued, None)
+                    if chunk is None:
+                        break
+                    submit(chunk)
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk, pool, alone = futures.pop(future)
+                try:
+                    rows = future.result()
+                except BrokenProcessPool:
+                    if pool is executor:
+                        logging.error("A batch worker died; restarting the pool")
+                        executor.shutdown(wait=False)
+                        executor = _start_pool(workers, initargs)
+                    if not alone:
+                        suspects.extend(chunk)
+                        continue
+                    rows = [error_row(chunk[0], 'worker crashed')]
+                except Exception as e:
+                    # Not raised by the analysis itself (analyze_chunk catches that), e.g. pickling
+                    if len(chunk) > 1:
+                        retry.extend([item] for item in chunk)
+                        continue
+                    rows = [error_row(chunk[0], f"failed: {type(e).__name__}: {e}")]
+                position = writer.write(rows)
+                checkpoint.record([item_key(item) for item in chunk], position)
+                progress.update(len(chunk))
+    except BaseException:
+        # Interrupted: drop queued work; finished chunks are checkpointed
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    progress.update(0, force=True)
+    sys.stderr.write('\n')
+    return progress.done
+
+def read_job_descriptions(paths):
+    """Return {path: text} for job description text files."""
+    job_descriptions = {}
+    for path in paths:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            job_descriptions[path] = f.read()
+    return job_descriptions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', help='directory of resumes, or a CSV manifest with resume[,job_description] columns')
+    parser.add_argument('--jd', action='append', default=[], help='job description text file (repeatable)')
+    parser.add_argument('--output', required=True, help='.csv file, or .parquet output directory')
+    parser.add_argument('--format', choices=['csv', 'parquet'], help='default: from the output extension')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=32, help='resumes per worker task')
+    parser.add_argument('--checkpoint', help='progress log (default: <output>.checkpoint)')
+    parser.add_argument('--store', default=os.environ.get('ANALYSIS_STORE_DB', ''),
+                        help='AnalysisStore database to reuse and fill (default: ANALYSIS_STORE_DB)')
+    parser.add_argument('--restart', action='store_true', help='ignore an existing checkpoint and start over')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    output_format = args.format or ('parquet' if args.output.endswith('.parquet') else 'csv')
+    checkpoint = Checkpoint(args.checkpoint or args.output.rstrip('/') + '.checkpoint')
+    if args.restart and os.path.exists(checkpoint.path):
+        os.remove(checkpoint.path)
+    done, position = checkpoint.load()
+    if position is None:
+        position = 0  # no checkpoint: any earlier output is overwritten
+
+    items, manifest_jds = discover(args.source, args.jd)
+    job_descriptions = read_job_descriptions(sorted(set(args.jd) | set(manifest_jds)))
+    from pdf_extractor import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES
+    # The same caps as the app, so both share stored analyses (the caps are part of their version)
+    pdf_limits = {
+        'max_pages': int(os.environ.get('PDF_MAX_PAGES', DEFAULT_MAX_PAGES)),
+        'max_chars': int(os.environ.get('PDF_MAX_CHARS', DEFAULT_MAX_CHARS))
+    }
+    logging.info(f"{len(items)} resumes, {len(job_descriptions)} job descriptions, "
+                 f"{len(done)} already done according to {checkpoint.path}")
+
+    writer = (ParquetWriter if output_format == 'parquet' else CsvWriter)(args.output, position)
+    start = time.perf_counter()
+    try:
+        processed = run(items, job_descriptions, writer, checkpoint, done, workers=args.workers,
+                        chunk_size=args.chunk_size, store_db=args.store or None, pdf_limits=pdf_limits)
+    except KeyboardInterrupt:
+        sys.stderr.write('\n')
+        logging.info(f"Interrupted; run the same command again to resume from {checkpoint.path}")
+        sys.exit(130)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    logging.info(f"Processed {processed} resumes in {elapsed:.1f}s -> {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+import numpy as np
+from scipy import sparse
+from compact_analysis import CompactAnalysis, vocabulary
+
+# Scoring components, named like the ScoringEngine weights
+COMPONENTS = ('skills', 'role', 'experience', 'keywords', 'semantic')
+
+def _vocabulary(term_sets):
+    """Map every distinct term across ``term_sets`` to a column index."""
+    vocab = {}
+    for terms in term_sets:
+        for term in terms:
+            if term not in vocab:
+                vocab[term] = len(vocab)
+    return vocab
+
+def _incidence(term_sets, vocab):
+    """Build a binary CSR matrix with one row per term set."""
+    indptr = [0]
+    indices = []
+    for terms in term_sets:
+        indices.extend(vocab[term] for term in terms if term in vocab)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(term_sets), len(vocab)), dtype=np.int32)
+
+def _overlap_counts(resume_sets, jd_sets):
+    """Return |resume ∩ jd| for every pair and |jd| for every job description."""
+    vocab = _vocabulary(jd_sets)
+    resume_matrix = _incidence(resume_sets, vocab)
+    jd_matrix = _incidence(jd_sets, vocab)
+    matched = (resume_matrix @ jd_matrix.T).toarray()
+    jd_sizes = np.array([len(terms) for terms in jd_sets], dtype=np.int64)
+    return matched, jd_sizes
+
+def _overlap_ratio(matched, jd_sizes):
+    """Divide matched counts by job description set sizes, 0 where the set is empty."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = matched / jd_sizes[np.newaxis, :]
+    return np.where(jd_sizes[np.newaxis, :] > 0, ratio, 0.0)
+
+def _skill_set_scores(resume_sets, jd_sets):
+    matched, jd_sizes = _overlap_counts(resume_sets, jd_sets)
+    return np.minimum(100, _overlap_ratio(matched, jd_sizes) * 150)
+
+def _keyword_set_scores(resume_sets, jd_sets):
+    matched, jd_sizes = _overlap_counts(resume_sets, jd_sets)
+    return _overlap_ratio(matched, jd_sizes) * 100
+
+def skill_scores(resume_skills, jd_skills):
+    """Vectorized ScoringEngine.calculate_skill_overlap_score (score only)."""
+    resume_sets = [set(skill.lower() for skill in skills) for skills in resume_skills]
+    jd_sets = [set(skill.lower() for skill in skills) for skills in jd_skills]
+    return _skill_set_scores(resume_sets, jd_sets)
+
+def keyword_scores(resume_keywords, jd_keywords):
+    """Vectorized ScoringEngine.calculate_keyword_overlap_score (score only)."""
+    resume_sets = [set(keyword.lower() for keyword in keywords[:20]) for keywords in resume_keywords]
+    jd_sets = [set(keyword.lower() for keyword in keywords[:20]) for keywords in jd_keywords]
+    return _keyword_set_scores(resume_sets, jd_sets)
+
+def role_scores(resume_roles, jd_roles):
+    """Vectorized ScoringEngine.calculate_role_relevance_score."""
+    resume_sets = [set(role.lower() for role in roles) for roles in resume_roles]
+    jd_sets = [set(role.lower() for role in roles) for roles in jd_roles]
+
+    # One vocabulary of role strings for both sides
+    roles = _vocabulary(resume_sets + jd_sets)
+    role_names = list(roles)
+    resume_matrix = _incidence(resume_sets, roles)
+    jd_matrix = _incidence(jd_sets, roles)
+
+    # Exact role matches
+    exact = (resume_matrix @ jd_matrix.T).toarray()
+
+    # Partial matches: a word of one role occurs as a substring of the other.
+    # Substring tests are only needed between resume roles and JD role words,
+    # and between JD roles and resume role words.
+    resume_role_ids = sorted({roles[role] for terms in resume_sets for role in terms})
+    jd_role_ids = sorted({roles[role] for terms in jd_sets for role in terms})
+    jd_words = _vocabulary(role_names[i].split() for i in jd_role_ids)
+    resume_words = _vocabulary(role_names[i].split() for i in resume_role_ids)
+
+    def word_matrix(role_ids, words, contains):
+        rows, cols = [], []
+        for i in role_ids:
+            role = role_names[i]
+            for word, j in words.items():
+                if contains(word, role):
+                    rows.append(i)
+                    cols.append(j)
+        data = np.ones(len(rows), dtype=np.int32)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(roles), len(words)), dtype=np.int32)
+
+    in_split = lambda word, role: word in role.split()
+    in_substring = lambda word, role: word in role
+
+    # jd word is a substring of the resume role, and that word belongs to the jd role
+    forward = word_matrix(resume_role_ids, jd_words, in_substring) @ word_matrix(jd_role_ids, jd_words, in_split).T
+    # resume role word is a substring of the jd role
+    backward = word_matrix(resume_role_ids, resume_words, in_split) @ word_matrix(jd_role_ids, resume_words, in_substring).T
+    role_pairs = ((forward + backward) > 0).astype(np.int32)
+
+    # A resume role counts once if it partially matches any role of the JD
+    role_hits = ((role_pairs @ jd_matrix.T) > 0).astype(np.int32)
+    partial = (resume_matrix @ role_hits).toarray()
+
+    jd_has_roles = np.array([len(terms) > 0 for terms in jd_sets])[np.newaxis, :]
+    resume_has_roles = np.array([len(terms) > 0 for terms in resume_sets])[:, np.newaxis]
+    return np.select(
+        [~jd_has_roles, exact > 0, partial > 0, resume_has_roles],
+        [50, 100, np.minimum(80, partial * 30), 30],
+        default=0
+    ).astype(np.float64)
+
+def experience_scores(resume_experience, jd_experience, resume_education, jd_education):
+    """Vectorized ScoringEngine.calculate_experience_score."""
+    r_exp = np.asarray(resume_experience, dtype=np.float64)[:, np.newaxis]
+    j_exp = np.asarray(jd_experience, dtype=np.float64)[np.newaxis, :]
+    r_edu = np.asarray(resume_education, dtype=np.float64)[:, np.newaxis]
+    j_edu = np.asarray(jd_education, dtype=np.float64)[np.newaxis, :]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        experience = np.where(
+            j_exp > 0,
+            np.select(
+                [r_exp >= j_exp, r_exp >= j_exp * 0.7, r_exp >= j_exp * 0.5],
+                [100.0, 80.0, 60.0],
+                default=np.maximum(20, (r_exp / j_exp) * 40)
+            ),
+            np.where(r_exp > 0, 70.0, 50.0)
+        )
+        education = np.where(
+            j_edu > 0,
+            np.select(
+                [r_edu >= j_edu, r_edu >= j_edu - 1],
+                [100.0, 70.0],
+                default=np.maximum(30, (r_edu / j_edu) * 50)
+            ),
+            np.where(r_edu > 0, 70.0, 50.0)
+        )
+
+    return (experience + education) / 2
+
+def _vector_matrix(vectors):
+    """Stack semantic vectors into a float64 matrix; missing vectors become zero rows."""
+    dims = max((len(vector) for vector in vectors if vector), default=0)
+    matrix = np.zeros((len(vectors), dims))
+    for row, vector in enumerate(vectors):
+        if vector and len(vector) == dims:
+            matrix[row] = vector
+    return matrix
+
+def semantic_scores(resume_vectors, jd_vectors):
+    """Vectorized ScoringEngine.calculate_semantic_score: one matrix product for all pairs."""
+    resume_matrix = _vector_matrix(resume_vectors)
+    jd_matrix = _vector_matrix(jd_vectors)
+    if resume_matrix.shape[1] != jd_matrix.shape[1]:
+        return np.zeros((len(resume_vectors), len(jd_vectors)))
+    return np.clip((resume_matrix @ jd_matrix.T) * 100, 0, 100)
+
+def component_scores(resume_analyses, jd_analyses, semantic=None):
+    """Return unrounded ``len(resume_analyses) x len(jd_analyses)`` arrays per scoring component.
+
+    Keys are the ScoringEngine weight names: skills, role, experience, keywords and semantic.
+    When any analysis is a CompactAnalysis, all are scored in interned form.
+    ``semantic`` is an already computed array of semantic scores (e.g. from
+    a SemanticIndex), used instead of the analyses' vectors.
+    """
+    if any(isinstance(analysis, CompactAnalysis) for analyses in (resume_analyses, jd_analyses)
+           for analysis in analyses):
+        return _compact_component_scores([CompactAnalysis.from_dict(a) for a in resume_analyses],
+                                         [CompactAnalysis.from_dict(a) for a in jd_analyses], semantic=semantic)
+
+    def column(analyses, key):
+        return [analysis[key] for analysis in analyses]
+
+    def vectors(analyses):
+        return [analysis.get('semantic_vector') for analysis in analyses]
+
+    return {
+        'skills': skill_scores(column(resume_analyses, 'skills'), column(jd_analyses, 'skills')),
+        'role': role_scores(column(resume_analyses, 'job_roles'), column(jd_analyses, 'job_roles')),
+        'experience': experience_scores(
+            column(resume_analyses, 'experience_years'), column(jd_analyses, 'experience_years'),
+            column(resume_analyses, 'education_level'), column(jd_analyses, 'education_level')
+        ),
+        'keywords': keyword_scores(column(resume_analyses, 'keywords'), column(jd_analyses, 'keywords')),
+        'semantic': semantic if semantic is not None else semantic_scores(vectors(resume_analyses), vectors(jd_analyses))
+    }
+
+def _compact_component_scores(resumes, jds, semantic=None):
+    """component_scores of CompactAnalysis lists; skill and keyword sets are already lowercased ids."""
+    def roles(analyses):
+        # Partial role matching compares substrings, so roles are decoded
+        return [vocabulary.terms(analysis.role_set) for analysis in analyses]
+
+    def attribute(analyses, name):
+        return [getattr(analysis, name) for analysis in analyses]
+
+    return {
+        'skills': _skill_set_scores(attribute(resumes, 'skill_set'), attribute(jds, 'skill_set')),
+        'role': role_scores(roles(resumes), roles(jds)),
+        'experience': experience_scores(
+            attribute(resumes, 'experience_years'), attribute(jds, 'experience_years'),
+            attribute(resumes, 'education_level'), attribute(jds, 'education_level')
+        ),
+        'keywords': _keyword_set_scores(attribute(resumes, 'keyword_top'), attribute(jds, 'keyword_top')),
+        'semantic': semantic if semantic is not None else semantic_scores(
+            [analysis.vector() for analysis in resumes], [analysis.vector() for analysis in jds]
+        )
+    }
+
+def weighted_overall(components, weights):
+    """Combine component score arrays with a weights profile (unrounded).
+
+    Components are added in the same order as calculate_job_fit_score so the
+    rounded results match it exactly.
+    """
+    return (
+        components['skills'] * weights['skills'] +
+        components['role'] * weights['role'] +
+        components['experience'] * weights['experience'] +
+        components['keywords'] * weights['keywords'] +
+        components['semantic'] * weights['semantic']
+    )
+
+def score_matrix(resume_analyses, jd_analyses, weights, semantic=None):
+    """Score every resume against every job description at once.
+
+    Returns a dict of ``len(resume_analyses) x len(jd_analyses)`` integer
+    arrays with the same values as the rounded scores produced by
+    ScoringEngine.calculate_job_fit_score for each pair. ``semantic`` is
+    passed on to component_scores.
+    """
+    components = component_scores(resume_analyses, jd_analyses, semantic=semantic)
+    overall = weighted_overall(components, weights)
+
+    # np.rint rounds half to even, like the built-in round() used by the scalar path
+    return {
+        'overall_score': np.rint(overall).astype(np.int64),
+        'skill_score': np.rint(components['skills']).astype(np.int64),
+        'role_score': np.rint(components['role']).astype(np.int64),
+        'experience_score': np.rint(components['experience']).astype(np.int64),
+        'keyword_score': np.rint(components['keywords']).astype(np.int64),
+        'semantic_score': np.rint(components['semantic']).astype(np.int64)
+    }
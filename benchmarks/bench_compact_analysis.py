@@ -0,0 +1,99 @@
+"""Compare memory and scoring speed of dict analyses and CompactAnalysis objects.
+
+Usage:
+    python benchmarks/bench_compact_analysis.py [--analyses 100000] [--jds 20] [--dims 0]
+
+Random analyses are generated as in verify_batch_scoring.py, held once as
+dicts and once as CompactAnalysis objects, and scored against the same job
+descriptions both ways. Scores must be identical.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from compact_analysis import CompactAnalysis
+from scoring_engine import ScoringEngine
+from verify_batch_scoring import random_analysis
+
+
+def measure(build):
+    """Return (result, bytes allocated and still held) of ``build()``."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--analyses', type=int, default=100000)
+    parser.add_argument('--jds', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--dims', type=int, default=0, help='Semantic vector dimensions (0: none)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    def build_dicts():
+        analyses = []
+        for _ in range(args.analyses):
+            analysis = random_analysis(rng)
+            # Fresh strings per analysis, like analyses decoded from JSON
+            for key in ('skills', 'job_roles', 'keywords'):
+                analysis[key] = [''.join(term) for term in analysis[key]]
+            vector = [round(rng.gauss(0, 0.1), 4) for _ in range(args.dims)]
+            analysis['semantic_vector'] = vector or None
+            analyses.append(analysis)
+        return analyses
+
+    dicts, dict_bytes = measure(build_dicts)
+    compact, compact_bytes = measure(lambda: [CompactAnalysis.from_dict(analysis) for analysis in dicts])
+    print(f"{args.analyses} analyses: dicts {dict_bytes / 2**20:.1f} MiB, "
+          f"compact {compact_bytes / 2**20:.1f} MiB ({dict_bytes / max(compact_bytes, 1):.1f}x smaller)")
+
+    jds = [random_analysis(rng) for _ in range(args.jds)]
+    compact_jds = [CompactAnalysis.from_dict(jd) for jd in jds]
+    engine = ScoringEngine()
+    sample = min(len(dicts), 5000)
+
+    timings = {}
+    scores = {}
+    for name, resumes, jd_list in (('dict', dicts, jds), ('compact', compact, compact_jds)):
+        start = time.perf_counter()
+        scores[name] = [engine.calculate_job_fit_score(resume, jd) for resume in resumes[:sample] for jd in jd_list]
+        timings[name] = time.perf_counter() - start
+        start = time.perf_counter()
+        scores[f"{name} matrix"] = engine.score_matrix(resumes, jd_list)
+        timings[f"{name} matrix"] = time.perf_counter() - start
+
+    pairs = sample * args.jds
+    for name in ('dict', 'compact'):
+        print(f"{name}: scalar {pairs / timings[name]:,.0f} pairs/s, "
+              f"matrix {args.analyses * args.jds / timings[f'{name} matrix']:,.0f} pairs/s")
+
+    mismatches = 0
+    for expected, actual in zip(scores['dict'], scores['compact']):
+        for key, value in expected.items():
+            other = actual[key]
+            if isinstance(value, list):
+                value, other = sorted(value), sorted(other)
+            if value != other:
+                mismatches += 1
+    for key, values in scores['dict matrix'].items():
+        mismatches += int((values != scores['compact matrix'][key]).sum())
+    if mismatches:
+        print(f"FAILED: {mismatches} mismatching scores")
+        sys.exit(1)
+    print("OK: compact scores identical to dict scores")
+
+
+if __name__ == '__main__':
+    main()
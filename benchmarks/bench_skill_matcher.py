@@ -0,0 +1,101 @@
+"""Microbenchmark: compiled skill PhraseMatcher vs. the old substring loop.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py [--words 1500] [--repeat 5]
+
+Times skill lookup on a synthetic resume at 50, 5k and 50k taxonomy
+patterns. The matcher is built once (as in NLPProcessor.__init__) and its
+build time is reported separately from per-document lookup time.
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+import spacy
+from spacy.matcher import PhraseMatcher
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'skills.json')
+PATTERN_COUNTS = [50, 5000, 50000]
+
+
+def load_base_skills():
+    """Return the real taxonomy skills and aliases as a flat list."""
+    with open(SKILLS_PATH, encoding='utf-8') as f:
+        taxonomy = json.load(f)
+    skills = [skill for group in taxonomy['skills'].values() for skill in group]
+    return skills + list(taxonomy.get('aliases', {}))
+
+
+def build_patterns(count, base_skills):
+    """Pad the real taxonomy with synthetic skill names up to ``count`` patterns."""
+    patterns = list(base_skills[:count])
+    i = 0
+    while len(patterns) < count:
+        patterns.append(f"skill{i:05d}" if i % 3 else f"framework {i:05d}")
+        i += 1
+    return patterns
+
+
+def build_text(words, patterns, rng):
+    """Build a resume-like text with a sprinkling of known skills."""
+    filler = ['developed', 'services', 'team', 'built', 'scalable', 'systems', 'using',
+              'and', 'with', 'experience', 'in', 'the', 'data', 'platform', 'delivered']
+    tokens = []
+    for _ in range(words):
+        tokens.append(rng.choice(patterns) if rng.random() < 0.05 else rng.choice(filler))
+    return ' '.join(tokens)
+
+
+def legacy_lookup(text, patterns):
+    """The pre-matcher implementation: substring test per skill."""
+    text_lower = text.lower()
+    return {skill for skill in patterns if skill in text_lower}
+
+
+def timed(func, repeat):
+    """Return the best wall-clock time of ``repeat`` runs in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=1500, help='words per synthetic resume')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is kept)')
+    parser.add_argument('--seed', type=int, default=13)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    nlp = spacy.blank('en')
+    base_skills = load_base_skills()
+
+    print(f"{'patterns':>9} {'build ms':>10} {'legacy ms':>10} {'matcher ms':>11} {'tokenize ms':>12} {'speedup':>8}")
+    for count in PATTERN_COUNTS:
+        patterns = build_patterns(count, base_skills)
+        text = build_text(args.words, patterns, rng)
+
+        start = time.perf_counter()
+        matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+        for skill in patterns:
+            matcher.add(skill, [nlp.make_doc(skill)])
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # In the processor the Doc is shared with other extractors, so the
+        # tokenization cost is reported separately from the matcher pass.
+        doc = nlp.make_doc(text)
+        tokenize_ms = timed(lambda: nlp.make_doc(text), args.repeat)
+        legacy_ms = timed(lambda: legacy_lookup(text, patterns), args.repeat)
+        matcher_ms = timed(lambda: matcher(doc), args.repeat)
+
+        print(f"{count:>9} {build_ms:>10.1f} {legacy_ms:>10.2f} {matcher_ms:>11.2f} {tokenize_ms:>12.2f} "
+              f"{legacy_ms / matcher_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
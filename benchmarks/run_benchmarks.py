@@ -0,0 +1,188 @@
+"""Reproducible benchmark suite for the analysis pipeline.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--output results.json]
+        [--baseline benchmarks/baseline.json] [--max-regression 0.25]
+        [--sizes 300,1500,6000] [--repeat 20] [--quick]
+        [--sentences parser|senter|sentencizer]
+
+Synthetic resumes and job descriptions of controlled size (and PDFs built
+with reportlab) are pushed through PDF extraction, each NLPProcessor
+extractor, analyze_text end to end, and the scoring engine at single and
+batch scale. Results are written as JSON. With --baseline, every benchmark's
+median latency is compared with the stored run and the process exits with
+status 1 when one is slower by more than --max-regression (a fraction).
+The spaCy pipeline used and the peak RSS of the run are recorded too.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic import corpus, generate_job_description, generate_resume, text_to_pdf
+
+
+def measure(func, repeat, items=1):
+    """Run ``func`` ``repeat`` times; return latency stats and throughput.
+
+    ``items`` is the number of documents (or pairs) handled per call.
+    """
+    func()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    median = statistics.median(samples)
+    return {
+        'repeat': repeat,
+        'items_per_call': items,
+        'mean_ms': round(statistics.fmean(samples) * 1000, 4),
+        'p50_ms': round(median * 1000, 4),
+        'p95_ms': round(samples[min(len(samples) - 1, int(0.95 * len(samples)))] * 1000, 4),
+        'throughput_per_s': round(items / median, 2) if median > 0 else None
+    }
+
+
+def run_suite(sizes, repeat, batch_resumes, batch_jds, seed, sentences=None):
+    """Run every benchmark; return ({name: stats}, model load ms, pipe names)."""
+    from pdf_extractor import extract_text_from_pdf
+    from nlp_processor import NLPProcessor
+    from scoring_engine import ScoringEngine
+
+    results = {}
+    rng = random.Random(seed)
+
+    # Measured once and reported separately; too noisy for the regression check
+    start = time.perf_counter()
+    processor = NLPProcessor(sentences=sentences)
+    load_ms = round((time.perf_counter() - start) * 1000, 4)
+    engine = ScoringEngine()
+
+    for words in sizes:
+        resume = generate_resume(rng, words)
+        jd = generate_job_description(rng, max(100, words // 4))
+        pdf = text_to_pdf(resume)
+        doc = processor.parse(resume)
+
+        results[f'pdf.extract.{words}w'] = measure(lambda: extract_text_from_pdf(pdf), repeat)
+        results[f'nlp.parse.{words}w'] = measure(lambda: processor.parse(resume), repeat)
+        results[f'nlp.extract_skills.{words}w'] = measure(lambda: processor.extract_skills(resume, doc=doc), repeat)
+        results[f'nlp.extract_experience_years.{words}w'] = measure(lambda: processor.extract_experience_years(resume), repeat)
+        results[f'nlp.extract_education_level.{words}w'] = measure(lambda: processor.extract_education_level(resume), repeat)
+        results[f'nlp.extract_job_roles.{words}w'] = measure(lambda: processor.extract_job_roles(resume, doc=doc), repeat)
+        results[f'nlp.extract_keywords.{words}w'] = measure(lambda: processor.extract_keywords(resume, doc=doc), repeat)
+        results[f'nlp.analyze_text.{words}w'] = measure(lambda: processor.analyze_text(resume, text_type='resume'), repeat)
+
+        resume_analysis = processor.analyze_text(resume, text_type='resume')
+        jd_analysis = processor.analyze_text(jd, text_type='job_description')
+        results[f'scoring.job_fit.{words}w'] = measure(
+            lambda: engine.calculate_job_fit_score(resume_analysis, jd_analysis), repeat * 10
+        )
+
+    # Batch scale: analyses of a synthetic pool scored against several JDs
+    words = sizes[len(sizes) // 2]
+    resumes = corpus(seed, batch_resumes, words, kind='resume')
+    jds = corpus(seed + 1, batch_jds, max(100, words // 4), kind='job_description')
+    batch_repeat = max(3, repeat // 5)
+    results[f'nlp.analyze_texts.batch{batch_resumes}'] = measure(
+        lambda: list(processor.analyze_texts(resumes, text_type='resume')), batch_repeat, items=batch_resumes
+    )
+    resume_analyses = list(processor.analyze_texts(resumes, text_type='resume'))
+    jd_analyses = [processor.analyze_text(jd, text_type='job_description') for jd in jds]
+    pairs = batch_resumes * batch_jds
+    results[f'scoring.job_fit.loop{pairs}pairs'] = measure(
+        lambda: [engine.calculate_job_fit_score(r, j) for r in resume_analyses for j in jd_analyses],
+        batch_repeat, items=pairs
+    )
+    results[f'scoring.score_matrix.{pairs}pairs'] = measure(
+        lambda: engine.score_matrix(resume_analyses, jd_analyses), batch_repeat, items=pairs
+    )
+    results[f'scoring.rank_resumes.batch{batch_resumes}'] = measure(
+        lambda: engine.rank_resumes(enumerate(resume_analyses), jd_analyses[0]), batch_repeat, items=batch_resumes
+    )
+    return results, load_ms, processor.nlp.pipe_names
+
+
+def compare(results, baseline, max_regression):
+    """Return a list of (name, baseline_ms, current_ms, change) regressions."""
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or not previous.get('p50_ms'):
+            continue
+        change = stats['p50_ms'] / previous['p50_ms'] - 1
+        if change > max_regression:
+            regressions.append((name, previous['p50_ms'], stats['p50_ms'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default='bench_results.json', help='where to write the JSON results')
+    parser.add_argument('--baseline', help='previous results JSON to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help='allowed p50 slowdown as a fraction of the baseline (default 0.25)')
+    parser.add_argument('--sizes', default='300,1500,6000', help='resume sizes in words')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per benchmark')
+    parser.add_argument('--batch-resumes', type=int, default=200)
+    parser.add_argument('--batch-jds', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--sentences', choices=['parser', 'senter', 'sentencizer'],
+                        help='sentence segmenter (default: SPACY_SENTENCES or parser)')
+    parser.add_argument('--quick', action='store_true', help='small sizes and few repeats, for smoke runs')
+    args = parser.parse_args()
+
+    # Keep per-call debug logging out of the timings
+    import logging
+    logging.disable(logging.INFO)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    if args.quick:
+        sizes, args.repeat, args.batch_resumes, args.batch_jds = sizes[:2], 5, 40, 4
+
+    results, load_ms, pipeline = run_suite(sizes, args.repeat, args.batch_resumes, args.batch_jds, args.seed,
+                                           sentences=args.sentences)
+    from metrics import peak_rss_bytes
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'config': {'sizes': sizes, 'repeat': args.repeat, 'batch_resumes': args.batch_resumes,
+                   'batch_jds': args.batch_jds, 'seed': args.seed},
+        'nlp_processor_load_ms': load_ms,
+        'nlp_pipeline': pipeline,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}} {'p50 ms':>10} {'p95 ms':>10} {'per s':>12}")
+    for name, stats in results.items():
+        print(f"{name:<{width}} {stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} "
+              f"{stats['throughput_per_s'] or 0:>12,.1f}")
+    print(f"NLPProcessor load: {load_ms:.1f} ms ({', '.join(pipeline)}), "
+          f"peak RSS {report['peak_rss_bytes'] / 2**20:.0f} MiB. Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before:.3f} ms -> {after:.3f} ms (+{change:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.max_regression:.0%} against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Deterministic synthetic resumes, job descriptions and PDFs for benchmarks."""
+import io
+import json
+import os
+import random
+import textwrap
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'skills.json')
+
+ROLES = ['Software Engineer', 'Senior Software Engineer', 'Data Scientist', 'Data Analyst',
+         'Backend Developer', 'Frontend Developer', 'Full Stack Developer', 'Product Manager',
+         'Project Manager', 'Machine Learning Engineer', 'UX Designer', 'Engineering Manager']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Enterprises']
+DEGREES = ['Bachelor of Science in Computer Science', 'Master of Science in Data Science',
+           'MBA', 'PhD in Machine Learning', 'Bachelor of Engineering']
+VERBS = ['Built', 'Designed', 'Led', 'Maintained', 'Migrated', 'Optimized', 'Automated', 'Delivered']
+OBJECTS = ['a microservices platform', 'data pipelines', 'REST APIs', 'the reporting stack',
+           'CI/CD pipelines', 'customer-facing dashboards', 'a recommendation engine', 'internal tooling']
+RESULTS = ['reducing latency by 40%', 'serving 2M daily users', 'cutting costs by 30%',
+           'improving test coverage to 90%', 'with a team of five engineers', 'ahead of schedule']
+
+
+@lru_cache(maxsize=1)
+def load_skills():
+    """Return every skill in the taxonomy as a flat tuple."""
+    with open(SKILLS_PATH, encoding='utf-8') as f:
+        taxonomy = json.load(f)
+    return tuple(skill for group in taxonomy['skills'].values() for skill in group)
+
+
+def _bullet(rng, skills):
+    return (f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} and "
+            f"{rng.choice(skills)}, {rng.choice(RESULTS)}.")
+
+
+def generate_resume(rng, words):
+    """Generate a resume of roughly ``words`` words."""
+    skills = load_skills()
+    lines = [
+        'Jordan Example',
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)}+ years of experience",
+        '',
+        'Skills: ' + ', '.join(rng.sample(skills, min(len(skills), rng.randint(8, 20)))),
+        '',
+        'Experience'
+    ]
+    while sum(len(line.split()) for line in lines) < words:
+        start = rng.randint(2005, 2022)
+        lines.append(f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})")
+        lines.extend(f"- {_bullet(rng, skills)}" for _ in range(rng.randint(3, 6)))
+    lines.extend(['', 'Education', rng.choice(DEGREES) + ', State University'])
+    return '\n'.join(lines)
+
+
+def generate_job_description(rng, words):
+    """Generate a job description of roughly ``words`` words."""
+    skills = load_skills()
+    role = rng.choice(ROLES)
+    lines = [
+        f"We are hiring a {role} to join our team.",
+        '',
+        'Requirements:',
+        f"- {rng.randint(2, 8)}+ years of experience as a {role.lower()}",
+        f"- {rng.choice(DEGREES)} or equivalent"
+    ]
+    while sum(len(line.split()) for line in lines) < words:
+        lines.append(f"- Strong knowledge of {rng.choice(skills)} and {rng.choice(skills)}")
+        lines.append(f"- Experience with {rng.choice(OBJECTS)} {rng.choice(RESULTS)}")
+    return '\n'.join(lines)
+
+
+def text_to_pdf(text):
+    """Render plain text into PDF bytes with reportlab."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    margin = 54
+    y = height - margin
+    for paragraph in text.split('\n'):
+        for line in textwrap.wrap(paragraph, 95) or ['']:
+            if y < margin:
+                pdf.showPage()
+                y = height - margin
+            pdf.setFont('Helvetica', 9)
+            pdf.drawString(margin, y, line)
+            y -= 12
+    pdf.save()
+    return buffer.getvalue()
+
+
+def corpus(seed, count, words, kind='resume'):
+    """Return ``count`` deterministic documents of the given kind."""
+    rng = random.Random(seed)
+    generate = generate_resume if kind == 'resume' else generate_job_description
+    return [generate(rng, words) for _ in range(count)]
@@ -0,0 +1,90 @@
+"""Check ScoringEngine.score_matrix against the scalar scoring path and time both.
+
+Usage:
+    python benchmarks/verify_batch_scoring.py [--resumes 2000] [--jds 20]
+        [--weights '{"skills": 0.4, "keywords": 0.2, "semantic": 0.2}']
+
+Random analyses are generated from the skill taxonomy and a pool of role
+titles; every (resume, JD) pair must score identically in both paths.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scoring_engine import ScoringEngine
+
+SKILLS = ['python', 'java', 'javascript', 'go', 'r', 'sql', 'aws', 'docker', 'kubernetes', 'react',
+          'django', 'flask', 'pandas', 'numpy', 'git', 'jira', 'terraform', 'azure', 'gcp', 'scala']
+ROLES = ['software engineer', 'senior software engineer', ' developer', 'data scientist',
+         'lead data scientist', 'product manager', 'data analyst', 'business analyst', 'ux designer',
+         'backend engineer', 'frontend developer', 'engineering manager', 'architect', 'acme developers inc']
+KEYWORDS = SKILLS + ['experience', 'team', 'design', 'cloud', 'services', 'api', 'testing', 'agile',
+                     'microservices', 'data', 'pipeline', 'analytics', 'leadership', 'mentoring']
+
+
+def random_vector(rng, dims=16):
+    """Return a normalized semantic vector rounded like NLPProcessor.analyze_doc, or None."""
+    if rng.random() < 0.1:
+        return None  # analyzed without a semantic projection
+    vector = [rng.gauss(0.3, 1) for _ in range(dims)]
+    norm = sum(x * x for x in vector) ** 0.5
+    return [round(x / norm, 4) for x in vector]
+
+
+def random_analysis(rng):
+    """Build an analyze_text-shaped dict with random content."""
+    return {
+        'skills': rng.sample(SKILLS, rng.randint(0, 10)),
+        'job_roles': rng.sample(ROLES, rng.randint(0, 4)),
+        'keywords': rng.sample(KEYWORDS, rng.randint(0, 30)),
+        'experience_years': rng.choice([0, 0, 1, 2, 3, 5, 7, 10]),
+        'education_level': rng.randint(0, 4),
+        'semantic_vector': random_vector(rng)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=2000)
+    parser.add_argument('--jds', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--weights', type=json.loads, help='JSON weights profile (default: ScoringEngine defaults)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resumes = [random_analysis(rng) for _ in range(args.resumes)]
+    jds = [random_analysis(rng) for _ in range(args.jds)]
+    engine = ScoringEngine(weights=args.weights)
+
+    start = time.perf_counter()
+    matrix = engine.score_matrix(resumes, jds)
+    vector_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mismatches = 0
+    for i, resume in enumerate(resumes):
+        for j, jd in enumerate(jds):
+            scalar = engine.calculate_job_fit_score(resume, jd)
+            for key, values in matrix.items():
+                if values[i, j] != scalar[key]:
+                    mismatches += 1
+                    if mismatches <= 10:
+                        print(f"mismatch {key} resume={i} jd={j}: matrix={values[i, j]} scalar={scalar[key]}")
+    scalar_s = time.perf_counter() - start
+
+    pairs = args.resumes * args.jds
+    print(f"{pairs} pairs: matrix {vector_s:.3f}s ({pairs / vector_s:,.0f} pairs/s), "
+          f"scalar {scalar_s:.3f}s ({pairs / scalar_s:,.0f} pairs/s)")
+    if mismatches:
+        print(f"FAILED: {mismatches} mismatching scores")
+        sys.exit(1)
+    print("OK: matrix scores identical to scalar path")
+
+
+if __name__ == '__main__':
+    main()
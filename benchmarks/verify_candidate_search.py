@@ -0,0 +1,58 @@
+"""Check that candidate search finds skills and roles however the analysis spaced them.
+
+Usage:
+    python benchmarks/verify_candidate_search.py
+
+Roles extracted before role spans were normalized can carry leading or
+embedded whitespace (``'\\ndata analyst'``, ``' engineer'``). Such analyses
+are indexed next to clean ones, and every query below must return exactly
+the expected candidates.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from candidate_index import CandidateIndex
+
+ANALYSES = {
+    'spaced': {'skills': ['python', 'sql'], 'job_roles': ['\ndata analyst', ' engineer', 'senior software  engineer'],
+               'experience_years': 6, 'education_level': 3},
+    'clean': {'skills': ['java'], 'job_roles': ['engineer', 'product manager'],
+              'experience_years': 2, 'education_level': 2},
+    'other': {'skills': ['excel'], 'job_roles': ['Business Analyst'], 'experience_years': 4, 'education_level': 1},
+}
+
+QUERIES = [
+    ('role:engineer', ['spaced', 'clean']),
+    ('engineer', ['spaced', 'clean']),
+    ('role: Engineer', ['spaced', 'clean']),
+    ('role:"data analyst"', ['spaced']),
+    ('role:"senior   software engineer"', ['spaced']),
+    ('role:"business analyst"', ['other']),
+    ('role:engineer AND python', ['spaced']),
+    ('role:manager', []),
+    ('NOT role:engineer', ['other']),
+]
+
+
+def main():
+    index = CandidateIndex()
+    for candidate_id, analysis in ANALYSES.items():
+        index.add(candidate_id, analysis, label=f"{candidate_id}.pdf")
+
+    failures = 0
+    for query, expected in QUERIES:
+        total, results = index.search(query, limit=None)
+        actual = sorted(result['candidate_id'] for result in results)
+        if actual != sorted(expected) or total != len(expected):
+            failures += 1
+            print(f"mismatch {query!r}: expected {sorted(expected)} got {actual} (total {total})")
+    if failures:
+        print(f"FAILED: {failures} of {len(QUERIES)} queries")
+        sys.exit(1)
+    print(f"OK: {len(QUERIES)} queries")
+
+
+if __name__ == '__main__':
+    main()
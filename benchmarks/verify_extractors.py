@@ -0,0 +1,190 @@
+"""Check the precompiled regex extractors against the original implementations.
+
+Usage:
+    python benchmarks/verify_extractors.py [--documents 300] [--fuzz 20000] [--seed 3]
+
+The original experience, education, job role and text cleaning code is kept
+below verbatim. Every document of a regression corpus (synthetic resumes and
+job descriptions of several sizes, hand-written edge cases and random
+token soup) must produce identical output from NLPProcessor.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic import corpus
+
+LEGACY_EXPERIENCE_PATTERNS = [
+    r'(\d+)[\+\-\s]*(?:to|\-|–)?\s*(\d+)?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
+    r'(\d+)[\+\-\s]*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
+    r'(\d+)[\+\-\s]*(?:to|\-|–)?\s*(\d+)?\s*(?:years?|yrs?)'
+]
+
+EDGE_CASES = [
+    '', ' ', '5 years', '3-5 years of experience', '3 - 5 yrs exp', '10+ years experience',
+    '2 to 4 years', '1–2 years', '15yrs', 'Over 20 Years Of Experience', '007 years', '٣ years',
+    'PhD', 'Doctorate in physics', 'MBA', 'mastered', 'Bachelor of Arts', 'phdegree', 'mbachelor',
+    'University of Somewhere', 'college dropout', 'no formal degree',
+    'Senior Software Engineer', 'product manager', 'Project  Manager', 'data analyst', 'business analyst',
+    'UX designer', 'graphic designer', 'full-stack developer', 'Full Stack Developer', 'fullstack engineer',
+    'machine learning engineer', 'lead data scientist', 'staff architect', 'engineering director',
+    'Product Manager and Data Analyst', 'engineer\tdeveloper\nmanager',
+    'Software Engineer at Acme Developers Inc', 'Jane Developer, Engineering Manager at Globex',
+    'backend engineer', 'Frontend   Developer', 'principal web architect', 'ai scientist', 'AI/ML engineer'
+]
+
+FUZZ_TOKENS = ['1', '3', '10', '25', ' ', '  ', '\n', '-', '+', '–', 'to', 'year', 'years', 'yr', 'yrs',
+               'of', 'experience', 'exp', 'phd', 'master', 'mba', 'bachelor', 'degree', 'college',
+               'senior', 'data', 'software', 'engineer', 'analyst', 'manager', 'product', 'ux',
+               'designer', 'full', 'stack', 'Lead', 'Developer', 'Years', 'x', 'backend', 'machine learning',
+               'ai', 'staff', 'junior', 'web', 'director', 'doctorate', 'university']
+
+
+def legacy_clean_text(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip().lower()
+    return text
+
+
+def legacy_experience_years(text):
+    years = []
+    text_lower = text.lower()
+    for pattern in LEGACY_EXPERIENCE_PATTERNS:
+        matches = re.findall(pattern, text_lower, re.IGNORECASE)
+        for match in matches:
+            if isinstance(match, tuple):
+                for year in match:
+                    if year and year.isdigit():
+                        years.append(int(year))
+            else:
+                if match.isdigit():
+                    years.append(int(match))
+    return max(years) if years else 0
+
+
+def legacy_education_level(text):
+    text_lower = text.lower()
+    education_score = 0
+    if 'phd' in text_lower or 'doctorate' in text_lower:
+        education_score = 4
+    elif 'master' in text_lower or 'mba' in text_lower:
+        education_score = 3
+    elif 'bachelor' in text_lower:
+        education_score = 2
+    elif any(keyword in text_lower for keyword in ['degree', 'university', 'college']):
+        education_score = 1
+    return education_score
+
+
+def legacy_job_roles(text, doc):
+    roles = []
+    job_patterns = [
+        r'(?:senior|junior|lead|principal|staff)?\s*(?:software|web|data|machine learning|ai|backend|frontend|full[\-\s]?stack)?\s*(?:engineer|developer|analyst|scientist|architect|manager|director)',
+        r'(?:product|project|program)\s*manager',
+        r'(?:data|business|financial|marketing)\s*analyst',
+        r'(?:ui|ux|graphic)\s*designer'
+    ]
+    text_lower = text.lower()
+    for pattern in job_patterns:
+        matches = re.findall(pattern, text_lower)
+        roles.extend(matches)
+    for ent in doc.ents:
+        if ent.label_ in ['PERSON', 'ORG'] and any(keyword in ent.text.lower() for keyword in ['engineer', 'developer', 'manager', 'analyst']):
+            roles.append(ent.text.lower())
+    return list(set(roles))
+
+
+def regression_corpus(documents, fuzz, seed):
+    """Return the list of texts to compare."""
+    texts = list(EDGE_CASES)
+    for words in (150, 600, 3000):
+        texts += corpus(seed, documents // 6, words, kind='resume')
+        texts += corpus(seed + 1, documents // 6, max(100, words // 4), kind='job_description')
+    rng = random.Random(seed)
+    for _ in range(fuzz):
+        texts.append(''.join(rng.choice(FUZZ_TOKENS) + rng.choice(['', ' ', ' ', '\n']) for _ in range(rng.randint(1, 20))))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--documents', type=int, default=300)
+    parser.add_argument('--fuzz', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+    from nlp_processor import NLPProcessor
+    processor = NLPProcessor()
+
+    def unwrapped(name):
+        # Leave the per-call metrics timer out of the comparison
+        method = getattr(NLPProcessor, name)
+        return getattr(method, '__wrapped__', method).__get__(processor)
+
+    texts = regression_corpus(args.documents, args.fuzz, args.seed)
+    timed_documents = len(texts) - args.fuzz  # fuzz strings are checked but not timed
+    checks = [
+        ('clean_text', legacy_clean_text, unwrapped('clean_text')),
+        ('extract_experience_years', legacy_experience_years, unwrapped('extract_experience_years')),
+        ('extract_education_level', legacy_education_level, unwrapped('extract_education_level')),
+    ]
+    extract_job_roles = unwrapped('extract_job_roles')
+    mismatches = 0
+    timings = {name: [0.0, 0.0] for name, _, _ in checks}
+    timings['extract_job_roles'] = [0.0, 0.0]
+
+    def record(name, index, legacy_s, current_s):
+        if index < timed_documents:
+            timings[name][0] += legacy_s
+            timings[name][1] += current_s
+
+    for index, text in enumerate(texts):
+        # As in analyze_doc, the current extractors share one lowercased copy
+        start = time.perf_counter()
+        text_lower = text.lower()
+        lower_s = time.perf_counter() - start
+        for name, legacy, current in checks:
+            start = time.perf_counter()
+            expected = legacy(text)
+            middle = time.perf_counter()
+            actual = current(text, text_lower=text_lower)
+            record(name, index, middle - start, time.perf_counter() - middle + lower_s / 4)
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"mismatch {name} {text[:80]!r}: legacy={expected!r} current={actual!r}")
+
+        doc = processor.parse(text, extractors=['job_roles'])
+        start = time.perf_counter()
+        expected = legacy_job_roles(text, doc)
+        middle = time.perf_counter()
+        actual = extract_job_roles(text, doc=doc, text_lower=text_lower)
+        record('extract_job_roles', index, middle - start, time.perf_counter() - middle + lower_s / 4)
+        # Roles are now whitespace-normalized; otherwise the output must not change
+        expected = set(' '.join(role.split()) for role in expected)
+        if sorted(expected) != sorted(actual):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"mismatch extract_job_roles {text[:80]!r}: legacy={sorted(expected)} current={sorted(actual)}")
+
+    print(f"Time over {timed_documents} corpus documents (the shared lowercasing is split across the four):")
+    for name, (legacy_s, current_s) in timings.items():
+        print(f"  {name:<26} legacy {legacy_s * 1000:9.1f} ms  current {current_s * 1000:9.1f} ms")
+    total_legacy = sum(legacy_s for legacy_s, _ in timings.values())
+    total_current = sum(current_s for _, current_s in timings.values())
+    print(f"  {'total':<26} legacy {total_legacy * 1000:9.1f} ms  current {total_current * 1000:9.1f} ms")
+    if mismatches:
+        print(f"FAILED: {mismatches} mismatches over {len(texts)} documents")
+        sys.exit(1)
+    print(f"OK: identical output on {len(texts)} documents")
+
+
+if __name__ == '__main__':
+    main()
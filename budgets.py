@@ -0,0 +1,89 @@
+from metrics import metrics
+
+class AnalysisBudget:
+    """Resource limits for analyzing one resume.
+
+    ``max_pages`` and ``max_chars`` cap PDF extraction (0 = no limit);
+    longer documents are truncated, as extract_text_from_pdf always did.
+    ``max_tokens`` rejects texts with more spaCy tokens before the pipeline
+    runs. ``deadlines`` maps a stage (``extract``, ``nlp``) or ``total`` to
+    wall-clock seconds, and ``max_memory_bytes`` caps what an analysis
+    worker may allocate; both are enforced by AnalysisSandbox.
+    """
+
+    def __init__(self, max_pages=0, max_chars=0, max_tokens=0, deadlines=None, max_memory_bytes=0):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+        self.deadlines = {stage: seconds for stage, seconds in (deadlines or {}).items() if seconds}
+        self.max_memory_bytes = max_memory_bytes
+
+    def pdf_limits(self):
+        """Return the extraction caps as extract_text_from_pdf keyword arguments."""
+        return {'max_pages': self.max_pages, 'max_chars': self.max_chars}
+
+    def to_dict(self):
+        return {
+            'max_pages': self.max_pages,
+            'max_chars': self.max_chars,
+            'max_tokens': self.max_tokens,
+            'deadlines': dict(self.deadlines),
+            'max_memory_bytes': self.max_memory_bytes
+        }
+
+class AnalysisAborted(Exception):
+    """An analysis was stopped before it finished; ``to_dict`` is the JSON error body."""
+
+    code = 'analysis_aborted'
+
+    def __init__(self, stage, message):
+        self.stage = stage
+        super().__init__(message)
+
+    def __reduce__(self):
+        return (self.__class__, (self.stage, str(self)))
+
+    def to_dict(self):
+        return {'error': str(self), 'code': self.code, 'stage': self.stage}
+
+class BudgetExceeded(AnalysisAborted):
+    """An analysis went over one of its budgets.
+
+    ``limit`` names the budget (``max_tokens``, ``seconds``, ``total_seconds``
+    or ``max_memory_bytes``); ``observed`` is how far it got, when known.
+    """
+
+    code = 'budget_exceeded'
+
+    def __init__(self, stage, limit, allowed, observed=None):
+        self.limit = limit
+        self.allowed = allowed
+        self.observed = observed
+        detail = f" ({observed})" if observed is not None else ''
+        super().__init__(stage, f"Analysis exceeded its {limit} budget of {allowed} in the {stage} stage{detail}")
+
+    def __reduce__(self):
+        return (self.__class__, (self.stage, self.limit, self.allowed, self.observed))
+
+    def to_dict(self):
+        return dict(super().to_dict(), limit=self.limit, allowed=self.allowed, observed=self.observed)
+
+class WorkerCrashed(AnalysisAborted):
+    """The process running an analysis died (e.g. a crash in the PDF library)."""
+
+    code = 'worker_crashed'
+
+def record_breach(error):
+    """Count an aborted analysis in the metrics registry."""
+    if isinstance(error, BudgetExceeded):
+        metrics.inc('budget_breaches_total', help='Analyses stopped for exceeding a budget',
+                    stage=error.stage, limit=error.limit)
+    else:
+        metrics.inc('analysis_worker_crashes_total', help='Analysis worker processes that died mid-analysis',
+                    stage=error.stage)
+
+def record_truncation(extract_stats):
+    """Count extraction caps that truncated a document (see extract_text_from_pdf ``stats``)."""
+    for limit in ('max_pages', 'max_chars'):
+        if extract_stats.get(f"truncated_{limit[4:]}"):
+            metrics.inc('budget_truncations_total', help='Documents truncated by an extraction cap', limit=limit)
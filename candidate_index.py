@@ -0,0 +1,357 @@
+import re
+import threading
+from array import array
+import numpy as np
+from compact_analysis import CompactAnalysis, vocabulary
+
+# Values of NLPProcessor.extract_education_level
+EDUCATION_LEVELS = {
+    'degree': 1, 'college': 1, 'university': 1,
+    'bachelor': 2, 'bachelors': 2,
+    'master': 3, 'masters': 3, 'mba': 3,
+    'phd': 4, 'doctorate': 4
+}
+EXPERIENCE_FIELDS = ('experience', 'years', 'year', 'exp')
+EDUCATION_FIELDS = ('education', 'edu')
+TERM_FIELDS = ('skill', 'role')
+YEAR_WORDS = ('years', 'year', 'yrs', 'yr')
+
+TOKEN_PATTERN = re.compile(r'\s*(?:(?P<paren>[()])|(?P<op>>=|<=|[<>=])|"(?P<quoted>[^"]*)"|(?P<word>[^\s()"<>=]+))')
+
+def normalize_term(text):
+    """Lowercase a skill or role and collapse its whitespace, as both queries and the index store them."""
+    return ' '.join(text.split()).lower()
+
+class QueryError(ValueError):
+    """A candidate search query that cannot be parsed."""
+
+def tokenize(text):
+    """Split a query into ``(kind, value)`` tokens; kind is paren, op, quoted or word."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise QueryError(f"Unexpected character at position {position}: {text[position:position + 10]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+class QueryParser:
+    """Recursive descent parser for candidate search queries.
+
+    Grammar, loosest binding first::
+
+        query  := and ('OR' and)*
+        and    := not (['AND'] not)*          adjacent terms are ANDed
+        not    := 'NOT' not | atom
+        atom   := '(' query ')' | range | term
+        range  := [field] op value [years]    e.g. >=3 years, education >= master
+                | N+ years                    e.g. 5+ years
+        term   := [skill:|role:] word-or-"quoted phrase"
+
+    Operators are case-insensitive. A term without a field matches a skill
+    or a job role. The result is a tree of tuples: ``('and', a, b)``,
+    ``('or', a, b)``, ``('not', a)``, ``('term', field, text)`` and
+    ``('range', column, op, value)``.
+    """
+
+    def __init__(self, text, aliases=None):
+        self.tokens = tokenize(text)
+        self.position = 0
+        self.aliases = aliases or {}
+
+    def parse(self):
+        """Return the query tree; raises QueryError."""
+        if not self.tokens:
+            raise QueryError("Empty query")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QueryError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise QueryError("Unexpected end of query")
+        self.position += 1
+        return token
+
+    def is_keyword(self, token, keyword):
+        return token is not None and token[0] == 'word' and token[1].upper() == keyword
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.is_keyword(self.peek(), 'OR'):
+            self.next()
+            node = ('or', node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while True:
+            token = self.peek()
+            if self.is_keyword(token, 'AND'):
+                self.next()
+            elif token is None or token == ('paren', ')') or self.is_keyword(token, 'OR'):
+                return node
+            node = ('and', node, self.parse_not())
+
+    def parse_not(self):
+        if self.is_keyword(self.peek(), 'NOT'):
+            self.next()
+            return ('not', self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind, value = self.next()
+        if (kind, value) == ('paren', '('):
+            node = self.parse_or()
+            if self.next() != ('paren', ')'):
+                raise QueryError("Missing ')'")
+            return node
+        if kind == 'paren':
+            raise QueryError("Unexpected ')'")
+        if kind == 'op':
+            return self.parse_range(None, value)
+        if kind == 'word':
+            lowered = value.lower()
+            if lowered in ('and', 'or', 'not'):
+                raise QueryError(f"Unexpected {value!r}")
+            following = self.peek()
+            # experience >= 3, education >= master
+            if lowered in EXPERIENCE_FIELDS + EDUCATION_FIELDS and following and following[0] == 'op':
+                return self.parse_range(lowered, self.next()[1])
+            # 5+ years
+            if lowered.endswith('+') and lowered[:-1].isdigit() and following and \
+               following[0] == 'word' and following[1].lower() in YEAR_WORDS:
+                self.next()
+                return ('range', 'experience', '>=', int(lowered[:-1]))
+            field, sep, term = value.partition(':')
+            if sep and field.lower() in TERM_FIELDS:
+                if not term:
+                    kind, term = self.next()
+                    if kind not in ('word', 'quoted'):
+                        raise QueryError(f"Expected a term after '{field}:'")
+                return self.make_term(field.lower(), term)
+        return self.make_term(None, value)
+
+    def parse_range(self, field, op):
+        kind, value = self.next()
+        if kind != 'word':
+            raise QueryError(f"Expected a value after '{op}'")
+        value = value.lower()
+        if field in EDUCATION_FIELDS or (field is None and value in EDUCATION_LEVELS):
+            level = EDUCATION_LEVELS.get(value, int(value) if value.isdigit() else None)
+            if level is None:
+                raise QueryError(f"Unknown education level {value!r}")
+            return ('range', 'education', op, level)
+        if not value.isdigit():
+            raise QueryError(f"Expected a number of years after '{op}'")
+        if self.peek() and self.peek()[0] == 'word' and self.peek()[1].lower() in YEAR_WORDS:
+            self.next()
+        return ('range', 'experience', op, int(value))
+
+    def make_term(self, field, text):
+        text = normalize_term(text)
+        if not text:
+            raise QueryError("Empty search term")
+        if field != 'role':
+            text_alias = self.aliases.get(text)
+            if text_alias and field == 'skill':
+                text = text_alias
+            elif text_alias:
+                # Unfielded: the alias names a skill, the text itself may still be a role
+                return ('or', ('term', 'skill', text_alias), ('term', 'role', text))
+        return ('term', field, text)
+
+def parse_query(text, aliases=None):
+    """Parse a candidate search query (see QueryParser); ``aliases`` maps skill aliases to skills."""
+    return QueryParser(text, aliases=aliases).parse()
+
+class CandidateIndex:
+    """Boolean search over analyzed resumes without re-running NLP.
+
+    Every candidate gets a dense document number. Skills and job roles have
+    posting lists (``array('I')`` of document numbers, keyed by interned
+    term id, see compact_analysis.vocabulary); experience years and
+    education level are stored in document order. A query is evaluated as
+    boolean masks over all documents: postings set bits, ranges compare a
+    whole column at once, and AND/OR/NOT are element-wise. Adding a
+    candidate appends to the postings, so the index grows incrementally;
+    replaced and removed candidates are masked out until enough of them
+    pile up to compact the index.
+    """
+
+    def __init__(self):
+        """Create an empty index."""
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self, version=None):
+        self.version = version  # analysis version the candidates were indexed under
+        self.synced_at = None  # set by callers that pull candidates incrementally
+
+        self._keys = []  # document -> candidate id
+        self._labels = []  # document -> label (e.g. filename)
+        self._docs = {}  # candidate id -> document
+        self._skills = {}  # skill id -> documents
+        self._roles = {}  # role id -> documents
+        self._experience = array('H')
+        self._education = array('B')
+        self._live = bytearray()
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._docs
+
+    def clear(self, version=None):
+        """Drop every candidate and start over for analysis ``version``."""
+        with self._lock:
+            self._reset(version)
+
+    def add(self, candidate_id, analysis, label=None):
+        """Index (or re-index) a candidate's analysis (a dict or a CompactAnalysis)."""
+        analysis = CompactAnalysis.from_dict(analysis)
+        with self._lock:
+            self.remove(candidate_id)
+            doc = len(self._keys)
+            self._keys.append(candidate_id)
+            self._labels.append(label)
+            self._docs[candidate_id] = doc
+            # Analyses stored before roles were normalized may still carry stray whitespace
+            roles = {vocabulary.intern(normalize_term(role)) for role in vocabulary.terms(analysis.role_set)}
+            for postings, terms in ((self._skills, analysis.skill_set), (self._roles, roles)):
+                for term_id in terms:
+                    documents = postings.get(term_id)
+                    if documents is None:
+                        documents = postings[term_id] = array('I')
+                    documents.append(doc)
+            self._experience.append(min(int(analysis.experience_years or 0), 0xFFFF))
+            self._education.append(min(int(analysis.education_level or 0), 0xFF))
+            self._live.append(1)
+
+    def remove(self, candidate_id):
+        """Remove a candidate; returns False if it was not indexed."""
+        with self._lock:
+            doc = self._docs.pop(candidate_id, None)
+            if doc is None:
+                return False
+            self._live[doc] = 0
+            self._removed += 1
+            if self._removed > 1024 and self._removed > len(self._docs):
+                self._compact()
+            return True
+
+    def _compact(self):
+        """Renumber the live documents and drop removed ones from every posting list."""
+        live = np.frombuffer(bytes(self._live), dtype=np.uint8).astype(bool)
+        renumber = np.cumsum(live, dtype=np.int64) - 1
+
+        def compacted(documents):
+            documents = np.array(documents, dtype=np.uint32)
+            kept = array('I')
+            kept.frombytes(renumber[documents[live[documents]]].astype(np.uint32).tobytes())
+            return kept
+
+        for postings in (self._skills, self._roles):
+            for term_id in list(postings):
+                documents = compacted(postings[term_id])
+                if documents:
+                    postings[term_id] = documents
+                else:
+                    del postings[term_id]
+        keep = np.flatnonzero(live)
+        self._keys = [self._keys[doc] for doc in keep]
+        self._labels = [self._labels[doc] for doc in keep]
+        self._docs = {key: doc for doc, key in enumerate(self._keys)}
+        self._experience = array('H', np.array(self._experience, dtype=np.uint16)[keep].tobytes())
+        self._education = array('B', np.array(self._education, dtype=np.uint8)[keep].tobytes())
+        self._live = bytearray(b'\x01' * len(keep))
+        self._removed = 0
+
+    def _term_mask(self, field, text):
+        term_id = vocabulary.get(text)
+        mask = np.zeros(len(self._keys), dtype=bool)
+        if term_id is None:
+            return mask
+        for name, postings in (('skill', self._skills), ('role', self._roles)):
+            if field in (None, name) and term_id in postings:
+                mask[np.frombuffer(postings[term_id], dtype=np.uint32)] = True
+        return mask
+
+    def _range_mask(self, column, op, value):
+        values = np.frombuffer(self._experience if column == 'experience' else self._education,
+                               dtype=np.uint16 if column == 'experience' else np.uint8)
+        if op == '>=':
+            return values >= value
+        if op == '>':
+            return values > value
+        if op == '<=':
+            return values <= value
+        if op == '<':
+            return values < value
+        return values == value
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == 'and':
+            return self._evaluate(node[1]) & self._evaluate(node[2])
+        if kind == 'or':
+            return self._evaluate(node[1]) | self._evaluate(node[2])
+        if kind == 'not':
+            return ~self._evaluate(node[1])
+        if kind == 'term':
+            return self._term_mask(node[1], node[2])
+        return self._range_mask(node[1], node[2], node[3])
+
+    def search(self, query, limit=50, offset=0, aliases=None):
+        """Return ``(total, results)`` for a query string or parsed tree.
+
+        Results are the matching candidates with the most experience first
+        (ties in indexing order), sliced by ``offset`` and ``limit``; each is
+        ``{'candidate_id', 'label', 'experience_years', 'education_level'}``.
+        Raises QueryError for an invalid query.
+        """
+        tree = parse_query(query, aliases=aliases) if isinstance(query, str) else query
+        with self._lock:
+            if not self._keys:
+                return 0, []
+            matches = np.flatnonzero(self._evaluate(tree) & np.frombuffer(self._live, dtype=bool))
+            experience = np.frombuffer(self._experience, dtype=np.uint16)
+            education = np.frombuffer(self._education, dtype=np.uint8)
+            # Unique sort keys: most experience first, then document number
+            keys = ((0xFFFF - experience[matches].astype(np.int64)) << 32) | matches
+            stop = len(keys) if limit is None else min(len(keys), offset + limit)
+            if stop < len(keys):
+                # Only the requested page needs sorting
+                keys = keys[np.argpartition(keys, stop - 1)[:stop]] if stop else keys[:0]
+            page = np.sort(keys)[offset:stop] & 0xFFFFFFFF
+            results = [{
+                'candidate_id': self._keys[doc],
+                'label': self._labels[doc],
+                'experience_years': int(experience[doc]),
+                'education_level': int(education[doc])
+            } for doc in page]
+            return len(matches), results
+
+    def stats(self):
+        """Return index sizes."""
+        with self._lock:
+            return {
+                'candidates': len(self._docs),
+                'documents': len(self._keys),
+                'skills': len(self._skills),
+                'roles': len(self._roles),
+                'version': self.version,
+                'synced_at': self.synced_at
+            }
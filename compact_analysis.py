@@ -0,0 +1,180 @@
+import threading
+from array import array
+import numpy as np
+
+# Number of top keywords compared by ScoringEngine.calculate_keyword_overlap_score
+TOP_KEYWORDS = 20
+
+# Semantic vectors carry four decimals (see NLPProcessor.analyze_doc) and are
+# normalized, so they fit int16 fixed point; k / 10000 gives back the exact floats
+SEMANTIC_SCALE = 10000
+
+class Vocabulary:
+    """Process-wide mapping of skill, role and keyword strings to integer ids.
+
+    Ids are dense and never reused, so a term's id is stable for the life of
+    the process. Ids are not stable across processes; CompactAnalysis pickles
+    as a dict for that reason.
+    """
+
+    def __init__(self):
+        self._ids = {}  # term -> id
+        self._terms = []  # id -> term
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._terms)
+
+    def intern(self, term):
+        """Return the id of ``term``, assigning the next id to new terms."""
+        term_id = self._ids.get(term)
+        if term_id is None:
+            with self._lock:
+                term_id = self._ids.get(term)
+                if term_id is None:
+                    term_id = self._ids[term] = len(self._terms)
+                    self._terms.append(term)
+        return term_id
+
+    def get(self, term):
+        """Return the id of ``term``, or None if it was never interned."""
+        return self._ids.get(term)
+
+    def term(self, term_id):
+        """Return the string of an id."""
+        return self._terms[term_id]
+
+    def terms(self, term_ids):
+        """Return the strings of ``term_ids`` as a list."""
+        terms = self._terms
+        return [terms[i] for i in term_ids]
+
+    def sorted_ids(self, terms):
+        """Return the distinct ids of ``terms`` as a sorted ``array('I')``."""
+        return array('I', sorted(set(self.intern(term) for term in terms)))
+
+    def ordered_ids(self, terms):
+        """Return the ids of ``terms`` in order, duplicates kept, as an ``array('I')``."""
+        return array('I', [self.intern(term) for term in terms])
+
+vocabulary = Vocabulary()
+
+class CompactAnalysis:
+    """Memory-lean form of an ``NLPProcessor.analyze_text`` result.
+
+    Skills, job roles and keywords are interned in the shared ``vocabulary``
+    and stored as ``array('I')`` of ids. ``skill_set``, ``role_set`` and
+    ``keyword_top`` hold the sorted, distinct, lowercased ids that scoring
+    compares. When a term list is already lowercase (the NLP output always
+    is), these share one array with the list itself. The semantic vector is
+    stored as ``array('h')`` in units of 1/10000. ``to_dict`` gives back
+    the dict form for templates, JSON and storage. Read-only mapping access
+    (``analysis['skills']``) decodes fields on the fly for code written
+    against dicts.
+    """
+
+    __slots__ = ('skills', 'job_roles', 'keywords', 'skill_set', 'role_set', 'keyword_top',
+                 'experience_years', 'education_level', 'word_count', 'sentence_count', 'text_type',
+                 'semantic_vector', '_lookup')
+
+    FIELDS = ('skills', 'experience_years', 'education_level', 'job_roles', 'keywords',
+              'word_count', 'sentence_count', 'text_type', 'semantic_vector')
+
+    @classmethod
+    def from_dict(cls, analysis):
+        """Build a CompactAnalysis from an ``analyze_text`` dict (a CompactAnalysis is returned as is)."""
+        if isinstance(analysis, cls):
+            return analysis
+        self = cls.__new__(cls)
+        skills = analysis.get('skills') or []
+        roles = analysis.get('job_roles') or []
+        keywords = analysis.get('keywords') or []
+
+        self.skills = vocabulary.sorted_ids(skills)
+        self.skill_set = cls._lowered(self.skills, skills)
+        self.job_roles = vocabulary.sorted_ids(roles)
+        self.role_set = cls._lowered(self.job_roles, roles)
+        self.keywords = vocabulary.ordered_ids(keywords)
+        self.keyword_top = vocabulary.sorted_ids(keyword.lower() for keyword in keywords[:TOP_KEYWORDS])
+
+        self.experience_years = analysis.get('experience_years', 0)
+        self.education_level = analysis.get('education_level', 0)
+        self.word_count = analysis.get('word_count', 0)
+        self.sentence_count = analysis.get('sentence_count', 0)
+        self.text_type = analysis.get('text_type')
+        vector = analysis.get('semantic_vector')
+        self.semantic_vector = array('h', [round(x * SEMANTIC_SCALE) for x in vector]) if vector else None
+        self._lookup = None
+        return self
+
+    @staticmethod
+    def _lowered(ids, terms):
+        """Return the sorted distinct ids of the lowercased terms, reusing ``ids`` when nothing changes."""
+        if all(term == term.lower() for term in terms):
+            return ids
+        return vocabulary.sorted_ids(term.lower() for term in terms)
+
+    def lookup(self):
+        """Return what scoring compares against many resumes, built once.
+
+        That is frozensets of the skill_set, role_set and keyword_top ids,
+        the role_set strings and the vector array. Used on the job
+        description side.
+        """
+        if self._lookup is None:
+            self._lookup = (frozenset(self.skill_set), frozenset(self.role_set), frozenset(self.keyword_top),
+                            vocabulary.terms(self.role_set), self.vector_array())
+        return self._lookup
+
+    def vector_array(self):
+        """Return the semantic vector as a float64 NumPy array with the values of ``vector``, or None."""
+        if self.semantic_vector is None:
+            return None
+        return np.frombuffer(self.semantic_vector, dtype=np.int16) / SEMANTIC_SCALE
+
+    def vector(self):
+        """Return the semantic vector as a list (rounded like analyze_text), or None."""
+        if self.semantic_vector is None:
+            return None
+        return self.vector_array().tolist()
+
+    def to_dict(self):
+        """Return the analysis as a plain dict, as produced by ``analyze_text``."""
+        analysis = {
+            'skills': vocabulary.terms(self.skills),
+            'experience_years': self.experience_years,
+            'education_level': self.education_level,
+            'job_roles': vocabulary.terms(self.job_roles),
+            'keywords': vocabulary.terms(self.keywords),
+            'word_count': self.word_count,
+            'sentence_count': self.sentence_count
+        }
+        if self.text_type is not None:
+            analysis['text_type'] = self.text_type
+        if self.semantic_vector is not None:
+            analysis['semantic_vector'] = self.vector()
+        return analysis
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        if key in ('skills', 'job_roles', 'keywords'):
+            return vocabulary.terms(getattr(self, key))
+        if key == 'semantic_vector':
+            return self.vector()
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def __reduce__(self):
+        # Vocabulary ids are per process, so pickle (e.g. to pool workers) as a dict
+        return (CompactAnalysis.from_dict, (self.to_dict(),))
+
+    def __repr__(self):
+        return (f"CompactAnalysis({len(self.skills)} skills, {len(self.job_roles)} roles, "
+                f"{len(self.keywords)} keywords, {self.experience_years} years)")
@@ -0,0 +1,12 @@
+# Gunicorn settings; run with: gunicorn -c gunicorn.conf.py main:app
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WORKERS', 4))
+timeout = int(os.environ.get('WORKER_TIMEOUT', 120))
+
+# With PRELOAD_MODELS=1 the app (and spaCy model) is loaded once in the master
+# and shared copy-on-write by every forked worker. Otherwise each worker loads
+# the model lazily on its first analysis request. Either way each worker opens
+# its own sqlite connections on first use (see sqlite_db.py).
+preload_app = os.environ.get('PRELOAD_MODELS', '').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,129 @@
+import heapq
+import logging
+import threading
+from collections import defaultdict
+import numpy as np
+from compact_analysis import CompactAnalysis
+
+class JobCatalog:
+    """Pre-analyzed job descriptions with an inverted index for reverse matching.
+
+    Skills and top keywords of every job description are indexed
+    (term -> job ids), so a resume is only scored against jobs that share at
+    least one skill with it. Adding or removing a job updates the index in
+    place. With a SemanticIndex, the jobs semantically closest to the resume
+    are candidates too whenever the semantic component has weight.
+    Analyses are kept as CompactAnalysis objects and terms are indexed by
+    their interned ids.
+    """
+
+    def __init__(self, scoring_engine, semantic_index=None):
+        """Create an empty catalog scored with ``scoring_engine``."""
+        self.scoring_engine = scoring_engine
+        self.semantic_index = semantic_index
+        self._jobs = {}  # job id -> {'analysis': ..., 'metadata': ...}
+        self._skill_index = defaultdict(set)  # skill id -> job ids
+        self._keyword_index = defaultdict(set)  # keyword id -> job ids
+        self._lock = threading.RLock()
+        self.synced_seq = 0  # set by callers that replay a stored catalog
+
+    def add(self, job_id, jd_analysis, metadata=None):
+        """Add or replace a job description analysis (a dict or a CompactAnalysis)."""
+        jd_analysis = CompactAnalysis.from_dict(jd_analysis)
+        with self._lock:
+            if job_id in self._jobs:
+                self.remove(job_id)
+            self._jobs[job_id] = {'analysis': jd_analysis, 'metadata': metadata or {}}
+            for skill in jd_analysis.skill_set:
+                self._skill_index[skill].add(job_id)
+            # Same top-20 cut-off as ScoringEngine.calculate_keyword_overlap_score
+            for keyword in jd_analysis.keyword_top:
+                self._keyword_index[keyword].add(job_id)
+            vector = jd_analysis.vector()
+            if self.semantic_index is not None and vector:
+                try:
+                    self.semantic_index.add(job_id, vector)
+                except ValueError as e:
+                    logging.warning(f"Job {job_id} not added to the semantic index: {str(e)}")
+
+    def remove(self, job_id):
+        """Remove a job; returns False if it was not in the catalog."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            if self.semantic_index is not None:
+                self.semantic_index.remove(job_id)
+            for index, terms in ((self._skill_index, job['analysis'].skill_set),
+                                 (self._keyword_index, job['analysis'].keyword_top)):
+                for term in terms:
+                    postings = index.get(term)
+                    if postings is not None:
+                        postings.discard(job_id)
+                        if not postings:
+                            del index[term]
+            return True
+
+    def get(self, job_id):
+        """Return the stored record for ``job_id`` or None."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def candidates(self, resume_analysis, semantic_k=0):
+        """Return ids of jobs sharing at least one skill with the resume.
+
+        Resumes without any detected skill fall back to shared keywords.
+        ``semantic_k`` adds the jobs most similar to the resume's semantic
+        vector, found with one matrix-vector product over the index.
+        """
+        resume_analysis = CompactAnalysis.from_dict(resume_analysis)
+        with self._lock:
+            if resume_analysis.skill_set:
+                index, terms = self._skill_index, resume_analysis.skill_set
+            else:
+                index, terms = self._keyword_index, resume_analysis.keyword_top
+            job_ids = set()
+            for term in terms:
+                job_ids.update(index.get(term, ()))
+            if semantic_k and self.semantic_index is not None:
+                vector = resume_analysis.vector()
+                job_ids.update(job_id for job_id, _ in self.semantic_index.top(vector, semantic_k))
+            return job_ids
+
+    def match(self, resume_analysis, top_k=10):
+        """Return the ``top_k`` best fitting jobs for a resume, best first.
+
+        Each entry is a ``calculate_job_fit_score`` result plus ``job_id``
+        and the job's ``metadata``.
+        """
+        resume_analysis = CompactAnalysis.from_dict(resume_analysis)
+        # Skill-less but semantically close jobs can only win when semantics count
+        semantic_k = top_k if self.scoring_engine.weights['semantic'] > 0 else 0
+        with self._lock:
+            job_ids = list(self.candidates(resume_analysis, semantic_k=semantic_k))
+            jobs = [self._jobs[job_id] for job_id in job_ids]
+            semantic = None
+            if self.semantic_index is not None and jobs:
+                # Straight from the stored rows, one matrix-vector product
+                similarities = self.semantic_index.similarities_of(job_ids, resume_analysis.vector())
+                semantic = np.clip(similarities * 100, 0, 100)[np.newaxis, :]
+        if not jobs:
+            return []
+
+        # Rank every candidate with one vectorized pass, then build full
+        # score breakdowns only for the jobs that make the cut
+        overall = self.scoring_engine.score_matrix(
+            [resume_analysis], [job['analysis'] for job in jobs], semantic=semantic
+        )['overall_score'][0]
+        best = heapq.nlargest(top_k, range(len(jobs)), key=lambda i: overall[i])
+
+        matches = []
+        for i in best:
+            score_data = self.scoring_engine.calculate_job_fit_score(resume_analysis, jobs[i]['analysis'])
+            score_data['job_id'] = job_ids[i]
+            score_data['metadata'] = jobs[i]['metadata']
+            matches.append(score_data)
+        return matches
@@ -0,0 +1,240 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from pdf_extractor import extract_text_from_pdf
+from analysis_cache import AnalysisCache
+from analysis_store import AnalysisStore
+from metrics import peak_rss_bytes
+from budgets import AnalysisAborted, record_breach
+from sandbox import AnalysisSandbox, worker_nlp_processor
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job."""
+
+# Per-process state, populated by _init_worker in each sandbox worker
+_worker = {}
+
+def share_with_workers(nlp_processor, scoring_engine):
+    """Hand already loaded models to sandbox workers started by fork.
+
+    Forked workers inherit these objects copy-on-write instead of loading
+    their own copy of the spaCy model.
+    """
+    AnalysisSandbox.share(nlp_processor)
+    _worker['scoring_engine'] = scoring_engine
+
+def _init_worker(jd_cache_size, store_db):
+    """Set up the caches and store connection on a worker's first job."""
+    if 'scoring_engine' not in _worker:
+        from scoring_engine import ScoringEngine
+        _worker['scoring_engine'] = ScoringEngine()
+    _worker['jd_cache'] = AnalysisCache(maxsize=jd_cache_size)
+    # Each worker opens its own connection to the shared analysis store
+    _worker['analysis_store'] = AnalysisStore(store_db) if store_db else None
+    logging.info(f"Analysis worker {os.getpid()} ready")
+
+def run_analysis(stage, pdf_bytes, job_description, budget, jd_cache_size, store_db):
+    """Sandbox task: extract, analyze and score one resume under ``budget``.
+
+    Returns the results and this worker's pid and peak RSS, or None when
+    no text could be extracted.
+    """
+    if 'jd_cache' not in _worker:
+        _init_worker(jd_cache_size, store_db)
+    nlp_processor = worker_nlp_processor()
+    analysis_store = _worker['analysis_store']
+    pdf_limits = budget.pdf_limits()
+    entered = set()
+
+    def enter(name):
+        # The resume and the job description share one nlp stage deadline
+        if name not in entered:
+            entered.add(name)
+            stage(name)
+
+    def compute(pdf_bytes):
+        enter('extract')
+        # Pages are extracted serially here; the job itself already runs in a sandbox worker
+        resume_text = extract_text_from_pdf(pdf_bytes, **pdf_limits)
+        if not resume_text:
+            return None
+        enter('nlp')
+        return nlp_processor.analyze_text(resume_text, text_type='resume', max_tokens=budget.max_tokens)
+
+    if analysis_store is None:
+        resume_analysis = compute(pdf_bytes)
+    else:
+        version = AnalysisStore.make_version(nlp_processor.version, pdf_limits)
+        resume_analysis = analysis_store.get_or_compute(pdf_bytes, version, compute)
+    if resume_analysis is None:
+        return None
+
+    enter('nlp')
+    jd_analysis = _worker['jd_cache'].get_or_compute(
+        job_description, nlp_processor.version,
+        lambda text: nlp_processor.analyze_text(text, text_type='job_description', max_tokens=budget.max_tokens)
+    )
+    results = _worker['scoring_engine'].build_results(resume_analysis, jd_analysis)
+    if analysis_store is not None:
+        # Stored so the report can be exported later from its id
+        results['result_id'] = analysis_store.put_result(results)
+    return results, {'pid': os.getpid(), 'peak_rss_bytes': peak_rss_bytes()}
+
+def _process_alive(pid):
+    """Return False when no process ``pid`` exists on this host."""
+    if os.name != 'posix':
+        return True  # os.kill(pid, 0) would terminate it on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class JobQueue:
+    """Bounded submit/poll queue that runs analyses in killable sandbox workers.
+
+    Job records (status, result, error) are kept in the AnalysisStore, so
+    every app process sharing the database can answer a poll and records
+    survive a restart. Jobs themselves run in the process that queued them;
+    a job whose process went away before it finished is reported failed.
+    """
+
+    def __init__(self, budget, workers=2, max_pending=64, result_ttl=3600, jd_cache_size=64, store_db=None):
+        """Configure the queue; worker processes start on the first submit.
+
+        Each job runs in an AnalysisSandbox under ``budget`` (an
+        AnalysisBudget): its extraction caps, token budget, stage and total
+        deadlines and memory cap. ``store_db`` is the AnalysisStore database
+        shared with the app; without one, job records stay in this process.
+        """
+        self.budget = budget
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.jd_cache_size = jd_cache_size
+        self.store_db = store_db
+
+        self._records = AnalysisStore(store_db or ':memory:')
+        self._sandbox = AnalysisSandbox(budget, workers=workers)
+        # One thread per sandbox worker waits on its job's deadlines
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analysis-job')
+        self._futures = {}  # job id -> future, for this process's unfinished jobs
+        self._worker_rss = {}  # worker pid -> peak RSS bytes reported with its last job
+        self._lock = threading.Lock()
+
+    def _run(self, job_id, pdf_bytes, job_description):
+        """Run one job in the sandbox; returns the results and the worker's pid and peak RSS."""
+        self._records.update_job(job_id, status='running')
+        outcome = self._sandbox.run(run_analysis, pdf_bytes, job_description, self.budget,
+                                    self.jd_cache_size, self.store_db)
+        if outcome is None:
+            raise ValueError("Could not extract text from the PDF. Please ensure it's not a scanned document.")
+        return outcome
+
+    def submit(self, pdf_bytes, job_description):
+        """Queue an analysis and return its job id.
+
+        Raises QueueFullError when ``max_pending`` jobs are queued or running
+        in this process.
+        """
+        with self._lock:
+            if len(self._futures) >= self.max_pending:
+                raise QueueFullError(f"{len(self._futures)} jobs pending")
+            self._records.prune_jobs(time.time() - self.result_ttl)
+
+            job_id = uuid.uuid4().hex
+            self._records.put_job(job_id, os.getpid(), time.time())
+            future = self._executor.submit(self._run, job_id, pdf_bytes, job_description)
+            self._futures[job_id] = future
+
+        future.add_done_callback(partial(self._finish, job_id))
+        return job_id
+
+    def _finish(self, job_id, future):
+        """Record the outcome of a finished job."""
+        try:
+            self._record_outcome(job_id, future)
+        finally:
+            # Only once the outcome is stored, so get() never takes the job for lost
+            with self._lock:
+                self._futures.pop(job_id, None)
+
+    def _record_outcome(self, job_id, future):
+        if future.cancelled():
+            self._records.update_job(job_id, status='failed', finished_at=time.time(),
+                                     error='The job was cancelled at shutdown')
+            return
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Analysis job {job_id} failed: {str(error)}")
+            error_details = None
+            if isinstance(error, AnalysisAborted):
+                record_breach(error)
+                error_details = error.to_dict()
+            self._records.update_job(job_id, status='failed', finished_at=time.time(),
+                                     error=str(error), error_details=error_details)
+        else:
+            result, worker = future.result()
+            with self._lock:
+                self._worker_rss[worker['pid']] = worker['peak_rss_bytes']
+            self._records.update_job(job_id, status='done', finished_at=time.time(), result=result)
+
+    def get(self, job_id):
+        """Return a snapshot of a job's status and result, or None."""
+        job = self._records.get_job(job_id)
+        if job is None:
+            return None
+
+        if job['finished_at'] is None:
+            owner = job['owner_pid']
+            with self._lock:
+                lost = job_id not in self._futures if owner == os.getpid() else not _process_alive(owner)
+            if lost:
+                # The process running it exited (e.g. a restart); the job will never finish
+                job = self._lost(job_id)
+        return {
+            'job_id': job_id,
+            'status': job['status'],
+            'submitted_at': job['submitted_at'],
+            'finished_at': job['finished_at'],
+            'result': job['result'],
+            'error': job['error'],
+            'error_details': job['error_details']
+        }
+
+    def _lost(self, job_id):
+        """Mark an unfinished job whose process is gone as failed and return its record."""
+        job = self._records.get_job(job_id)
+        if job['finished_at'] is None:
+            self._records.update_job(job_id, status='failed', finished_at=time.time(),
+                                     error='The server stopped before the job finished; please resubmit')
+            job = self._records.get_job(job_id)
+        return job
+
+    def stats(self):
+        """Return queue depth, capacity and the peak RSS each live worker last reported."""
+        pids = self._sandbox.pids()
+        tracked_jobs = self._records.job_count()
+        with self._lock:
+            # Killed and replaced workers drop out
+            for pid in set(self._worker_rss) - pids:
+                del self._worker_rss[pid]
+            return {
+                'pending': len(self._futures),
+                'max_pending': self.max_pending,
+                'workers': self.workers,
+                'tracked_jobs': tracked_jobs,
+                'worker_peak_rss_bytes': dict(self._worker_rss)
+            }
+
+    def shutdown(self, wait=True):
+        """Cancel queued jobs and stop the sandbox workers."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._sandbox.shutdown()
+        self._worker_rss.clear()
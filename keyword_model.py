@@ -0,0 +1,123 @@
+"""Corpus-level TF-IDF model for keyword ranking and text similarity.
+
+The vectorizer is fitted offline on a background corpus of resumes and job
+descriptions, saved with joblib and loaded once by NLPProcessor, so requests
+only pay for ``transform``. A truncated SVD of the corpus TF-IDF matrix is
+fitted alongside; it projects a document into a small dense float32 vector
+used for the semantic similarity score.
+
+Fit a model from a directory of .txt/.pdf files:
+    python keyword_model.py path/to/corpus [--output models/tfidf.joblib] [--semantic-dims 128]
+"""
+import os
+import re
+import time
+import logging
+import argparse
+import joblib
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'tfidf.joblib')
+
+
+def normalize_text(text):
+    """Collapse whitespace and lowercase, matching NLPProcessor.clean_text."""
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def fit_keyword_model(texts, max_features=50000, min_df=2, max_df=0.95, semantic_dims=128):
+    """Fit a TF-IDF vectorizer on a corpus of resumes and job descriptions.
+
+    With ``semantic_dims`` > 0, a truncated SVD of the TF-IDF matrix is fitted
+    too and stored as a float32 ``terms x dims`` projection.
+    """
+    vectorizer = TfidfVectorizer(
+        stop_words='english',
+        ngram_range=(1, 2),
+        min_df=min_df,
+        max_df=max_df,
+        max_features=max_features
+    )
+    documents = [normalize_text(text) for text in texts if text and text.strip()]
+    tfidf_matrix = vectorizer.fit_transform(documents)
+    model = {
+        'vectorizer': vectorizer,
+        'version': time.strftime('%Y%m%d%H%M%S'),
+        'documents': len(documents)
+    }
+    # SVD needs fewer components than terms and documents
+    dims = min(semantic_dims, tfidf_matrix.shape[1] - 1, tfidf_matrix.shape[0] - 1)
+    if dims > 0:
+        svd = TruncatedSVD(n_components=dims, random_state=0)
+        svd.fit(tfidf_matrix)
+        model['semantic_projection'] = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+        model['semantic_explained_variance'] = float(svd.explained_variance_ratio_.sum())
+    return model
+
+
+def semantic_vectors(vectorizer, projection, texts):
+    """Project normalized texts into L2-normalized float32 semantic vectors (one row per text).
+
+    Texts without any known term get an all-zero row.
+    """
+    dense = np.asarray(vectorizer.transform(texts) @ projection, dtype=np.float32)
+    norms = np.linalg.norm(dense, axis=1, keepdims=True)
+    np.divide(dense, norms, out=dense, where=norms > 0)
+    return dense
+
+
+def save_keyword_model(model, path=DEFAULT_MODEL_PATH):
+    """Serialize a fitted model to disk."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    joblib.dump(model, path)
+
+
+def load_keyword_model(path=DEFAULT_MODEL_PATH):
+    """Load a fitted model, or return None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+def read_corpus(directory):
+    """Yield the text of every .txt and .pdf file below ``directory``."""
+    from pdf_extractor import extract_text_from_pdf
+
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if name.lower().endswith('.txt'):
+                with open(path, encoding='utf-8', errors='ignore') as f:
+                    yield f.read()
+            elif name.lower().endswith('.pdf'):
+                text = extract_text_from_pdf(path)
+                if text:
+                    yield text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit the corpus TF-IDF keyword model.')
+    parser.add_argument('corpus', help='directory of resumes and job descriptions (.txt/.pdf)')
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH, help='where to write the model')
+    parser.add_argument('--max-features', type=int, default=50000)
+    parser.add_argument('--min-df', type=int, default=2)
+    parser.add_argument('--max-df', type=float, default=0.95)
+    parser.add_argument('--semantic-dims', type=int, default=128,
+                        help='dimensions of the semantic SVD projection (0 = none)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    model = fit_keyword_model(read_corpus(args.corpus), max_features=args.max_features,
+                              min_df=args.min_df, max_df=args.max_df, semantic_dims=args.semantic_dims)
+    save_keyword_model(model, args.output)
+    logging.info(f"Fitted keyword model on {model['documents']} documents "
+                 f"({len(model['vectorizer'].vocabulary_)} terms) -> {args.output}")
+    if 'semantic_projection' in model:
+        logging.info(f"Semantic projection: {model['semantic_projection'].shape[1]} dimensions, "
+                     f"{model['semantic_explained_variance']:.1%} of TF-IDF variance")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+import sys
+import time
+import random
+import threading
+from functools import wraps
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Latency quantiles exported for every timed stage
+QUANTILES = (0.5, 0.95, 0.99)
+
+def peak_rss_bytes():
+    """Return the peak resident set size of this process in bytes (0 if unknown)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def current_rss_bytes():
+    """Return the current resident set size of this process in bytes (0 if unknown)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return 0
+    return pages * resource.getpagesize() if resource is not None else 0
+
+class LatencySummary:
+    """Count, sum and a bounded uniform sample of observed durations."""
+
+    def __init__(self, sample_size=2048):
+        self.count = 0
+        self.total = 0.0
+        self.sample_size = sample_size
+        self._sample = []
+
+    def observe(self, seconds):
+        """Add one observation (reservoir sampling keeps memory bounded)."""
+        self.count += 1
+        self.total += seconds
+        if len(self._sample) < self.sample_size:
+            self._sample.append(seconds)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.sample_size:
+                self._sample[slot] = seconds
+
+    def quantiles(self):
+        """Return {quantile: seconds} estimated from the sample."""
+        if not self._sample:
+            return {q: 0.0 for q in QUANTILES}
+        ordered = sorted(self._sample)
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+class MetricsRegistry:
+    """In-process counters, latency summaries and gauges in Prometheus text format."""
+
+    def __init__(self, prefix='resume_analyzer'):
+        self.prefix = prefix
+        self._counters = {}  # (name, labels) -> value
+        self._summaries = {}  # (name, labels) -> LatencySummary
+        self._gauges = {}  # name -> (help, callback returning {labels: value})
+        self._help = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _labels(labels):
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name, amount=1, help='', **labels):
+        """Increment a counter."""
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            if help:
+                self._help.setdefault(name, help)
+
+    def observe(self, name, seconds, help='', **labels):
+        """Record one latency observation."""
+        key = (name, self._labels(labels))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = LatencySummary()
+            summary.observe(seconds)
+            if help:
+                self._help.setdefault(name, help)
+
+    def gauge(self, name, callback, help=''):
+        """Register a gauge computed at scrape time.
+
+        ``callback`` returns a number, or a dict mapping label tuples of
+        ``(name, value)`` pairs to numbers.
+        """
+        with self._lock:
+            self._gauges[name] = (help, callback)
+
+    @contextmanager
+    def timer(self, stage):
+        """Time a pipeline stage; failures also bump the error counter."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc('stage_errors_total', help='Exceptions raised per pipeline stage', stage=stage)
+            raise
+        finally:
+            self.observe('stage_duration_seconds', time.perf_counter() - start,
+                         help='Latency of each analysis pipeline stage', stage=stage)
+
+    def timed(self, stage):
+        """Decorator form of ``timer``."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ''
+        pairs = []
+        for key, value in labels:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{key}="{value}"')
+        return '{' + ','.join(pairs) + '}'
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = dict(self._counters)
+            summaries = {key: (s.count, s.total, s.quantiles()) for key, s in self._summaries.items()}
+            gauges = dict(self._gauges)
+            help_text = dict(self._help)
+
+        def header(name, kind):
+            full_name = f'{self.prefix}_{name}'
+            if name in help_text:
+                lines.append(f'# HELP {full_name} {help_text[name]}')
+            lines.append(f'# TYPE {full_name} {kind}')
+            return full_name
+
+        for name in sorted({name for name, _ in counters}):
+            full_name = header(name, 'counter')
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{full_name}{self._format_labels(labels)} {value}')
+
+        for name in sorted({name for name, _ in summaries}):
+            full_name = header(name, 'summary')
+            for (metric, labels), (count, total, quantiles) in sorted(summaries.items()):
+                if metric != name:
+                    continue
+                for q, value in quantiles.items():
+                    lines.append(f'{full_name}{self._format_labels(labels + (("quantile", q),))} {value:.6f}')
+                lines.append(f'{full_name}_sum{self._format_labels(labels)} {total:.6f}')
+                lines.append(f'{full_name}_count{self._format_labels(labels)} {count}')
+
+        for name, (help, callback) in sorted(gauges.items()):
+            full_name = f'{self.prefix}_{name}'
+            if help:
+                lines.append(f'# HELP {full_name} {help}')
+            lines.append(f'# TYPE {full_name} gauge')
+            values = callback()
+            if not isinstance(values, dict):
+                values = {(): values}
+            for labels, value in sorted(values.items()):
+                lines.append(f'{full_name}{self._format_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
@@ -0,0 +1,194 @@
+import os
+import shutil
+import logging
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import fitz  # PyMuPDF
+
+# Default extraction caps, overridden by PDF_MAX_PAGES and PDF_MAX_CHARS in the
+# app and batch_analyze.py (0 = no limit)
+DEFAULT_MAX_PAGES = 200
+DEFAULT_MAX_CHARS = 1000000
+
+# Process pool for page-parallel extraction of large PDFs, created on first use
+_page_pool = None
+_page_pool_workers = 0
+_page_pool_lock = threading.Lock()
+
+def _stream_size(stream):
+    """Return the number of bytes left in a seekable stream."""
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell() - position
+    stream.seek(position)
+    return size
+
+def read_or_spool(source, spool_threshold=0, spool_dir=None):
+    """Turn a PDF source into bytes or a file path.
+
+    Bytes and paths are returned as they are. Streams are read into bytes,
+    or, when larger than ``spool_threshold`` bytes (and it is non-zero),
+    copied to a uniquely named temporary file in ``spool_dir`` instead.
+    Returns ``(bytes or path, spool_path)``; the caller removes
+    ``spool_path`` when it is not None.
+    """
+    if isinstance(source, (str, os.PathLike, bytes)):
+        return source, None
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source), None
+
+    if spool_threshold and _stream_size(source) > spool_threshold:
+        with tempfile.NamedTemporaryFile(suffix='.pdf', dir=spool_dir, delete=False) as spool:
+            shutil.copyfileobj(source, spool)
+        return spool.name, spool.name
+
+    return source.read(), None
+
+def open_pdf(source, spool_threshold=0, spool_dir=None):
+    """Open a PDF from bytes, a binary stream or a file path.
+
+    Bytes and streams are opened in memory; see ``read_or_spool`` for
+    spooling large streams to disk. Returns ``(doc, spool_path)``; the
+    caller removes ``spool_path`` when it is not None.
+    """
+    source, spool_path = read_or_spool(source, spool_threshold=spool_threshold, spool_dir=spool_dir)
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype='pdf'), None
+    return fitz.open(source), spool_path
+
+def get_page_pool(workers):
+    """Return the shared page extraction pool, (re)creating it with ``workers`` processes."""
+    global _page_pool, _page_pool_workers
+    with _page_pool_lock:
+        if _page_pool is None or _page_pool_workers != workers:
+            if _page_pool is not None:
+                _page_pool.shutdown(wait=False)
+            _page_pool = ProcessPoolExecutor(max_workers=workers)
+            _page_pool_workers = workers
+        return _page_pool
+
+def shutdown_page_pool():
+    """Stop the page extraction pool, if one was started."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown(wait=False, cancel_futures=True)
+            _page_pool = None
+
+def _forget_page_pool():
+    """In a forked child: the parent's pool (and the state of its lock) are not this process's."""
+    global _page_pool, _page_pool_workers, _page_pool_lock
+    _page_pool = None
+    _page_pool_workers = 0
+    _page_pool_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_page_pool)
+
+def _page_range_text(doc, start, stop, max_chars=0):
+    """Join the text of pages ``start`` to ``stop - 1``, stopping early after ``max_chars``."""
+    parts = []
+    length = 0
+    for number in range(start, stop):
+        text = doc[number].get_text()
+        parts.append(text)
+        length += len(text)
+        if max_chars and length >= max_chars:
+            break
+    return ''.join(parts)
+
+def _extract_page_range(path, start, stop, max_chars=0):
+    """Pool worker: extract one page range of the PDF at ``path``."""
+    with fitz.open(path) as doc:
+        return _page_range_text(doc, start, stop, max_chars)
+
+def _extract_parallel(path, page_count, workers, max_chars=0):
+    """Extract ``page_count`` pages of the PDF at ``path`` across the page pool.
+
+    Pages are split into one contiguous range per worker and the results are
+    joined in page order. Each range stops after ``max_chars`` characters, and
+    ranges not yet started are cancelled once the cap is reached.
+    """
+    chunk = -(-page_count // workers)
+    pool = get_page_pool(workers)
+    futures = [
+        pool.submit(_extract_page_range, path, start, min(start + chunk, page_count), max_chars)
+        for start in range(0, page_count, chunk)
+    ]
+    parts = []
+    length = 0
+    try:
+        for future in futures:
+            text = future.result()
+            parts.append(text)
+            length += len(text)
+            if max_chars and length >= max_chars:
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+    return ''.join(parts)
+
+def extract_text_from_pdf(source, spool_threshold=0, spool_dir=None, max_pages=0, max_chars=0,
+                          parallel_threshold=0, workers=1, stats=None):
+    """Extract text from PDF using PyMuPDF.
+
+    ``source`` may be raw PDF bytes, a binary stream (e.g. an upload's
+    ``file.stream``) or a file path. See ``open_pdf`` for disk spooling.
+
+    Only the first ``max_pages`` pages and ``max_chars`` characters are
+    extracted (0 means no limit). Documents with more than
+    ``parallel_threshold`` pages are extracted page-range by page-range in a
+    pool of ``workers`` processes; 0 keeps extraction in this process.
+
+    A ``stats`` dict, if given, receives the document's ``pages`` and
+    whether the caps applied (``truncated_pages``, ``truncated_chars``).
+    """
+    if stats is None:
+        stats = {}
+    spool_path = None
+    try:
+        doc, spool_path = open_pdf(source, spool_threshold=spool_threshold, spool_dir=spool_dir)
+        with doc:
+            page_count = doc.page_count
+            stats['pages'] = page_count
+            stats['truncated_pages'] = bool(max_pages and page_count > max_pages)
+            if stats['truncated_pages']:
+                logging.warning(f"PDF has {page_count} pages; extracting the first {max_pages}")
+                page_count = max_pages
+
+            text = None
+            if parallel_threshold and workers > 1 and page_count > parallel_threshold:
+                # Workers open the document by path, so in-memory PDFs are written out once
+                path = source if isinstance(source, (str, os.PathLike)) else spool_path
+                if path is None:
+                    with tempfile.NamedTemporaryFile(suffix='.pdf', dir=spool_dir, delete=False) as spool:
+                        spool_path = spool.name
+                        if isinstance(source, (bytes, bytearray, memoryview)):
+                            spool.write(source)
+                    if not isinstance(source, (bytes, bytearray, memoryview)):
+                        doc.save(spool_path)
+                    path = spool_path
+                try:
+                    text = _extract_parallel(path, page_count, workers, max_chars)
+                except BrokenProcessPool:
+                    logging.error("Page extraction pool broken; extracting serially")
+                    shutdown_page_pool()
+
+            if text is None:
+                text = _page_range_text(doc, 0, page_count, max_chars)
+
+        # Extraction stops once the cap is reached, so text at the cap was (almost always) cut short
+        stats['truncated_chars'] = bool(max_chars and len(text) >= max_chars)
+        if max_chars and len(text) > max_chars:
+            logging.warning(f"PDF text truncated to {max_chars} characters")
+            text = text[:max_chars]
+        return text.strip()
+    except Exception as e:
+        logging.error(f"Error extracting text from PDF: {str(e)}")
+        return None
+    finally:
+        if spool_path:
+            os.remove(spool_path)
@@ -0,0 +1,273 @@
+import io
+import os
+import time
+import uuid
+import hashlib
+import logging
+import zipfile
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from xml.sax.saxutils import escape
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+# Bump when the report layout changes so cached PDFs are rebuilt
+REPORT_VERSION = 1
+
+SCORE_ROWS = [
+    ('overall_score', 'Overall job fit'),
+    ('skill_score', 'Skills match'),
+    ('role_score', 'Role relevance'),
+    ('experience_score', 'Experience & education'),
+    ('keyword_score', 'Keyword overlap'),
+    ('semantic_score', 'Semantic similarity')
+]
+
+def _score_color(score):
+    # Same bands as the results page
+    if score >= 80:
+        return colors.HexColor('#198754')
+    if score >= 60:
+        return colors.HexColor('#fd7e14')
+    return colors.HexColor('#dc3545')
+
+def _bullets(items, style):
+    return ListFlowable([ListItem(Paragraph(escape(str(item)), style)) for item in items],
+                        bulletType='bullet', leftIndent=12)
+
+def build_report(result, filename=None):
+    """Render a ``ScoringEngine.build_results`` result as PDF bytes."""
+    styles = getSampleStyleSheet()
+    body = styles['BodyText']
+    buffer = io.BytesIO()
+    document = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=18 * mm, rightMargin=18 * mm,
+                                 topMargin=18 * mm, bottomMargin=18 * mm,
+                                 title='Resume Analysis Report', author='Resume Job Fit Analyzer')
+
+    story = [Paragraph('Resume Analysis Report', styles['Title'])]
+    if filename:
+        story.append(Paragraph(f"Resume: {escape(filename)}", body))
+    story.append(Spacer(1, 6 * mm))
+
+    rows = [['Component', 'Score']]
+    row_colors = []
+    for key, label in SCORE_ROWS:
+        if key in result:
+            row_colors.append(('TEXTCOLOR', (1, len(rows)), (1, len(rows)), _score_color(result[key])))
+            rows.append([label, f"{result[key]} / 100"])
+    table = Table(rows, colWidths=[110 * mm, 40 * mm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0d6efd')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 1), 'Helvetica-Bold'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#dee2e6')),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
+    ] + row_colors))
+    story += [table, Spacer(1, 6 * mm)]
+
+    for key, heading in (('matched_keywords', 'Matched Keywords'), ('missing_keywords', 'Missing Keywords')):
+        keywords = sorted(result.get(key) or [])
+        story.append(Paragraph(f"{heading} ({len(keywords)})", styles['Heading2']))
+        story.append(_bullets(keywords, body) if keywords else Paragraph('None found.', body))
+
+    suggestions = result.get('suggestions') or []
+    if suggestions:
+        story.append(Paragraph('Suggestions', styles['Heading2']))
+        for suggestion in suggestions:
+            story.append(Paragraph(
+                f"<b>{escape(suggestion['category'])}</b> ({escape(suggestion['priority'])} priority): "
+                f"{escape(suggestion['suggestion'])}", body
+            ))
+            if suggestion.get('description'):
+                story.append(Paragraph(escape(suggestion['description']), styles['Italic']))
+            story.append(Spacer(1, 2 * mm))
+
+    document.build(story)
+    return buffer.getvalue()
+
+def render_report_file(result, filename, path):
+    """Write the report of one result to ``path`` unless it exists; returns ``path``.
+
+    Runs in the bulk export pool and in request threads. Every render writes
+    its own temp file and the result appears atomically, so concurrent
+    renders of the same report are harmless.
+    """
+    if not os.path.exists(path):
+        pdf = build_report(result, filename=filename)
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                        dir=os.path.dirname(path) or '.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return path
+
+class ReportCache:
+    """PDF reports on disk, named by result id, filename and report version.
+
+    Result ids are content hashes, so a cached file never goes stale; a
+    repeat download only sends the file. The report prints the resume's
+    filename, so the same result under another filename is another file.
+    """
+
+    def __init__(self, directory='reports'):
+        """Use (and create) ``directory`` for cached reports."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, result_id, filename=None):
+        """Return the cache path of a result's report under ``filename``."""
+        name_hash = hashlib.sha256((filename or '').encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.directory, f"{result_id}.{name_hash}.v{REPORT_VERSION}.pdf")
+
+    def get_or_render(self, result_id, result, filename=None):
+        """Return the path of the result's report, rendering it on a miss."""
+        path = self.path(result_id, filename)
+        hit = os.path.exists(path)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not hit:
+            render_report_file(result, filename, path)
+        return path
+
+    def stats(self):
+        """Return hit/miss counters."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+class BulkExporter:
+    """Renders many reports in a background process pool and zips them.
+
+    ``submit`` returns at once with a job id; reports already in the cache
+    are not rendered again. Finished archives can be fetched until
+    ``result_ttl`` seconds after completion.
+    """
+
+    def __init__(self, cache, workers=2, result_ttl=3600):
+        """Configure the pool; worker processes start on the first submit."""
+        self.cache = cache
+        self.workers = workers
+        self.result_ttl = result_ttl
+
+        self._executor = None
+        self._jobs = {}  # job id -> job record
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """Return the process pool, (re)creating it if needed."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def submit(self, records):
+        """Queue reports for ``records`` (``{'result_id', 'result', 'filename'}`` dicts); returns a job id."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = {
+                'status': 'queued',
+                'submitted_at': time.time(),
+                'finished_at': None,
+                'total': len(records),
+                'cached': 0,
+                'rendered': 0,
+                'archive': None,
+                'error': None
+            }
+        threading.Thread(target=self._run, args=(job_id, records), daemon=True).start()
+        return job_id
+
+    def _run(self, job_id, records):
+        """Render missing reports in the pool, then zip all of them."""
+        with self._lock:
+            self._jobs[job_id]['status'] = 'running'
+        try:
+            # One report per (result id, filename): the filename is printed in the report
+            reports = {(record['result_id'], record['filename']): record['result'] for record in records}
+            paths = {key: self.cache.path(*key) for key in reports}
+            missing = [key for key in reports if not os.path.exists(paths[key])]
+            with self._lock:
+                self._jobs[job_id]['cached'] = len(records) - len(missing)
+
+            rendered = set()
+            try:
+                self._render(job_id, missing, reports, paths, rendered)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed by the OOM killer); render the rest in a fresh pool
+                logging.error("Report worker pool broken; restarting it")
+                with self._lock:
+                    self._executor = None
+                self._render(job_id, [key for key in missing if key not in rendered], reports, paths, rendered)
+
+            archive = os.path.join(self.cache.directory, f"bulk-{job_id}.zip")
+            names = set()
+            with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:  # PDFs are already compressed
+                for result_id, filename in reports:
+                    stem = f"{os.path.splitext(filename or 'report')[0]}-{result_id[:12]}"
+                    name, n = f"{stem}.pdf", 1
+                    while name in names:  # filenames that differ only in their extension
+                        n += 1
+                        name = f"{stem}-{n}.pdf"
+                    names.add(name)
+                    zf.write(paths[(result_id, filename)], name)
+            with self._lock:
+                self._jobs[job_id].update(status='done', archive=archive, finished_at=time.time())
+        except Exception as e:
+            logging.error(f"Bulk report export {job_id} failed: {str(e)}")
+            with self._lock:
+                self._jobs[job_id].update(status='failed', error=str(e), finished_at=time.time())
+
+    def _render(self, job_id, keys, reports, paths, rendered):
+        """Render the reports of ``keys`` in the pool, adding each finished key to ``rendered``.
+
+        Raises BrokenProcessPool when a worker dies, whether on submit or
+        while waiting for results.
+        """
+        with self._lock:
+            executor = self._get_executor()
+        futures = [(key, executor.submit(render_report_file, reports[key], key[1], paths[key])) for key in keys]
+        for key, future in futures:
+            future.result()
+            rendered.add(key)
+            with self._lock:
+                self._jobs[job_id]['rendered'] += 1
+
+    def get(self, job_id):
+        """Return a snapshot of a bulk export job, or None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return None if job is None else dict(job, job_id=job_id)
+
+    def _prune(self):
+        """Forget finished jobs older than ``result_ttl`` seconds and delete their archives."""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and job['finished_at'] < cutoff]
+        for job_id in expired:
+            archive = self._jobs.pop(job_id)['archive']
+            if archive:
+                try:
+                    os.remove(archive)
+                except OSError:  # already gone, or still open for a download on Windows
+                    pass
+
+    def shutdown(self, wait=True):
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
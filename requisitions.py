@@ -0,0 +1,180 @@
+import threading
+import numpy as np
+from batch_scoring import COMPONENTS, component_scores, weighted_overall
+
+# Ranking fields compared with the requisition's thresholds
+_THRESHOLD_FIELDS = {
+    'skills': 'skill_score',
+    'role': 'role_score',
+    'experience': 'experience_score',
+    'keywords': 'keyword_score',
+    'overall': 'overall_score'
+}
+
+class Requisition:
+    """One open role: its job description analysis, weights profile, thresholds and candidate scores.
+
+    Unrounded component scores are kept per candidate (one NumPy array per
+    component), so a new weights profile re-ranks without any NLP or
+    overlap computation. Thresholds only label ranking entries and never
+    change the order.
+    """
+
+    def __init__(self, requisition_id, jd_analysis, weights, thresholds, metadata=None):
+        self.requisition_id = requisition_id
+        self.jd_analysis = jd_analysis
+        self.weights = weights
+        self.thresholds = thresholds
+        self.metadata = metadata or {}
+        self.synced_at = None  # set by callers that pull candidates incrementally
+
+        self.candidate_ids = []
+        self.labels = []
+        self._rows = {}  # candidate id -> row in the score arrays
+        self.components = {component: np.empty(0) for component in COMPONENTS}
+        self.overall = np.empty(0, dtype=np.int64)
+        self.order = np.empty(0, dtype=np.int64)  # rows, best candidate first
+
+    def __len__(self):
+        return len(self.candidate_ids)
+
+    def rerank(self):
+        """Recompute overall scores and the ranking from the cached component scores."""
+        self.overall = np.rint(weighted_overall(self.components, self.weights)).astype(np.int64)
+        skill = np.rint(self.components['skills'])
+        # Highest overall first, skills break ties, then insertion order (lexsort is stable),
+        # the same order as ScoringEngine.rank_resumes
+        self.order = np.lexsort((-skill, -self.overall))
+
+class RequisitionRanker:
+    """Per-requisition weights profiles and thresholds with incremental re-ranking.
+
+    Candidates are scored once per requisition. Changing a requisition's
+    weights only recombines its cached component scores and re-sorts that
+    one ranking; other requisitions are untouched.
+    """
+
+    def __init__(self, scoring_engine):
+        """Create an empty ranker; ``scoring_engine`` supplies weight and threshold validation."""
+        self.scoring_engine = scoring_engine
+        self._requisitions = {}  # requisition id -> Requisition
+        self._lock = threading.RLock()
+        self.synced_seq = 0  # set by callers that replay stored requisitions
+
+    def create(self, requisition_id, jd_analysis, weights=None, thresholds=None, metadata=None):
+        """Create (or replace) a requisition; raises ValueError for invalid weights or thresholds."""
+        requisition = Requisition(
+            requisition_id, jd_analysis, self.scoring_engine.normalize_weights(weights),
+            self.scoring_engine.normalize_thresholds(thresholds), metadata
+        )
+        with self._lock:
+            self._requisitions[requisition_id] = requisition
+        return requisition
+
+    def remove(self, requisition_id):
+        """Remove a requisition; returns False if it did not exist."""
+        with self._lock:
+            return self._requisitions.pop(requisition_id, None) is not None
+
+    def get(self, requisition_id):
+        """Return the Requisition or None."""
+        with self._lock:
+            return self._requisitions.get(requisition_id)
+
+    def __len__(self):
+        return len(self._requisitions)
+
+    def add_candidates(self, requisition_id, candidates, labels=None):
+        """Score ``(candidate_id, analysis)`` pairs for one requisition and re-rank it.
+
+        Known candidate ids are re-scored in place. ``labels`` optionally maps
+        candidate ids to display names. Returns the number of new candidates.
+        """
+        requisition = self.get(requisition_id)
+        if requisition is None:
+            raise KeyError(requisition_id)
+        candidates = list(candidates)
+        if not candidates:
+            return 0
+        labels = labels or {}
+
+        scores = component_scores([analysis for _, analysis in candidates], [requisition.jd_analysis])
+        with self._lock:
+            rows = []
+            added = 0
+            for candidate_id, _ in candidates:
+                row = requisition._rows.get(candidate_id)
+                if row is None:
+                    row = requisition._rows[candidate_id] = len(requisition.candidate_ids) + added
+                    added += 1
+                rows.append(row)
+
+            size = len(requisition.candidate_ids) + added
+            for component in COMPONENTS:
+                values = requisition.components[component]
+                if added:
+                    values = np.resize(values, size)  # new rows are overwritten below
+                values[rows] = scores[component][:, 0]
+                requisition.components[component] = values
+            requisition.candidate_ids.extend([None] * added)
+            requisition.labels.extend([None] * added)
+            for (candidate_id, _), row in zip(candidates, rows):
+                requisition.candidate_ids[row] = candidate_id
+                requisition.labels[row] = labels.get(candidate_id)
+            requisition.rerank()
+        return added
+
+    def set_weights(self, requisition_id, weights):
+        """Apply a new weights profile to one requisition and re-rank only it.
+
+        Raises KeyError for an unknown requisition and ValueError for invalid weights.
+        """
+        profile = self.scoring_engine.normalize_weights(weights)
+        with self._lock:
+            requisition = self._requisitions[requisition_id]
+            requisition.weights = profile
+            requisition.rerank()
+        return profile
+
+    def set_thresholds(self, requisition_id, thresholds):
+        """Replace one requisition's thresholds; the ranking order does not change.
+
+        Raises KeyError for an unknown requisition and ValueError for invalid thresholds.
+        """
+        profile = self.scoring_engine.normalize_thresholds(thresholds)
+        with self._lock:
+            self._requisitions[requisition_id].thresholds = profile
+        return profile
+
+    def ranking(self, requisition_id, top_k=None, offset=0):
+        """Return ranked candidates of a requisition, best first.
+
+        Each entry has rank, candidate_id, label, the rounded overall and
+        component scores, ``below_thresholds`` (the requisition's thresholds
+        the entry misses) and ``excellent``. Raises KeyError for an unknown
+        requisition.
+        """
+        with self._lock:
+            requisition = self._requisitions[requisition_id]
+            stop = len(requisition) if top_k is None else offset + top_k
+            rows = requisition.order[offset:stop]
+            components = {component: np.rint(values[rows]).astype(np.int64)
+                          for component, values in requisition.components.items()}
+            overall = requisition.overall[rows]
+            thresholds = requisition.thresholds
+            entries = [{
+                'rank': offset + i + 1,
+                'candidate_id': requisition.candidate_ids[row],
+                'label': requisition.labels[row],
+                'overall_score': int(overall[i]),
+                'skill_score': int(components['skills'][i]),
+                'role_score': int(components['role'][i]),
+                'experience_score': int(components['experience'][i]),
+                'keyword_score': int(components['keywords'][i]),
+                'semantic_score': int(components['semantic'][i])
+            } for i, row in enumerate(rows.tolist())]
+        for entry in entries:
+            entry['below_thresholds'] = [key for key, field in _THRESHOLD_FIELDS.items()
+                                         if entry[field] < thresholds[key]]
+            entry['excellent'] = entry['overall_score'] >= thresholds['excellent']
+        return entries
@@ -0,0 +1,293 @@
+import os
+import time
+import signal
+import logging
+import threading
+import multiprocessing
+from multiprocessing.util import Finalize
+from budgets import AnalysisAborted, BudgetExceeded, WorkerCrashed
+from pdf_extractor import extract_text_from_pdf, read_or_spool, shutdown_page_pool
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Per-process state of sandbox workers; see AnalysisSandbox.share
+_worker = {}
+
+def _address_space_bytes():
+    """Return this process's virtual memory size, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+def _worker_main(conn, max_memory_bytes, parent_conn):
+    """Serve tasks sent over ``conn`` until the parent closes it."""
+    # A forked worker inherits the parent's end too; holding it would hide the EOF when the parent dies
+    parent_conn.close()
+    # Ctrl-C goes to the whole process group; the parent decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(os, 'setpgrp'):
+        # Lead a process group of our own, so a kill also takes down our page extraction pool
+        os.setpgrp()
+    if 'nlp_processor' not in _worker:
+        from nlp_processor import NLPProcessor
+        _worker['nlp_processor'] = NLPProcessor()
+    if max_memory_bytes and resource is not None:
+        # On top of what the worker already maps (the spaCy model, inherited from the parent)
+        current = _address_space_bytes()
+        if current is not None:
+            limit = current + max_memory_bytes
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    def stage(name):
+        conn.send(('stage', name))
+
+    try:
+        while True:
+            try:
+                task = conn.recv()
+            except (EOFError, OSError):
+                return
+            if task is None:
+                return
+            func, args = task
+            try:
+                conn.send(('result', func(stage, *args)))
+            except AnalysisAborted as e:
+                conn.send(('aborted', e))
+            except MemoryError:
+                conn.send(('memory', None))
+                return  # the heap may be in no state to serve another task
+            except Exception as e:
+                conn.send(('error', f"{type(e).__name__}: {str(e)}"))
+    finally:
+        shutdown_page_pool()
+
+def worker_nlp_processor():
+    """Return the NLP processor of this sandbox worker, for tasks passed to AnalysisSandbox.run."""
+    return _worker['nlp_processor']
+
+def analyze_pdf(stage, source, budget, extract_options):
+    """Sandbox task: extract and analyze one resume PDF under ``budget``.
+
+    ``source`` is PDF bytes or a file path; ``extract_options`` go to
+    extract_text_from_pdf (e.g. ``parallel_threshold`` and ``workers``).
+    Returns ``(analysis or None, extraction stats)``.
+    """
+    stage('extract')
+    extract_stats = {}
+    resume_text = extract_text_from_pdf(source, stats=extract_stats, **budget.pdf_limits(), **extract_options)
+    if not resume_text:
+        return None, extract_stats
+    stage('nlp')
+    analysis = worker_nlp_processor().analyze_text(resume_text, text_type='resume', max_tokens=budget.max_tokens)
+    return analysis, extract_stats
+
+class _Worker:
+    """One sandbox process and the parent's end of its pipe.
+
+    Not a daemon process, since daemons cannot start the page extraction
+    pool; AnalysisSandbox stops its workers when the parent exits.
+    """
+
+    def __init__(self, context, max_memory_bytes):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, max_memory_bytes, self.conn))
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        """Kill the worker and the processes it started."""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):  # no process groups here, or not (yet) a group leader
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+def _stop_workers(workers, idle):
+    """Stop idle workers and kill busy ones; runs when the sandbox or its process goes away."""
+    for worker in list(workers):
+        if worker in idle:
+            worker.stop()
+        else:
+            worker.kill()
+    workers.clear()
+
+class AnalysisSandbox:
+    """Runs resume analyses in worker processes that can be killed mid-analysis.
+
+    Workers are long-lived and, where fork is available, start as copies of
+    the app process, sharing the already loaded spaCy model. A worker
+    reports each stage it enters; the parent waits on the pipe with the
+    stage's deadline (and the total one), and a worker that misses a
+    deadline is killed and replaced, so one pathological PDF costs at most
+    its budget. Budget breaches and crashed workers raise AnalysisAborted
+    subclasses. At most ``workers`` analyses run at once; further callers
+    wait for a free worker.
+    """
+
+    def __init__(self, budget, workers=2):
+        """Configure the sandbox; worker processes start on first use."""
+        self.budget = budget
+        self.workers = workers
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        self._idle = []
+        self._workers = set()  # idle and busy
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self.started = 0
+        self.killed = 0
+        # Workers are not daemons, so stop them before multiprocessing joins its children at exit
+        self._finalizer = Finalize(self, _stop_workers, args=(self._workers, self._idle), exitpriority=10)
+
+    @staticmethod
+    def share(nlp_processor):
+        """Hand the loaded NLP processor to workers started by fork."""
+        _worker['nlp_processor'] = nlp_processor
+
+    def analyze_pdf(self, source, spool_threshold=0, spool_dir=None, **extract_options):
+        """Extract and analyze a resume PDF in a worker; returns ``(analysis or None, extraction stats)``.
+
+        ``source`` is PDF bytes, a binary stream or a file path. Streams
+        larger than ``spool_threshold`` bytes are spooled to a file in
+        ``spool_dir`` (see read_or_spool) and passed to the worker by path
+        rather than through the pipe. ``extract_options`` go to
+        extract_text_from_pdf in the worker, so large PDFs are extracted in
+        parallel page ranges there; the page pool belongs to the worker and
+        is killed with it.
+        """
+        source, spool_path = read_or_spool(source, spool_threshold=spool_threshold, spool_dir=spool_dir)
+        try:
+            return self.run(analyze_pdf, source, self.budget, dict(extract_options, spool_dir=spool_dir))
+        finally:
+            if spool_path:
+                os.remove(spool_path)
+
+    def run(self, func, *args):
+        """Run ``func(stage, *args)`` in a worker within the budget's deadlines and return its result.
+
+        ``func`` must be picklable by reference (a module-level function)
+        and call ``stage(name)`` when it enters a stage.
+        """
+        start = time.monotonic()
+        total = self.budget.deadlines.get('total')
+        if not self._slots.acquire(timeout=total):
+            raise BudgetExceeded('queue', 'total_seconds', total, round(time.monotonic() - start, 3))
+        try:
+            with self._lock:
+                worker = self._idle.pop() if self._idle else None
+            if worker is not None and not worker.process.is_alive():
+                # Died while idle (e.g. the OOM killer); replace it
+                self._discard(worker)
+                worker = None
+            if worker is None:
+                worker = _Worker(self._context, self.budget.max_memory_bytes)
+                with self._lock:
+                    self._workers.add(worker)
+                    self.started += 1
+            try:
+                kind, payload = self._wait(worker, func, args, start)
+            except BaseException:
+                # A worker that timed out, died or was interrupted mid-task is not reused
+                self._discard(worker)
+                raise
+            # The worker answered, so it can take the next task
+            with self._lock:
+                self._idle.append(worker)
+            if kind == 'aborted':
+                raise payload
+            if kind == 'error':
+                raise RuntimeError(payload)
+            return payload
+        finally:
+            self._slots.release()
+
+    def _wait(self, worker, func, args, start):
+        """Send one task to ``worker`` and follow its stages until it answers.
+
+        Returns the worker's ``(kind, payload)`` answer; raises when the
+        worker has to be killed.
+        """
+        stage, stage_start = 'start', time.monotonic()
+        try:
+            worker.conn.send((func, args))
+        except OSError:
+            raise WorkerCrashed(stage, "The analysis worker exited before accepting the task")
+
+        while True:
+            # Whichever of the stage and total deadlines comes first
+            limits = []
+            if stage in self.budget.deadlines:
+                limits.append((stage_start + self.budget.deadlines[stage], 'seconds', self.budget.deadlines[stage]))
+            if 'total' in self.budget.deadlines:
+                limits.append((start + self.budget.deadlines['total'], 'total_seconds', self.budget.deadlines['total']))
+            deadline, limit, allowed = min(limits) if limits else (None, None, None)
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+
+            if not worker.conn.poll(timeout):
+                self._killed(stage, limit)
+                elapsed = time.monotonic() - (stage_start if limit == 'seconds' else start)
+                raise BudgetExceeded(stage, limit, allowed, round(elapsed, 3))
+            try:
+                kind, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.process.join(timeout=5)
+                raise WorkerCrashed(stage, f"The analysis worker died in the {stage} stage "
+                                           f"(exit code {worker.process.exitcode})")
+
+            if kind == 'stage':
+                stage, stage_start = payload, time.monotonic()
+            elif kind == 'memory':
+                raise BudgetExceeded(stage, 'max_memory_bytes', self.budget.max_memory_bytes)
+            else:
+                return kind, payload
+
+    def _discard(self, worker):
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+
+    def _killed(self, stage, limit):
+        logging.warning(f"Analysis worker killed: {limit} budget exceeded in the {stage} stage")
+        with self._lock:
+            self.killed += 1
+
+    def stats(self):
+        """Return worker counts and the budget."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'idle': len(self._idle),
+                'started': self.started,
+                'killed': self.killed,
+                'budget': self.budget.to_dict()
+            }
+
+    def pids(self):
+        """Return the pids of the current worker processes."""
+        with self._lock:
+            return {worker.process.pid for worker in self._workers}
+
+    def shutdown(self):
+        """Stop the idle workers."""
+        with self._lock:
+            idle, self._idle[:] = list(self._idle), []
+            self._workers.difference_update(idle)
+        for worker in idle:
+            worker.stop()
@@ -1,22 +1,82 @@
 import logging
-from collections import Counter
 import numpy as np
+from collections import Counter
+from compact_analysis import CompactAnalysis, vocabulary
 
 class ScoringEngine:
     """Handles scoring logic for job fit analysis."""
     
-    def __init__(self):
-        """Initialize scoring weights and thresholds."""
-        self.weights = {
-            'skills': 0.5,      # 50% weight for skill overlap
-            'role': 0.3,        # 30% weight for role relevance
-            'experience': 0.2   # 20% weight for experience/education match
-        }
+    DEFAULT_WEIGHTS = {
+        'skills': 0.5,      # 50% weight for skill overlap
+        'role': 0.3,        # 30% weight for role relevance
+        'experience': 0.2,  # 20% weight for experience/education match
+        'keywords': 0.0,    # keyword overlap is informational unless a profile weights it
+        'semantic': 0.0     # semantic similarity, needs a keyword model with a semantic projection
+    }
+    
+    # Component scores below these values trigger an improvement suggestion
+    DEFAULT_THRESHOLDS = {
+        'skills': 70,
+        'role': 60,
+        'experience': 70,
+        'keywords': 50,
+        'overall': 80,
+        'excellent': 85     # at or above: positive reinforcement instead
+    }
+    
+    def __init__(self, weights=None, thresholds=None):
+        """Initialize scoring weights and thresholds.
+        
+        ``weights`` and ``thresholds`` override the defaults key by key; see
+        ``normalize_weights`` and ``normalize_thresholds`` for how they are
+        validated.
+        """
+        self.weights = self.normalize_weights(weights)
+        self.thresholds = self.normalize_thresholds(thresholds)
         
         # Scoring thresholds
         self.skill_match_threshold = 0.3  # Minimum skill overlap for good score
         self.role_match_threshold = 0.2   # Minimum role overlap for good score
-        
+    
+    @classmethod
+    def normalize_weights(cls, weights=None):
+        """Return a complete weights profile from a partial one.
+        
+        Missing components keep their default weight. Weights must be
+        non-negative numbers and are rescaled to sum to 1. Raises ValueError
+        for unknown components or invalid values.
+        """
+        profile = dict(cls.DEFAULT_WEIGHTS)
+        for component, weight in (weights or {}).items():
+            if component not in profile:
+                raise ValueError(f"Unknown scoring component '{component}'")
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not weight >= 0:
+                raise ValueError(f"Weight for '{component}' must be a non-negative number")
+            profile[component] = float(weight)
+        
+        total = sum(profile.values())
+        if total <= 0:
+            raise ValueError("At least one weight must be positive")
+        if abs(total - 1) > 1e-9:
+            profile = {component: weight / total for component, weight in profile.items()}
+        return profile
+    
+    @classmethod
+    def normalize_thresholds(cls, thresholds=None):
+        """Return a complete set of thresholds from a partial one.
+        
+        Missing keys keep their default. Thresholds are scores from 0 to 100.
+        Raises ValueError for unknown keys or invalid values.
+        """
+        profile = dict(cls.DEFAULT_THRESHOLDS)
+        for key, value in (thresholds or {}).items():
+            if key not in profile:
+                raise ValueError(f"Unknown threshold '{key}'")
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 100:
+                raise ValueError(f"Threshold for '{key}' must be a number from 0 to 100")
+            profile[key] = value
+        return profile
+    
     def calculate_skill_overlap_score(self, resume_skills, jd_skills):
         """Calculate skill overlap score between resume and job description."""
         if not jd_skills:
@@ -118,26 +178,95 @@ class ScoringEngine:
         
         return keyword_score, matched_keywords, missing_keywords
     
-    def calculate_job_fit_score(self, resume_analysis, jd_analysis):
-        """Calculate overall job fit score with detailed breakdown."""
-        # Calculate individual scores
-        skill_score, matched_skills, missing_skills = self.calculate_skill_overlap_score(
-            resume_analysis['skills'], jd_analysis['skills']
-        )
-        
-        role_score = self.calculate_role_relevance_score(
-            resume_analysis['job_roles'], jd_analysis['job_roles']
-        )
+    def calculate_semantic_score(self, resume_vector, jd_vector):
+        """Calculate the semantic similarity score (0-100) of two semantic vectors.
+        
+        The vectors (lists or NumPy arrays) are L2-normalized, so their dot
+        product is the cosine. Missing or mismatched vectors score 0.
+        """
+        if (resume_vector is None or jd_vector is None or not len(resume_vector)
+                or len(resume_vector) != len(jd_vector)):
+            return 0.0
+        cosine = float(np.dot(np.asarray(resume_vector, dtype=np.float64), np.asarray(jd_vector, dtype=np.float64)))
+        return min(100.0, max(0.0, cosine * 100))
+    
+    def _compact_component_scores(self, resume, jd):
+        """Component scores of two CompactAnalysis objects, equal to the list-based methods.
+        
+        Term sets are compared as interned ids; only matched and missing
+        terms are turned back into strings. The job description's role
+        strings and semantic vector are decoded once (see ``lookup``).
+        """
+        terms = vocabulary.terms
+        jd_skills, jd_roles, jd_keywords, jd_role_terms, jd_vector = jd.lookup()
+        
+        if not jd.skills:
+            skill_score, matched_skills, missing_skills = 0, [], []
+        else:
+            matched = [i for i in resume.skill_set if i in jd_skills]
+            missing_skills = terms(jd_skills.difference(resume.skill_set))
+            matched_skills = terms(matched)
+            skill_score = min(100, len(matched) / len(jd_skills) * 150)
+        
+        if not jd.job_roles:
+            role_score = 50
+        elif not jd_roles.isdisjoint(resume.role_set):
+            role_score = 100
+        else:
+            role_score = self.calculate_role_relevance_score(
+                terms(resume.role_set), jd_role_terms
+            ) if resume.job_roles else 0
         
         experience_score = self.calculate_experience_score(
-            resume_analysis['experience_years'], jd_analysis['experience_years'],
-            resume_analysis['education_level'], jd_analysis['education_level']
+            resume.experience_years, jd.experience_years, resume.education_level, jd.education_level
         )
         
-        # Calculate keyword overlap for additional insights
-        keyword_score, matched_keywords, missing_keywords_general = self.calculate_keyword_overlap_score(
-            resume_analysis['keywords'], jd_analysis['keywords']
-        )
+        if not jd.keywords:
+            keyword_score, matched_keywords, missing_keywords = 0, [], []
+        else:
+            matched = [i for i in resume.keyword_top if i in jd_keywords]
+            matched_keywords = terms(matched)
+            missing_keywords = terms(jd_keywords.difference(resume.keyword_top))
+            keyword_score = len(matched) / len(jd_keywords) * 100
+        
+        semantic_score = self.calculate_semantic_score(resume.vector_array(), jd_vector)
+        return (skill_score, matched_skills, missing_skills, role_score, experience_score,
+                keyword_score, matched_keywords, missing_keywords, semantic_score)
+    
+    def calculate_job_fit_score(self, resume_analysis, jd_analysis):
+        """Calculate overall job fit score with detailed breakdown.
+        
+        Either analysis may be an ``analyze_text`` dict or a CompactAnalysis;
+        when one is compact, both are scored in interned form.
+        """
+        if isinstance(resume_analysis, CompactAnalysis) or isinstance(jd_analysis, CompactAnalysis):
+            (skill_score, matched_skills, missing_skills, role_score, experience_score,
+             keyword_score, matched_keywords, missing_keywords_general, semantic_score) = \
+                self._compact_component_scores(CompactAnalysis.from_dict(resume_analysis),
+                                               CompactAnalysis.from_dict(jd_analysis))
+        else:
+            # Calculate individual scores
+            skill_score, matched_skills, missing_skills = self.calculate_skill_overlap_score(
+                resume_analysis['skills'], jd_analysis['skills']
+            )
+            
+            role_score = self.calculate_role_relevance_score(
+                resume_analysis['job_roles'], jd_analysis['job_roles']
+            )
+            
+            experience_score = self.calculate_experience_score(
+                resume_analysis['experience_years'], jd_analysis['experience_years'],
+                resume_analysis['education_level'], jd_analysis['education_level']
+            )
+            
+            # Calculate keyword overlap for additional insights
+            keyword_score, matched_keywords, missing_keywords_general = self.calculate_keyword_overlap_score(
+                resume_analysis['keywords'], jd_analysis['keywords']
+            )
+            
+            semantic_score = self.calculate_semantic_score(
+                resume_analysis.get('semantic_vector'), jd_analysis.get('semantic_vector')
+            )
         
         # Combine matched keywords from skills and general keywords
         all_matched_keywords = list(set(matched_skills + matched_keywords))
@@ -147,7 +276,9 @@ class ScoringEngine:
         overall_score = (
             skill_score * self.weights['skills'] +
             role_score * self.weights['role'] +
-            experience_score * self.weights['experience']
+            experience_score * self.weights['experience'] +
+            keyword_score * self.weights['keywords'] +
+            semantic_score * self.weights['semantic']
         )
         
         # Round to nearest integer
@@ -162,18 +293,56 @@ class ScoringEngine:
             'role_score': round(role_score),
             'experience_score': round(experience_score),
             'keyword_score': round(keyword_score),
+            'semantic_score': round(semantic_score),
             'matched_keywords': all_matched_keywords,
             'missing_keywords': all_missing_keywords,
             'matched_skills': matched_skills,
             'missing_skills': missing_skills
         }
     
+    def rank_resumes(self, resume_analyses, jd_analysis):
+        """Score many resumes against one job description and rank them.
+
+        ``resume_analyses`` is an iterable of ``(resume_id, analysis)`` pairs.
+        Returns score dicts (as from ``calculate_job_fit_score``) with added
+        ``resume_id`` and ``rank`` keys, best match first.
+        """
+        ranked = []
+        compact_jd = None
+        for resume_id, resume_analysis in resume_analyses:
+            if isinstance(resume_analysis, CompactAnalysis):
+                # Intern a dict job description once, not once per resume
+                compact_jd = compact_jd or CompactAnalysis.from_dict(jd_analysis)
+                score_data = self.calculate_job_fit_score(resume_analysis, compact_jd)
+            else:
+                score_data = self.calculate_job_fit_score(resume_analysis, jd_analysis)
+            score_data['resume_id'] = resume_id
+            ranked.append(score_data)
+        
+        # Highest overall score first; skills break ties
+        ranked.sort(key=lambda s: (s['overall_score'], s['skill_score']), reverse=True)
+        for rank, score_data in enumerate(ranked, start=1):
+            score_data['rank'] = rank
+        
+        return ranked
+    
+    def score_matrix(self, resume_analyses, jd_analyses, semantic=None):
+        """Score every resume against every job description in one vectorized pass.
+        
+        Returns ``len(resume_analyses) x len(jd_analyses)`` NumPy arrays keyed
+        like ``calculate_job_fit_score`` (overall, skill, role, experience and
+        keyword scores), with identical values. ``semantic`` optionally
+        supplies the semantic scores (see batch_scoring.component_scores).
+        """
+        from batch_scoring import score_matrix
+        return score_matrix(resume_analyses, jd_analyses, self.weights, semantic=semantic)
+    
     def generate_suggestions(self, resume_analysis, jd_analysis, score_data):
         """Generate actionable improvement suggestions."""
         suggestions = []
         
         # Skill-based suggestions
-        if score_data['skill_score'] < 70:
+        if score_data['skill_score'] < self.thresholds['skills']:
             missing_skills = score_data['missing_skills'][:5]  # Top 5 missing skills
             if missing_skills:
                 suggestions.append({
@@ -184,7 +353,7 @@ class ScoringEngine:
                 })
         
         # Role relevance suggestions
-        if score_data['role_score'] < 60:
+        if score_data['role_score'] < self.thresholds['role']:
             suggestions.append({
                 'category': 'Role Alignment',
                 'priority': 'High',
@@ -193,7 +362,7 @@ class ScoringEngine:
             })
         
         # Experience suggestions
-        if score_data['experience_score'] < 70:
+        if score_data['experience_score'] < self.thresholds['experience']:
             jd_experience = jd_analysis['experience_years']
             resume_experience = resume_analysis['experience_years']
             
@@ -206,7 +375,7 @@ class ScoringEngine:
                 })
         
         # Keyword optimization suggestions
-        if score_data['keyword_score'] < 50:
+        if score_data['keyword_score'] < self.thresholds['keywords']:
             missing_keywords = score_data['missing_keywords'][:3]  # Top 3 missing keywords
             if missing_keywords:
                 suggestions.append({
@@ -226,7 +395,7 @@ class ScoringEngine:
             })
         
         # General optimization suggestions
-        if score_data['overall_score'] < 80:
+        if score_data['overall_score'] < self.thresholds['overall']:
             suggestions.append({
                 'category': 'General',
                 'priority': 'Medium',
@@ -235,7 +404,7 @@ class ScoringEngine:
             })
         
         # If score is very high, give positive reinforcement
-        if score_data['overall_score'] >= 85:
+        if score_data['overall_score'] >= self.thresholds['excellent']:
             suggestions.append({
                 'category': 'Excellent Match',
                 'priority': 'Low',
@@ -244,3 +413,24 @@ class ScoringEngine:
             })
         
         return suggestions
+    
+    def build_results(self, resume_analysis, jd_analysis):
+        """Score a resume and assemble the data shown on the results page."""
+        # Calculate scores and comparisons
+        logging.debug("Calculating job fit score...")
+        score_data = self.calculate_job_fit_score(resume_analysis, jd_analysis)
+        
+        # Generate improvement suggestions
+        suggestions = self.generate_suggestions(resume_analysis, jd_analysis, score_data)
+        
+        return {
+            'overall_score': score_data['overall_score'],
+            'skill_score': score_data['skill_score'],
+            'role_score': score_data['role_score'],
+            'experience_score': score_data['experience_score'],
+            'matched_keywords': score_data['matched_keywords'],
+            'missing_keywords': score_data['missing_keywords'],
+            'suggestions': suggestions,
+            'resume_keywords': resume_analysis['keywords'],
+            'jd_keywords': jd_analysis['keywords']
+        }
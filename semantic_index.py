@@ -0,0 +1,111 @@
+import os
+import tempfile
+import numpy as np
+
+class SemanticIndex:
+    """Semantic vectors of many documents in one memory-mapped float32 matrix.
+
+    Rows are L2-normalized semantic vectors (see NLPProcessor.semantic_vectors),
+    so the cosine similarity of one query against every stored document is a
+    single matrix-vector product. The matrix lives in a ``.npy`` file mapped
+    into memory, so a large job catalog is file-backed page cache rather than
+    Python heap. Callers serialize access.
+    """
+
+    def __init__(self, directory=None, capacity=1024):
+        """Create an empty index whose file goes in ``directory`` (default: the system temp dir)."""
+        self.directory = directory
+        self.capacity = capacity
+        self.dims = 0
+        self._matrix = None
+        self._keys = []  # row -> key
+        self._rows = {}  # key -> row
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _allocate(self, rows, dims):
+        """Return a new zeroed ``rows x dims`` float32 memmap in a fresh file."""
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix='semantic_index.', suffix='.npy', dir=self.directory)
+        os.close(fd)
+        matrix = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(rows, dims))
+        try:
+            # The mapping outlives the name, so nothing is left behind when the process exits
+            os.unlink(path)
+        except OSError:  # Windows cannot unlink mapped files
+            pass
+        return matrix
+
+    def _grow(self):
+        """Double the capacity, copying the used rows."""
+        used = np.array(self._matrix[:len(self._keys)])
+        capacity = max(self.capacity, 2 * self._matrix.shape[0])
+        self._matrix = self._allocate(capacity, self.dims)
+        self._matrix[:len(used)] = used
+
+    def add(self, key, vector):
+        """Add or replace the vector of ``key``.
+
+        Raises ValueError when the vector length differs from the stored ones.
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        if self._matrix is None:
+            self.dims = len(vector)
+            self._matrix = self._allocate(self.capacity, self.dims)
+        if len(vector) != self.dims:
+            raise ValueError(f"Semantic vector has {len(vector)} dimensions, index has {self.dims}")
+
+        row = self._rows.get(key)
+        if row is None:
+            if len(self._keys) == self._matrix.shape[0]:
+                self._grow()
+            row = self._rows[key] = len(self._keys)
+            self._keys.append(key)
+        self._matrix[row] = vector
+
+    def remove(self, key):
+        """Remove ``key``; the last row moves into its place. Returns False if absent."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._matrix[row] = self._matrix[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+        return True
+
+    def similarities(self, vector):
+        """Return (keys, cosine similarities) of every stored document against ``vector``."""
+        if not self._keys or vector is None or len(vector) != self.dims:
+            return [], np.empty(0, dtype=np.float32)
+        scores = self._matrix[:len(self._keys)] @ np.asarray(vector, dtype=np.float32)
+        return list(self._keys), scores
+
+    def similarities_of(self, keys, vector):
+        """Return the cosine similarities of ``keys`` against ``vector`` as a float64 array.
+
+        Only the rows of ``keys`` are read from the mapped matrix. Keys that
+        are not stored (and a vector of the wrong length) score 0.
+        """
+        scores = np.zeros(len(keys))
+        if not self._keys or vector is None or len(vector) != self.dims:
+            return scores
+        rows = np.fromiter((self._rows.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+        present = rows >= 0
+        scores[present] = self._matrix[rows[present]] @ np.asarray(vector, dtype=np.float64)
+        return scores
+
+    def top(self, vector, k):
+        """Return up to ``k`` (key, similarity) pairs, most similar first."""
+        keys, scores = self.similarities(vector)
+        if not keys or k <= 0:
+            return []
+        k = min(k, len(keys))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(keys[i], float(scores[i])) for i in best]
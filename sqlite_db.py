@@ -0,0 +1,56 @@
+import os
+import sqlite3
+import weakref
+import threading
+
+# Every SqliteDatabase, so a forked child can drop the connections it inherited
+_databases = weakref.WeakSet()
+
+class SqliteDatabase:
+    """A sqlite connection per process, opened on first use.
+
+    SQLite connections must not be carried across ``fork()``: a gunicorn
+    master that preloads the app, or an app worker that forks sandbox
+    workers, would otherwise share one connection's file locks with its
+    children. Nothing is opened until a process first asks for the
+    connection, and a forked child forgets the one it inherited and opens
+    its own. ``setup(connection)`` runs on every new connection, e.g. to
+    create tables.
+    """
+
+    def __init__(self, path, setup=None, timeout=5.0, wal=False):
+        self.path = path
+        self.setup = setup
+        self.timeout = timeout
+        self.wal = wal
+        self._connection = None
+        self._lock = threading.Lock()
+        _databases.add(self)
+
+    def connection(self):
+        """Return this process's connection, opening it if needed."""
+        connection = self._connection
+        if connection is None:
+            with self._lock:
+                connection = self._connection
+                if connection is None:
+                    connection = sqlite3.connect(self.path, check_same_thread=False, timeout=self.timeout)
+                    if self.wal:
+                        connection.execute('PRAGMA journal_mode=WAL')
+                    if self.setup is not None:
+                        self.setup(connection)
+                        connection.commit()
+                    self._connection = connection
+        return connection
+
+    def _forget(self):
+        # Not closed: closing would release locks that belong to the parent
+        self._connection = None
+        self._lock = threading.Lock()
+
+def _forget_connections():
+    for database in list(_databases):
+        database._forget()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_connections)
@@ -0,0 +1,47 @@
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+class StartupTimer:
+    """Collects import and model load timings for the startup report."""
+
+    def __init__(self):
+        """Start the clock at first import of this module."""
+        self.started_at = time.perf_counter()
+        self.timings = {}  # step name -> seconds
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name):
+        """Time the enclosed block and record it under ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings[name] = elapsed
+            logging.info(f"Startup: {name} took {elapsed * 1000:.1f} ms")
+
+    def record(self, name, seconds):
+        """Record a timing measured elsewhere."""
+        with self._lock:
+            self.timings[name] = seconds
+
+    def mark(self, name):
+        """Record the time elapsed since start-up under ``name``."""
+        self.record(name, time.perf_counter() - self.started_at)
+
+    def report(self):
+        """Return timings in milliseconds plus time since process start."""
+        with self._lock:
+            timings = {name: round(seconds * 1000, 1) for name, seconds in self.timings.items()}
+        return {
+            'pid': os.getpid(),
+            'timings_ms': timings,
+            'uptime_ms': round((time.perf_counter() - self.started_at) * 1000, 1)
+        }
+
+startup_timer = StartupTimer()
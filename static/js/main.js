@@ -116,7 +116,13 @@ document.addEventListener('DOMContentLoaded', function() {
     const downloadBtn = document.getElementById('downloadPDF');
     if (downloadBtn) {
         downloadBtn.addEventListener('click', () => {
-            window.print(); // Simple PDF via print
+            const resultId = downloadBtn.dataset.resultId;
+            if (resultId) {
+                // Server-rendered report, cached by result id
+                window.location.href = `/export-pdf/${encodeURIComponent(resultId)}`;
+            } else {
+                window.print(); // No stored result: fall back to the browser's print to PDF
+            }
         });
     }
 